@@ -70,9 +70,6 @@ class SplineIkOnFk(splineIk.SplineIk):
         super(SplineIkOnFk, self).get_output_info()
         self._fk_controls = self.get_multi_attr_value(self.FK_CONTROLS_ATTR, node=self._output_node)
 
-    def tag_controllers(self):
-        super(SplineIkOnFk, self).tag_controllers()
-        tag_parent = self._tag_parent
-        for ctrl in self._fk_controls:
-            controlUtils.set_tag_parent(ctrl, tag_parent)
-            tag_parent = ctrl
+    def add_tag_graph(self, tag_graph):
+        super(SplineIkOnFk, self).add_tag_graph(tag_graph)
+        tag_graph.add_chain(self._fk_controls, parent_node=self._tag_parent)
@@ -16,6 +16,7 @@ class FkChain(coreLimb.CoreLimb):
         self._lock_hide = None
         self._additional_description = None
         self._control_end_joint = None
+        self._lean_controls = None
 
         # input attr
         self._input_hierarchy_matrix = None
@@ -26,6 +27,7 @@ class FkChain(coreLimb.CoreLimb):
         self._lock_hide = kwargs.get('lock_hide', attributeUtils.SCALE)
         self._additional_description = kwargs.get('additional_description', ['fk'])
         self._control_end_joint = kwargs.get('control_end_joint', False)
+        self._lean_controls = kwargs.get('lean_controls', False)
 
     def get_connect_kwargs(self, **kwargs):
         super(FkChain, self).get_connect_kwargs(**kwargs)
@@ -49,23 +51,21 @@ class FkChain(coreLimb.CoreLimb):
         if not self._control_end_joint and len(guides) > 1:
             guides = guides[:-1]
 
-        # loop into each guide joint and create fk controller
-        input_matrix = self._input_hierarchy_matrix_attr
+        # loop into each guide joint and get fk controller's kwargs
+        controls_kwargs = []
         for g in guides:
             name_info = namingUtils.decompose(g)
-            ctrl = controlUtils.create(name_info['description'], side=name_info['side'], index=name_info['index'],
-                                       limb_index=name_info['limb_index'],
-                                       additional_description=self._additional_description,
-                                       sub=True, parent=parent, position=g, rotate_order=0, manip_orient=None,
-                                       lock_hide=self._lock_hide, input_matrix=input_matrix)
+            controls_kwargs.append({'description': name_info['description'], 'side': name_info['side'],
+                                    'index': name_info['index'], 'limb_index': name_info['limb_index'],
+                                    'additional_description': self._additional_description, 'sub': True,
+                                    'position': g, 'rotate_order': 0, 'manip_orient': None,
+                                    'lock_hide': self._lock_hide, 'tag': False})
 
-            # add to control list
-            self._controls.append(ctrl)
-
-            # override control parent node
-            parent = ctrl
-            # override input matrix
-            input_matrix = '{0}.{1}'.format(ctrl, controlUtils.HIERARCHY_MATRIX_ATTR)
+        # create controllers as a chain, each controller reuses its parent's hierarchy matrix,
+        # lean controllers only have world, out and hierarchy matrices connected until get_matrix_attr is called
+        self._controls += controlUtils.create_chain(controls_kwargs, parent=parent,
+                                                    input_matrix=self._input_hierarchy_matrix_attr,
+                                                    lean=self._lean_controls)
         # override setup nodes
         self._setup_nodes = self._controls
 
@@ -119,7 +119,7 @@ class PistonAim(coreLimb.CoreLimb):
                                        limb_index=name_info['limb_index'],
                                        additional_description=self._additional_description + [description], sub=True,
                                        parent=self._controls_group, position=jnt, rotate_order=0, manip_orient=manip,
-                                       lock_hide=lock_attrs)
+                                       lock_hide=lock_attrs, tag=False)
             self._controls.append(ctrl)
 
         # add stretch attr
@@ -173,7 +173,7 @@ class PistonAim(coreLimb.CoreLimb):
                                        limb_index=name_info['limb_index'],
                                        additional_description=self._additional_description + ['up'], sub=True,
                                        parent=self._controls_group, position=[up_pos, self._joints[0]], rotate_order=0,
-                                       manip_orient=None, lock_hide=lock_attrs)
+                                       manip_orient=None, lock_hide=lock_attrs, tag=False)
             # add to control list
             self._controls.insert(1, ctrl)
 
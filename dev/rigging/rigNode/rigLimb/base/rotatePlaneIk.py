@@ -104,7 +104,7 @@ class RotatePlaneIk(ikHandleLimb.IkHandle):
                                        limb_index=name_info['limb_index'],
                                        additional_description=self._additional_description, sub=True,
                                        parent=self._controls_group, position=guide, rotate_order=0,
-                                       manip_orient=manip_orient, lock_hide=lock_attrs)
+                                       manip_orient=manip_orient, lock_hide=lock_attrs, tag=False)
             self._controls.append(ctrl)
 
         # add attributes
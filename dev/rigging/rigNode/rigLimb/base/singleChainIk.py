@@ -69,7 +69,7 @@ class SingleChainIk(ikHandleLimb.IkHandle):
             ctrl = controlUtils.create(name_info['description'], side=name_info['side'], index=name_info['index'],
                                        limb_index=name_info['limb_index'], additional_description=description, sub=True,
                                        parent=self._controls_group, position=jnt, rotate_order=0, manip_orient=None,
-                                       lock_hide=lock_attrs)
+                                       lock_hide=lock_attrs, tag=False)
             self._controls.append(ctrl)
 
         # add stretch attr
@@ -115,7 +115,7 @@ class SplineIk(ikHandleLimb.IkHandle):
             ctrl = controlUtils.create(name_info['description'], side=name_info['side'], index=name_info['index'],
                                        limb_index=name_info['limb_index'], additional_description=None, sub=True,
                                        parent=self._controls_group, position=guide, rotate_order=0,
-                                       manip_orient=manip_orient, lock_hide=attributeUtils.SCALE)
+                                       manip_orient=manip_orient, lock_hide=attributeUtils.SCALE, tag=False)
             self._controls.append(ctrl)
 
             # create joint
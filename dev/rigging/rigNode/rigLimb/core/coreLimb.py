@@ -98,6 +98,7 @@ class CoreLimb(coreNode.CoreNode):
         self._input_matrix = None
         self._offset_matrix = None
         self._tag_parent = None
+        self._tag_graph = None
 
     # property
     @property
@@ -116,6 +117,10 @@ class CoreLimb(coreNode.CoreNode):
     def control_objects(self):
         return [controlUtils.Control(ctrl) for ctrl in self._controls]
 
+    @property
+    def control_node_report(self):
+        return controlUtils.get_node_report(self._controls)
+
     @property
     def skeleton(self):
         return self._skeleton
@@ -205,6 +210,7 @@ class CoreLimb(coreNode.CoreNode):
         self._input_matrix = kwargs.get('input_matrix', None)
         self._offset_matrix = kwargs.get('offset_matrix', None)
         self._tag_parent = kwargs.get('tag_parent', None)
+        self._tag_graph = kwargs.get('tag_graph', None)
         self._skeleton_parent = kwargs.get('skeleton_parent', None)
 
     def flip_connect_kwargs(self):
@@ -462,12 +468,27 @@ class CoreLimb(coreNode.CoreNode):
             attributeUtils.connect(self._offset_matrix, self._offset_matrix_attr)
 
     def tag_controllers(self):
-        if self._tag_controls:
-            tag_parent = self._tag_parent
-            for ctrl in self._controls:
-                if ctrl not in self._hide_controls:
-                    controlUtils.add_tag(ctrl, tag_parent)
-                    tag_parent = ctrl
+        # controllers are created without tags, tag them all in one pass
+        if self._tag_graph:
+            # rig level tag graph, it will be built once all rig nodes registered
+            self.add_tag_graph(self._tag_graph)
+        else:
+            tag_graph = controlUtils.TagGraph()
+            self.add_tag_graph(tag_graph)
+            tag_graph.build()
+
+    def add_tag_graph(self, tag_graph):
+        # all controllers are tagged, only the visible ones are chained for pick walk if tag controls is on
+        tag_parent = self._tag_parent
+        for ctrl in self._controls:
+            if self._tag_controls and ctrl not in self._hide_controls:
+                tag_graph.add(ctrl, parent_node=tag_parent)
+                tag_parent = ctrl
+            else:
+                tag_graph.add(ctrl)
+            sub = controlUtils.get_hierarchy_node(ctrl, 'sub')
+            if sub:
+                tag_graph.add(sub, parent_node=ctrl)
 
     def connect_skeleton(self):
         if self._skeleton:
@@ -71,10 +71,9 @@ class FingerFk(fkChain.FkChain):
             # multiply inverse matrix
             mult_matrix = namingUtils.update(self._guide_joints[0], type='multMatrix',
                                              additional_description='inverseMatrix')
-            ivs_matrix_ctrl = nodeUtils.matrix.mult_matrix(ivs_matrix_zero,
-                                                           '{0}.{1}'.format(self._controls[0],
-                                                                            controlUtils.OUT_INVERSE_MATRIX_ATTR),
-                                                           name=mult_matrix)
+            # fk controllers can be lean, so get the inverse matrix through get_matrix_attr to create it if needed
+            ivs_matrix_out = controlUtils.get_matrix_attr(self._controls[0], controlUtils.OUT_INVERSE_MATRIX_ATTR)
+            ivs_matrix_ctrl = nodeUtils.matrix.mult_matrix(ivs_matrix_zero, ivs_matrix_out, name=mult_matrix)
             # plug with base controller's driven node
             driven = controlUtils.get_hierarchy_node(self._controls[1], 'driven')
             constraintUtils.position_constraint(mathUtils.matrix.IDENTITY, driven, weights=1,
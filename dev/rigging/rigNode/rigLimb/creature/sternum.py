@@ -90,7 +90,7 @@ class Sternum(coreLimb.CoreLimb):
         ctrl = controlUtils.create(name_info['description'], side=name_info['side'], index=name_info['index'],
                                    limb_index=name_info['limb_index'], sub=False, parent=self._controls_group,
                                    position=self._guide_control, rotate_order=0, manip_orient=None,
-                                   lock_hide=[attributeUtils.ALL[0]] + attributeUtils.ALL[2:])
+                                   lock_hide=[attributeUtils.ALL[0]] + attributeUtils.ALL[2:], tag=False)
         # limit transform
         cmds.transformLimits(ctrl, enableTranslationY=[1, 1], translationY=[-2, 2])
 
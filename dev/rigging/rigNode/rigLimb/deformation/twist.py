@@ -114,7 +114,7 @@ class Twist(coreLimb.CoreLimb):
                                        additional_description=self._additional_description,
                                        limb_index=self._limb_index, sub=True, parent=self._controls_group,
                                        position=[pos, self._guide_joints[0]],
-                                       lock_hide=attributeUtils.TRANSLATE + attributeUtils.SCALE)
+                                       lock_hide=attributeUtils.TRANSLATE + attributeUtils.SCALE, tag=False)
             # add twist weight attr
             attributeUtils.add(ctrl, self.TWIST_WEIGHT_ATTR, attribute_type='float', value_range=[0, 1],
                                default_value=float(i)/(self._joints_number - 1))
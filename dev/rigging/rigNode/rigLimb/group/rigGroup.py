@@ -60,7 +60,7 @@ class RigGroup(coreLimb.CoreLimb):
             ctrl = controlUtils.create(name_info['description'], side=name_info['side'], index=name_info['index'],
                                        limb_index=name_info['limb_index'], sub=False, parent=self._controls_group,
                                        position=self._guide_controls[0], rotate_order=0, manip_orient=None,
-                                       lock_hide=attributeUtils.ALL)
+                                       lock_hide=attributeUtils.ALL, tag=False)
             self._controls.append(ctrl)
 
     def add_input_attributes_post(self):
@@ -185,18 +185,20 @@ class Master(coreNode.CoreNode):
         cmds.setAttr(self._geometry_group + '.overrideEnabled', 1)
 
     def create_node(self):
+        tag_graph = controlUtils.TagGraph()
         self._world_control = controlUtils.create('world', side='center', index=1, lock_hide=attributeUtils.SCALE,
-                                                  tag=True, parent=self._controls_group)
+                                                  tag=True, tag_graph=tag_graph, parent=self._controls_group)
         self._layout_control = controlUtils.create('layout', side='center', index=1, lock_hide=attributeUtils.SCALE,
                                                    parent=self._world_control,
                                                    input_matrix='{0}.{1}'.format(self._world_control,
                                                                                  controlUtils.HIERARCHY_MATRIX_ATTR),
-                                                   tag=True, tag_parent=self._world_control)
+                                                   tag=True, tag_parent=self._world_control, tag_graph=tag_graph)
         self._local_control = controlUtils.create('local', side='center', index=1, lock_hide=attributeUtils.SCALE,
                                                   parent=self._layout_control,
                                                   input_matrix='{0}.{1}'.format(self._layout_control,
                                                                                 controlUtils.HIERARCHY_MATRIX_ATTR),
-                                                  tag=True, tag_parent=self._layout_control)
+                                                  tag=True, tag_parent=self._layout_control, tag_graph=tag_graph)
+        tag_graph.build()
 
         # add rig scale attribute
         for ctrl in [self._world_control, self._layout_control, self._local_control]:
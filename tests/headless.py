@@ -0,0 +1,46 @@
+"""
+helpers to load utils modules outside maya, so their numpy code paths can be tested headless
+"""
+import os
+import sys
+import types
+
+# constant
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# function
+def add_paths(*folders):
+    """
+    add repository folders to sys.path, utils modules import the modules next to them directly
+
+    Args:
+        folders (str): folders relative to the repository root, separated by '/'
+    """
+    for folder in folders:
+        path = os.path.join(ROOT, *folder.split('/'))
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def stub_modules(*names):
+    """
+    register empty modules for the given names if they can't be imported, like maya modules outside maya,
+    tests only touch the functions which don't use them
+
+    Args:
+        names (str): full module names
+    """
+    for name in names:
+        try:
+            __import__(name)
+            continue
+        except Exception:
+            pass
+        parts = name.split('.')
+        for i in range(len(parts)):
+            module_name = '.'.join(parts[: i + 1])
+            if module_name not in sys.modules:
+                sys.modules[module_name] = types.ModuleType(module_name)
+            if i:
+                setattr(sys.modules['.'.join(parts[:i])], parts[i], sys.modules[module_name])
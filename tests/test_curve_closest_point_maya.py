@@ -0,0 +1,65 @@
+"""
+compare the numpy batch closest point on curve query with MFnNurbsCurve.closestPoint,
+it needs maya, and is skipped outside a maya session or mayapy
+"""
+import unittest
+
+import numpy
+
+try:
+    import maya.standalone
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as OpenMaya2
+except ImportError:
+    cmds = None
+
+# constant
+TOLERANCE = 1e-6
+
+
+# class
+@unittest.skipIf(cmds is None, 'maya is not available')
+class TestClosestPointMaya(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            maya.standalone.initialize()
+        except RuntimeError:
+            # already initialized, or running inside a maya session
+            pass
+        import utils.modeling.curveUtils as curveUtils
+        cls.curveUtils = curveUtils
+
+    def setUp(self):
+        cmds.file(new=True, force=True)
+        self.points = numpy.random.RandomState(0).uniform(-8, 8, (200, 3))
+
+    def assert_api(self, curve):
+        closest_points, parameters = self.curveUtils.get_closest_points(curve, self.points)
+        mfn_crv = self.curveUtils.get_MFnNurbsCurve(curve)
+        for point, closest_point, parameter in zip(self.points, closest_points, parameters):
+            m_point, api_parameter = mfn_crv.closestPoint(OpenMaya2.MPoint(point.tolist()),
+                                                          space=OpenMaya2.MSpace.kWorld)
+            api_point = numpy.array([m_point.x, m_point.y, m_point.z])
+            # both queries find the same distance, parameters can differ if points are equally close to two spans
+            self.assertAlmostEqual(numpy.linalg.norm(closest_point - point), numpy.linalg.norm(api_point - point),
+                                   delta=TOLERANCE)
+            if numpy.linalg.norm(closest_point - api_point) < TOLERANCE:
+                self.assertAlmostEqual(parameter, api_parameter, delta=TOLERANCE)
+
+    def test_open(self):
+        curve = cmds.curve(point=numpy.random.RandomState(1).uniform(-5, 5, (12, 3)).tolist(), degree=3)
+        self.assert_api(curve)
+
+    def test_transformed(self):
+        curve = cmds.curve(point=numpy.random.RandomState(2).uniform(-5, 5, (8, 3)).tolist(), degree=2)
+        cmds.xform(curve, translation=[1, 2, 3], rotation=[10, 20, 30], scale=[1, 2, 0.5])
+        self.assert_api(curve)
+
+    def test_periodic(self):
+        curve = cmds.circle(radius=4, normal=[0, 1, 1], sections=8)[0]
+        self.assert_api(curve)
+
+
+if __name__ == '__main__':
+    unittest.main()
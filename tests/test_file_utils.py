@@ -0,0 +1,75 @@
+"""
+tests for the atomic file writes, they run headless
+"""
+import os
+import stat
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/common/fileUtils')
+
+import pathUtils
+import jsonUtils
+import numpyUtils
+
+
+# class
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def get_mode(self, file_path):
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+
+    def test_default_permission(self):
+        umask = os.umask(0o022)
+        try:
+            temp_path = pathUtils.get_temp_path(os.path.join(self.folder, 'data.json'))
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.path.dirname(temp_path), self.folder)
+        if os.name == 'posix':
+            self.assertEqual(self.get_mode(temp_path), 0o644)
+
+    def test_keep_permission(self):
+        file_path = os.path.join(self.folder, 'data.json')
+        jsonUtils.write(file_path, {'a': 1})
+        os.chmod(file_path, 0o640)
+        jsonUtils.write(file_path, {'a': 2}, atomic=True)
+        self.assertEqual(jsonUtils.read(file_path), {'a': 2})
+        if os.name == 'posix':
+            self.assertEqual(self.get_mode(file_path), 0o640)
+        self.assertEqual(os.listdir(self.folder), ['data.json'])
+
+    def test_json_failure(self):
+        file_path = os.path.join(self.folder, 'data.json')
+        jsonUtils.write(file_path, {'a': 1}, atomic=True)
+        self.assertRaises(TypeError, jsonUtils.write, file_path, {'a': object()}, atomic=True)
+        # the old file is kept, and the temp file is removed
+        self.assertEqual(jsonUtils.read(file_path), {'a': 1})
+        self.assertEqual(os.listdir(self.folder), ['data.json'])
+
+    def test_numpy(self):
+        file_path = os.path.join(self.folder, 'data')
+        numpyUtils.write(file_path, numpy.arange(5), atomic=True)
+        numpy.testing.assert_array_equal(numpyUtils.read(file_path + '.npy'), numpy.arange(5))
+        self.assertEqual(os.listdir(self.folder), ['data.npy'])
+
+    def test_numpy_failure(self):
+        file_path = os.path.join(self.folder, 'data.npy')
+        data = numpy.empty(1, dtype=object)
+        data[0] = lambda: None
+        self.assertRaises(Exception, numpyUtils.write, file_path, data, atomic=True)
+        self.assertEqual(os.listdir(self.folder), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+tests for the numpy matrix compose, decompose and rotation conversions, they run headless
+"""
+import itertools
+import unittest
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/common/mathUtils')
+
+import matrix
+
+# constant
+TOLERANCE = 1e-9
+
+# rotate orders axes, same as maya's xyz, yzx, zxy, xzy, yxz, zyx
+ROTATE_ORDERS = ['xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx']
+
+
+# function
+def get_axis_rotation(angle, axis):
+    """
+    get row vector rotation matrix around the given axis, written out separately from the module
+
+    Args:
+        angle (float): rotation angle in degrees
+        axis (str): x/y/z
+
+    Returns:
+        rotation (numpy.ndarray): (3, 3) rotation matrix
+    """
+    cos = numpy.cos(numpy.radians(angle))
+    sin = numpy.sin(numpy.radians(angle))
+    if axis == 'x':
+        return numpy.array([[1, 0, 0], [0, cos, sin], [0, -sin, cos]])
+    if axis == 'y':
+        return numpy.array([[cos, 0, -sin], [0, 1, 0], [sin, 0, cos]])
+    return numpy.array([[cos, sin, 0], [-sin, cos, 0], [0, 0, 1]])
+
+
+def get_euler_rotation(rotate, rotate_order):
+    """
+    get row vector rotation matrix from euler values, the first axis in the rotate order is applied first
+
+    Args:
+        rotate (list): euler rotation values in degrees
+        rotate_order (int): rotation values' rotate order
+
+    Returns:
+        rotation (numpy.ndarray): (3, 3) rotation matrix
+    """
+    rotation = numpy.eye(3)
+    for axis in ROTATE_ORDERS[rotate_order]:
+        rotation = rotation.dot(get_axis_rotation(rotate['xyz'.index(axis)], axis))
+    return rotation
+
+
+def get_random_rotate(count, rotate_order, seed=0):
+    """
+    get random euler values, the middle axis stays in (-90, 90) so they are the decomposed values
+
+    Args:
+        count (int): values number
+        rotate_order (int): rotation values' rotate order
+        seed (int): random seed, default is 0
+
+    Returns:
+        rotate (numpy.ndarray): (count, 3) euler rotation values in degrees
+    """
+    rotate = numpy.random.RandomState(seed).uniform(-179, 179, (count, 3))
+    middle = 'xyz'.index(ROTATE_ORDERS[rotate_order][1])
+    rotate[:, middle] *= 89.0 / 179
+    return rotate
+
+
+# class
+class TestCompose(unittest.TestCase):
+    def test_maya_value(self):
+        # maya's matrix for translate [1, 2, 3], rotate [10, 20, 30] and scale [1, 0.5, 0.5]
+        matrix_compose = matrix.compose(translate=[1, 2, 3], rotate=[10, 20, 30], scale=[1, 0.5, 0.5])
+        numpy.testing.assert_allclose(matrix_compose[:3], [0.81379768, 0.46984631, -0.34202014], atol=1e-8)
+        numpy.testing.assert_allclose(matrix_compose[12:], [1, 2, 3, 1])
+
+    def test_rotate_orders(self):
+        for rotate_order in range(6):
+            rotate = get_random_rotate(20, rotate_order)
+            expected = numpy.array([get_euler_rotation(r, rotate_order) for r in rotate])
+            numpy.testing.assert_allclose(matrix.euler_to_rotation(rotate, rotate_order=rotate_order), expected,
+                                          atol=TOLERANCE)
+
+    def test_scale_shear(self):
+        scale = [2, -0.5, 3]
+        shear = [0.3, -0.2, 0.7]
+        rotate = [30, -40, 75]
+        matrix_compose = matrix.compose_batch(translate=[1, 2, 3], rotate=rotate, scale=scale, shear=shear)[0]
+        shear_matrix = numpy.array([[1, 0, 0], [shear[0], 1, 0], [shear[1], shear[2], 1]])
+        expected = numpy.diag(scale).dot(shear_matrix).dot(get_euler_rotation(rotate, 0))
+        numpy.testing.assert_allclose(matrix_compose[:3, :3], expected, atol=TOLERANCE)
+
+
+class TestDecompose(unittest.TestCase):
+    def test_round_trip(self):
+        random = numpy.random.RandomState(1)
+        translate = random.uniform(-10, 10, (50, 3))
+        scale = random.uniform(0.1, 5, (50, 3))
+        for rotate_order in range(6):
+            rotate = get_random_rotate(50, rotate_order, seed=rotate_order)
+            matrices = matrix.compose_batch(translate=translate, rotate=rotate, scale=scale,
+                                            rotate_order=rotate_order)
+            translate_decompose, rotate_decompose, scale_decompose, shear_decompose = matrix.decompose_batch(
+                matrices, rotate_order=rotate_order)
+            numpy.testing.assert_allclose(translate_decompose, translate, atol=TOLERANCE)
+            numpy.testing.assert_allclose(rotate_decompose, rotate, atol=TOLERANCE)
+            numpy.testing.assert_allclose(scale_decompose, scale, atol=TOLERANCE)
+            numpy.testing.assert_allclose(shear_decompose, 0, atol=TOLERANCE)
+
+    def test_list(self):
+        matrix_compose = matrix.compose(translate=[1, 2, 3], rotate=[10, 20, 30], scale=[2, 3, 4], rotate_order=4)
+        translate, rotate, scale = matrix.decompose(matrix_compose, rotate_order=4)
+        numpy.testing.assert_allclose(translate, [1, 2, 3], atol=TOLERANCE)
+        numpy.testing.assert_allclose(rotate, [10, 20, 30], atol=TOLERANCE)
+        numpy.testing.assert_allclose(scale, [2, 3, 4], atol=TOLERANCE)
+
+    def test_shear(self):
+        random = numpy.random.RandomState(2)
+        rotate = get_random_rotate(50, 0, seed=2)
+        scale = random.uniform(0.1, 5, (50, 3))
+        shear = random.uniform(-1, 1, (50, 3))
+        matrices = matrix.compose_batch(rotate=rotate, scale=scale, shear=shear)
+        rotate_decompose, scale_decompose, shear_decompose = matrix.decompose_batch(matrices)[1:]
+        numpy.testing.assert_allclose(rotate_decompose, rotate, atol=TOLERANCE)
+        numpy.testing.assert_allclose(scale_decompose, scale, atol=TOLERANCE)
+        numpy.testing.assert_allclose(shear_decompose, shear, atol=TOLERANCE)
+
+    def test_negative_scale(self):
+        random = numpy.random.RandomState(3)
+        rotate = get_random_rotate(50, 0, seed=3)
+        scale = random.uniform(0.1, 5, (50, 3)) * [-1, 1, 1]
+        shear = random.uniform(-1, 1, (50, 3))
+        matrices = matrix.compose_batch(translate=[1, 2, 3], rotate=rotate, scale=scale, shear=shear)
+        translate_decompose, rotate_decompose, scale_decompose, shear_decompose = matrix.decompose_batch(matrices)
+        # negative scale is applied to all axes, rotation stays right handed
+        numpy.testing.assert_allclose(scale_decompose, -numpy.abs(scale), atol=TOLERANCE)
+        rotation = matrix.euler_to_rotation(rotate_decompose)
+        numpy.testing.assert_allclose(numpy.linalg.det(rotation), 1, atol=TOLERANCE)
+        numpy.testing.assert_allclose(matrix.compose_batch(translate=translate_decompose, rotate=rotate_decompose,
+                                                           scale=scale_decompose, shear=shear_decompose),
+                                      matrices, atol=TOLERANCE)
+
+
+class TestEuler(unittest.TestCase):
+    def test_gimbal(self):
+        for rotate_order in range(6):
+            middle = 'xyz'.index(ROTATE_ORDERS[rotate_order][1])
+            last = 'xyz'.index(ROTATE_ORDERS[rotate_order][2])
+            for angle in [90, -90]:
+                rotate = numpy.array([[35, 35, 35], [-120, -120, -120], [0, 0, 0]], dtype=float)
+                rotate[:, middle] = angle
+                rotation = matrix.euler_to_rotation(rotate, rotate_order=rotate_order)
+                rotate_decompose = matrix.rotation_to_euler(rotation, rotate_order=rotate_order)
+                # the last axis is set to 0, and the rotation is preserved
+                numpy.testing.assert_allclose(rotate_decompose[:, last], 0, atol=TOLERANCE)
+                numpy.testing.assert_allclose(rotate_decompose[:, middle], angle, atol=1e-6)
+                numpy.testing.assert_allclose(matrix.euler_to_rotation(rotate_decompose, rotate_order=rotate_order),
+                                              rotation, atol=TOLERANCE)
+
+    def test_near_gimbal(self):
+        for rotate_order in range(6):
+            middle = 'xyz'.index(ROTATE_ORDERS[rotate_order][1])
+            rotate = numpy.array([[20, 30, 40]] * 4, dtype=float)
+            rotate[:, middle] = [89.999, -89.999, 89.9999999, -89.9999999]
+            rotation = matrix.euler_to_rotation(rotate, rotate_order=rotate_order)
+            rotate_decompose = matrix.rotation_to_euler(rotation, rotate_order=rotate_order)
+            numpy.testing.assert_allclose(matrix.euler_to_rotation(rotate_decompose, rotate_order=rotate_order),
+                                          rotation, atol=TOLERANCE)
+
+    def test_reorder(self):
+        rotate = numpy.random.RandomState(4).uniform(-180, 180, (30, 3))
+        for rotate_order, target_rotate_order in itertools.product(range(6), range(6)):
+            rotate_reorder = matrix.reorder_euler(rotate, rotate_order, target_rotate_order)
+            numpy.testing.assert_allclose(
+                matrix.euler_to_rotation(rotate_reorder, rotate_order=target_rotate_order),
+                matrix.euler_to_rotation(rotate, rotate_order=rotate_order), atol=TOLERANCE)
+
+
+class TestQuaternion(unittest.TestCase):
+    def test_axis_values(self):
+        # 90 degrees around each axis, stored as x, y, z, w
+        half = numpy.sqrt(0.5)
+        quaternions = matrix.rotation_to_quaternion(matrix.euler_to_rotation(numpy.eye(3) * 90))
+        numpy.testing.assert_allclose(quaternions, [[half, 0, 0, half], [0, half, 0, half], [0, 0, half, half]],
+                                      atol=TOLERANCE)
+
+    def test_round_trip(self):
+        random = numpy.random.RandomState(5)
+        rotation = matrix.euler_to_rotation(random.uniform(-180, 180, (200, 3)))
+        # 180 degrees rotations have a zero w, they go through the other branches
+        rotation = numpy.vstack((rotation, matrix.euler_to_rotation([[180, 0, 0], [0, 180, 0], [0, 0, 180],
+                                                                     [180, 90, 0], [0, 0, 0]])))
+        quaternions = matrix.rotation_to_quaternion(rotation)
+        numpy.testing.assert_allclose(numpy.linalg.norm(quaternions, axis=1), 1, atol=TOLERANCE)
+        self.assertTrue(numpy.all(quaternions[:, 3] >= 0))
+        numpy.testing.assert_allclose(matrix.quaternion_to_rotation(quaternions), rotation, atol=TOLERANCE)
+        # negative quaternions are the same rotation
+        numpy.testing.assert_allclose(matrix.quaternion_to_rotation(-quaternions), rotation, atol=TOLERANCE)
+
+    def test_matrices(self):
+        matrices = matrix.compose_batch(translate=[[1, 2, 3]], rotate=[[10, 20, 30], [-40, 50, 60]])
+        numpy.testing.assert_allclose(matrix.rotation_to_quaternion(matrices),
+                                      matrix.rotation_to_quaternion(matrices[:, :3, :3]), atol=TOLERANCE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+brute force regression tests for the numpy nurbs closest point queries,
+they run headless, only numpy is needed
+"""
+import os
+import sys
+import unittest
+
+import numpy
+
+# math utils modules import each other directly, add the folder so they load without maya
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'utils', 'common', 'mathUtils'))
+
+import nurbsCurve
+import nurbsSurface
+
+# constant
+# dense samples for each knot span in brute force search
+BRUTE_FORCE_SAMPLES = 2000
+
+# closest point distance can't be further than the brute force result plus this tolerance
+TOLERANCE = 1e-6
+
+
+# function
+def brute_force_curve(nurbs_curve, points):
+    """
+    get the closest distances on curve by dense sampling
+
+    Args:
+        nurbs_curve (nurbsCurve.NurbsCurve)
+        points (numpy.ndarray): (N, 3) points positions
+
+    Returns:
+        distances (numpy.ndarray): (N,) closest distances
+    """
+    parameters = nurbsCurve.get_span_parameters(nurbs_curve.knots, nurbs_curve.degree,
+                                                len(nurbs_curve.control_vertices), BRUTE_FORCE_SAMPLES)
+    positions = nurbs_curve.get_positions(parameters)
+    return numpy.min(numpy.linalg.norm(points[:, None] - positions, axis=2), axis=1)
+
+
+def brute_force_surface(nurbs_surface, points, samples=200):
+    """
+    get the closest distances on surface by dense sampling
+
+    Args:
+        nurbs_surface (nurbsSurface.NurbsSurface)
+        points (numpy.ndarray): (N, 3) points positions
+        samples (int): samples for each knot span on each direction, default is 200
+
+    Returns:
+        distances (numpy.ndarray): (N,) closest distances
+    """
+    grid = []
+    for knots, degree in zip(nurbs_surface.knots, nurbs_surface.degrees):
+        grid.append(nurbsCurve.get_span_parameters(knots, degree, len(knots) - degree - 1, samples))
+    grid_u, grid_v = numpy.meshgrid(grid[0], grid[1], indexing='ij')
+    positions = nurbs_surface.get_positions(grid_u.reshape(-1), grid_v.reshape(-1))
+    return numpy.array([numpy.min(numpy.linalg.norm(positions - point, axis=1)) for point in points])
+
+
+# class
+class TestCurveClosestPoint(unittest.TestCase):
+    def assert_closest(self, nurbs_curve, points):
+        closest_points, parameters = nurbs_curve.closest_point(points)
+        numpy.testing.assert_allclose(nurbs_curve.get_positions(parameters), closest_points, atol=1e-9)
+        distances = numpy.linalg.norm(closest_points - points, axis=1)
+        failed = numpy.nonzero(distances > brute_force_curve(nurbs_curve, points) + TOLERANCE)[0]
+        self.assertFalse(len(failed), '{0} of {1} closest points are not the closest'.format(len(failed),
+                                                                                             len(points)))
+
+    def test_linear_corner(self):
+        nurbs_curve = nurbsCurve.NurbsCurve([[0, 0, 0], [10, 0, 0], [10, 10, 0]], [0, 1, 2], degree=1)
+        closest_points, parameters = nurbs_curve.closest_point([[11, -1, 0]])
+        numpy.testing.assert_allclose(closest_points[0], [10, 0, 0], atol=1e-6)
+        self.assertAlmostEqual(parameters[0], 1)
+
+    def test_random_linear(self):
+        random = numpy.random.RandomState(0)
+        control_vertices = random.uniform(-10, 10, (12, 3))
+        nurbs_curve = nurbsCurve.NurbsCurve(control_vertices, range(12), degree=1)
+        self.assert_closest(nurbs_curve, random.uniform(-12, 12, (300, 3)))
+
+    def test_cubic_with_kinks(self):
+        random = numpy.random.RandomState(1)
+        control_vertices = random.uniform(-10, 10, (10, 3))
+        # triple knots make c0 kinks on the curve
+        knots = [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3]
+        nurbs_curve = nurbsCurve.NurbsCurve(control_vertices, knots, degree=3)
+        self.assert_closest(nurbs_curve, random.uniform(-12, 12, (300, 3)))
+
+    def test_periodic(self):
+        random = numpy.random.RandomState(2)
+        angles = numpy.linspace(0, 2 * numpy.pi, 8, endpoint=False)
+        control_vertices = numpy.stack((numpy.cos(angles) * 5, numpy.sin(angles) * 5,
+                                        random.uniform(-1, 1, 8)), axis=1)
+        control_vertices = numpy.vstack((control_vertices, control_vertices[:3]))
+        nurbs_curve = nurbsCurve.NurbsCurve(control_vertices, range(-2, 11), degree=3, form=nurbsCurve.FORM_PERIODIC)
+        self.assert_closest(nurbs_curve, random.uniform(-7, 7, (300, 3)))
+
+    def test_rational_circle(self):
+        weight = numpy.sqrt(0.5)
+        control_vertices = [[1, 0, 0], [1, 1, 0], [0, 1, 0], [-1, 1, 0], [-1, 0, 0], [-1, -1, 0], [0, -1, 0],
+                            [1, -1, 0], [1, 0, 0]]
+        knots = [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+        nurbs_curve = nurbsCurve.NurbsCurve(control_vertices, knots, degree=2,
+                                            weights=[1, weight, 1, weight, 1, weight, 1, weight, 1])
+        points = numpy.random.RandomState(3).uniform(-3, 3, (200, 3))
+        closest_points = nurbs_curve.closest_point(points)[0]
+        projections = points * [1, 1, 0]
+        expected = projections / numpy.linalg.norm(projections, axis=1)[:, None]
+        numpy.testing.assert_allclose(closest_points, expected, atol=1e-6)
+
+
+class TestSurfaceClosestPoint(unittest.TestCase):
+    def assert_closest(self, nurbs_surface, points):
+        closest_points, parameters_u, parameters_v = nurbs_surface.closest_point(points)
+        numpy.testing.assert_allclose(nurbs_surface.get_positions(parameters_u, parameters_v), closest_points,
+                                      atol=1e-9)
+        distances = numpy.linalg.norm(closest_points - points, axis=1)
+        failed = numpy.nonzero(distances > brute_force_surface(nurbs_surface, points) + TOLERANCE)[0]
+        self.assertFalse(len(failed), '{0} of {1} closest points are not the closest'.format(len(failed),
+                                                                                             len(points)))
+
+    def test_bilinear_patches(self):
+        random = numpy.random.RandomState(4)
+        grid_u, grid_v = numpy.meshgrid(numpy.arange(4), numpy.arange(4), indexing='ij')
+        control_vertices = numpy.stack((grid_u.reshape(-1) * 3.0, grid_v.reshape(-1) * 3.0,
+                                        random.uniform(-3, 3, 16)), axis=1)
+        nurbs_surface = nurbsSurface.NurbsSurface(control_vertices, range(4), range(4), u_degree=1, v_degree=1)
+        self.assert_closest(nurbs_surface, random.uniform(-2, 11, (200, 3)))
+
+    def test_cubic_linear(self):
+        random = numpy.random.RandomState(5)
+        grid_u, grid_v = numpy.meshgrid(numpy.arange(6), numpy.arange(3), indexing='ij')
+        control_vertices = numpy.stack((grid_u.reshape(-1) * 2.0, grid_v.reshape(-1) * 2.0,
+                                        random.uniform(-2, 2, 18)), axis=1)
+        nurbs_surface = nurbsSurface.NurbsSurface(control_vertices, [0, 0, 0, 1, 2, 3, 3, 3], range(3),
+                                                  u_degree=3, v_degree=1)
+        self.assert_closest(nurbs_surface, random.uniform(-2, 12, (200, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
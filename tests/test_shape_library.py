@@ -0,0 +1,90 @@
+"""
+tests for the binary control shape library, they run headless
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/common/fileUtils', 'utils/rigging')
+headless.stub_modules('cPickle')
+
+import jsonUtils
+import shapeLibraryUtils
+
+# constant
+CONFIG_PATH = os.path.join(headless.ROOT, 'utils', 'rigging', 'config', 'CONTROL_SHAPE.cfg')
+LIBRARY_PATH = os.path.join(headless.ROOT, 'utils', 'rigging', 'config', 'CONTROL_SHAPE.lib')
+
+
+# class
+class TestShapeLibrary(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.library_path = os.path.join(self.folder, 'CONTROL_SHAPE.lib')
+        self.config_path = os.path.join(self.folder, 'CONTROL_SHAPE.cfg')
+        shapeLibraryUtils.compile_library(CONFIG_PATH, self.library_path)
+
+    def tearDown(self):
+        shapeLibraryUtils.LIBRARIES.pop(self.library_path, None)
+        shutil.rmtree(self.folder)
+
+    def read_bytes(self, path):
+        with open(path, 'rb') as library_file:
+            return library_file.read()
+
+    def test_shipped_library(self):
+        # the shipped library is compiled from the shipped config
+        self.assertEqual(self.read_bytes(self.library_path), self.read_bytes(LIBRARY_PATH))
+
+    def test_shape_info(self):
+        config_info = jsonUtils.read(CONFIG_PATH)
+        self.assertEqual(shapeLibraryUtils.get_shape_names(self.library_path), sorted(config_info.keys()))
+        for shape_name, shape_info in config_info.items():
+            library_info = shapeLibraryUtils.get_shape_info(self.library_path, shape_name)
+            self.assertEqual(library_info['num_cvs'], len(shape_info['control_vertices']))
+            for key in ['degree', 'form']:
+                self.assertEqual(library_info[key], shape_info[key])
+            for key in ['control_vertices', 'knots']:
+                numpy.testing.assert_allclose(library_info[key], shape_info[key], rtol=1e-6, atol=1e-6)
+
+    def test_append(self):
+        size = os.path.getsize(self.library_path)
+        shape_info = {'num_cvs': 2, 'control_vertices': [[0, 0, 0], [1, 2, 3]], 'knots': [0, 1], 'degree': 1,
+                      'form': 0}
+        shapeLibraryUtils.get_shape_names(self.library_path)
+        shapeLibraryUtils.append_shapes(self.library_path, {'line': shape_info})
+        # only the new record is written, the existing records are kept
+        self.assertEqual(self.read_bytes(self.library_path)[:size], self.read_bytes(LIBRARY_PATH))
+        self.assertIn('line', shapeLibraryUtils.get_shape_names(self.library_path))
+        self.assertEqual(shapeLibraryUtils.get_shape_info(self.library_path, 'line'), shape_info)
+
+        # the latest record wins
+        shape_info = dict(shape_info, control_vertices=[[0, 0, 0], [3, 2, 1]])
+        shapeLibraryUtils.append_shapes(self.library_path, {'line': shape_info})
+        self.assertEqual(shapeLibraryUtils.get_shape_info(self.library_path, 'line'), shape_info)
+
+    def test_export(self):
+        shapeLibraryUtils.append_shapes(self.library_path, {'cube': {'num_cvs': 2, 'knots': [0, 1], 'degree': 1,
+                                                                     'control_vertices': [[0, 0, 0], [0.1, 0, 0]],
+                                                                     'form': 0}})
+        shapeLibraryUtils.export_config(self.library_path, self.config_path)
+        config_info = jsonUtils.read(self.config_path)
+        self.assertEqual(config_info['cube']['control_vertices'], [[0, 0, 0], [0.1, 0, 0]])
+
+        # the exported config compiles to the same shapes, without the overridden record
+        library_path = os.path.join(self.folder, 'export.lib')
+        shapeLibraryUtils.compile_library(self.config_path, library_path)
+        self.assertLess(os.path.getsize(library_path), os.path.getsize(self.library_path))
+        for shape_name in shapeLibraryUtils.get_shape_names(self.library_path):
+            self.assertEqual(shapeLibraryUtils.get_shape_info(library_path, shape_name),
+                             shapeLibraryUtils.get_shape_info(self.library_path, shape_name))
+        shapeLibraryUtils.LIBRARIES.pop(library_path, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+tests for the spatial hash symmetry map, they run headless
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/rigging/deformerUtils', 'utils/common/fileUtils')
+headless.stub_modules('cPickle', 'utils.common.namingUtils', 'utils.modeling.meshUtils')
+
+import skinMirror
+
+
+# function
+def get_symmetric_points(num, center=0, seed=0):
+    """
+    get shuffled points symmetric across x, with some points on the center plane
+
+    Args:
+        num (int): points number on each side
+        center (int): points number on the center plane, default is 0
+        seed (int): random seed, default is 0
+
+    Returns:
+        points (numpy.ndarray): (num * 2 + center, 3) points positions
+    """
+    random = numpy.random.RandomState(seed)
+    points = random.uniform(0.1, 10, (num, 3))
+    points_mirror = points * [-1, 1, 1]
+    points_center = random.uniform(-10, 10, (center, 3)) * [0, 1, 1]
+    points = numpy.vstack((points, points_mirror, points_center))
+    return points[random.permutation(len(points))]
+
+
+# class
+class TestSymmetryMap(unittest.TestCase):
+    def test_involution(self):
+        points = get_symmetric_points(500)
+        # positions drift a little, still in tolerance
+        points += numpy.random.RandomState(1).uniform(-2e-4, 2e-4, points.shape)
+        symmetry_map, side_map = skinMirror.get_symmetry_map(points, axis='x', tolerance=0.001)
+        self.assertTrue(numpy.all(symmetry_map >= 0))
+        numpy.testing.assert_array_equal(symmetry_map[symmetry_map], numpy.arange(len(points)))
+        numpy.testing.assert_allclose(points[symmetry_map] * [-1, 1, 1], points, atol=0.001)
+        numpy.testing.assert_array_equal(side_map, numpy.sign(points[:, 0]))
+
+    def test_center(self):
+        points = get_symmetric_points(100, center=20)
+        symmetry_map, side_map = skinMirror.get_symmetry_map(points, axis='x')
+        center = numpy.nonzero(points[:, 0] == 0)[0]
+        self.assertEqual(len(center), 20)
+        numpy.testing.assert_array_equal(symmetry_map[center], center)
+        numpy.testing.assert_array_equal(side_map[center], 0)
+
+    def test_axis(self):
+        points = get_symmetric_points(100)[:, [1, 2, 0]]
+        symmetry_map = skinMirror.get_symmetry_map(points, axis='z')[0]
+        numpy.testing.assert_allclose(points[symmetry_map], points * [1, 1, -1])
+
+    def test_unmatched(self):
+        points = numpy.vstack((get_symmetric_points(50), [[3, 4, 5], [-3.01, 4, 5]]))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            symmetry_map = skinMirror.get_symmetry_map(points, axis='x', tolerance=0.001)[0]
+        self.assertEqual(len(caught), 1)
+        numpy.testing.assert_array_equal(symmetry_map[-2:], [-1, -1])
+        self.assertTrue(numpy.all(symmetry_map[:-2] >= 0))
+
+
+class TestMeshSymmetryMap(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.points = get_symmetric_points(30, center=4)
+        self.get_shape_info = getattr(skinMirror.meshUtils, 'get_shape_info', None)
+        skinMirror.meshUtils.get_shape_info = lambda mesh, as_numpy=False: {
+            'poly_count_array': numpy.array([3]), 'poly_connects': numpy.array([0, 1, 2]),
+            'points_array': self.points}
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        if self.get_shape_info is None:
+            del skinMirror.meshUtils.get_shape_info
+        else:
+            skinMirror.meshUtils.get_shape_info = self.get_shape_info
+
+    def test_cache(self):
+        symmetry_map, side_map = skinMirror.get_mesh_symmetry_map('mesh', cache_dir=self.cache_dir)
+        # only the cache file is left, no temp file
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        # the second query reads the cache instead of the mesh points, reordered points would give another map
+        self.points = self.points[::-1]
+        self.assertFalse(numpy.array_equal(skinMirror.get_symmetry_map(self.points)[0], symmetry_map))
+        symmetry_map_cache, side_map_cache = skinMirror.get_mesh_symmetry_map('mesh', cache_dir=self.cache_dir)
+        numpy.testing.assert_array_equal(symmetry_map_cache, symmetry_map)
+        numpy.testing.assert_array_equal(side_map_cache, side_map)
+        self.assertEqual(side_map_cache.dtype, numpy.int8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+tests for the numpy skin weights processing functions, they run headless
+"""
+import unittest
+import warnings
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/rigging/deformerUtils')
+headless.stub_modules('maya.cmds', 'utils.modeling.meshUtils', 'skinCluster')
+
+import skinWeights
+
+
+# function
+def get_grid_mesh(rows, columns):
+    """
+    get a quad grid mesh's polygons info, vertices are in row major order
+
+    Args:
+        rows (int): vertices number in each column
+        columns (int): vertices number in each row
+
+    Returns:
+        poly_count_array (numpy.ndarray)
+        poly_connects (numpy.ndarray)
+    """
+    indices = numpy.arange(rows * columns).reshape(rows, columns)
+    quads = numpy.stack((indices[:-1, :-1], indices[1:, :-1], indices[1:, 1:], indices[:-1, 1:]), axis=-1)
+    return numpy.full((rows - 1) * (columns - 1), 4), quads.reshape(-1)
+
+
+def get_random_weights(influences, components, seed=0):
+    """
+    get random normalized weights
+
+    Args:
+        influences (int): influences number
+        components (int): components number
+        seed (int): random seed, default is 0
+
+    Returns:
+        array_weights (numpy.ndarray)
+    """
+    array_weights = numpy.random.RandomState(seed).rand(influences, components)
+    return array_weights / array_weights.sum(axis=0)
+
+
+# class
+class TestNormalize(unittest.TestCase):
+    def test_sums(self):
+        array_weights = numpy.random.RandomState(1).rand(5, 20) * 3
+        numpy.testing.assert_allclose(skinWeights.normalize(array_weights).sum(axis=0), 1)
+
+    def test_locked(self):
+        array_weights = get_random_weights(4, 20)
+        array_weights[1] = 0.3
+        array_weights[2] *= 5
+        locked = [False, True, False, False]
+        normalized = skinWeights.normalize(array_weights, locked=locked)
+        numpy.testing.assert_allclose(normalized.sum(axis=0), 1)
+        numpy.testing.assert_array_equal(normalized[1], array_weights[1])
+
+    def test_locked_over_one(self):
+        array_weights = numpy.array([[0.8, 0.2], [0.7, 0.3], [0.1, 0.5]])
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            normalized = skinWeights.normalize(array_weights, locked=[True, True, False])
+        self.assertEqual(len(caught), 1)
+        numpy.testing.assert_allclose(normalized.sum(axis=0), 1)
+        # the first component's locked weights sum up over 1, so they are renormalized
+        numpy.testing.assert_allclose(normalized[:, 0], [0.8 / 1.5, 0.7 / 1.5, 0])
+        numpy.testing.assert_allclose(normalized[:, 1], [0.2, 0.3, 0.5])
+
+    def test_empty_components(self):
+        array_weights = numpy.zeros((3, 4))
+        numpy.testing.assert_array_equal(skinWeights.normalize(array_weights), array_weights)
+
+
+class TestPrune(unittest.TestCase):
+    def test_threshold(self):
+        array_weights = numpy.array([[0.0005, 0.5], [0.9995, 0.4995], [0, 0.0005]])
+        pruned = skinWeights.prune(array_weights, threshold=0.001)
+        numpy.testing.assert_allclose(pruned, [[0, 0.5 / 0.9995], [1, 0.4995 / 0.9995], [0, 0]])
+
+    def test_keep_biggest(self):
+        array_weights = numpy.array([[0.0004, 0.5], [0.0006, 0.5]])
+        pruned = skinWeights.prune(array_weights, threshold=0.001)
+        numpy.testing.assert_allclose(pruned[:, 0], [0, 1])
+
+    def test_locked(self):
+        array_weights = numpy.array([[0.0005, 0.5], [0.9995, 0.5]])
+        pruned = skinWeights.prune(array_weights, threshold=0.001, locked=[True, False])
+        numpy.testing.assert_allclose(pruned, array_weights)
+
+
+class TestLimitInfluences(unittest.TestCase):
+    def test_top_influences(self):
+        array_weights = get_random_weights(8, 50)
+        limited = skinWeights.limit_influences(array_weights, max_influences=3)
+        self.assertTrue(numpy.all(numpy.count_nonzero(limited, axis=0) <= 3))
+        numpy.testing.assert_allclose(limited.sum(axis=0), 1)
+        # the kept influences are the biggest ones
+        top = numpy.sort(array_weights, axis=0)[-3:]
+        numpy.testing.assert_allclose(numpy.sort(limited, axis=0)[-3:], top / top.sum(axis=0))
+
+    def test_locked(self):
+        array_weights = get_random_weights(6, 30)
+        array_weights[5] = 1e-4
+        locked = [False] * 5 + [True]
+        limited = skinWeights.limit_influences(array_weights, max_influences=2, locked=locked)
+        numpy.testing.assert_array_equal(limited[5], array_weights[5])
+        self.assertTrue(numpy.all(numpy.count_nonzero(limited, axis=0) <= 2))
+        numpy.testing.assert_allclose(limited.sum(axis=0), 1)
+
+    def test_fewer_influences(self):
+        array_weights = get_random_weights(3, 10)
+        numpy.testing.assert_allclose(skinWeights.limit_influences(array_weights, max_influences=4), array_weights)
+
+
+class TestAdjacency(unittest.TestCase):
+    def test_grid(self):
+        poly_count_array, poly_connects = get_grid_mesh(3, 3)
+        neighbors, neighbor_offsets = skinWeights.get_adjacency(poly_count_array, poly_connects)
+        expected = {0: [1, 3], 1: [0, 2, 4], 4: [1, 3, 5, 7], 8: [5, 7]}
+        self.assertEqual(len(neighbor_offsets), 10)
+        for vertex, vertex_neighbors in expected.items():
+            self.assertEqual(sorted(neighbors[neighbor_offsets[vertex]: neighbor_offsets[vertex + 1]]),
+                             vertex_neighbors)
+
+    def test_mixed_polygons(self):
+        # a triangle and a quad sharing the edge 1-2, vertex 5 is not used by any polygon
+        neighbors, neighbor_offsets = skinWeights.get_adjacency([3, 4], [0, 1, 2, 1, 3, 4, 2], num_vertices=6)
+        adjacency = [sorted(neighbors[neighbor_offsets[i]: neighbor_offsets[i + 1]]) for i in range(6)]
+        self.assertEqual(adjacency, [[1, 2], [0, 2, 3], [0, 1, 4], [1, 4], [2, 3], []])
+
+
+class TestSmooth(unittest.TestCase):
+    def setUp(self):
+        self.adjacency = skinWeights.get_adjacency(*get_grid_mesh(6, 6))
+
+    def test_constant(self):
+        array_weights = numpy.tile([[0.2], [0.3], [0.5]], (1, 36))
+        numpy.testing.assert_allclose(skinWeights.smooth(array_weights, self.adjacency, iterations=3),
+                                      array_weights)
+
+    def test_sums(self):
+        array_weights = get_random_weights(4, 36)
+        smoothed = skinWeights.smooth(array_weights, self.adjacency, iterations=2)
+        numpy.testing.assert_allclose(smoothed.sum(axis=0), 1)
+        # smoothing pulls weights to the neighbours' average, so the spread gets smaller
+        self.assertLess(smoothed.std(axis=1).sum(), array_weights.std(axis=1).sum())
+
+    def test_locked(self):
+        array_weights = get_random_weights(4, 36)
+        locked = [True, False, False, False]
+        smoothed = skinWeights.smooth(array_weights, self.adjacency, iterations=2, locked=locked)
+        numpy.testing.assert_allclose(smoothed[0], array_weights[0])
+        numpy.testing.assert_allclose(smoothed.sum(axis=0), 1)
+
+    def test_block_size(self):
+        array_weights = get_random_weights(5, 36)
+        smoothed = skinWeights.smooth(array_weights, self.adjacency)
+        block_size = skinWeights.SMOOTH_BLOCK_SIZE
+        skinWeights.SMOOTH_BLOCK_SIZE = 1
+        try:
+            numpy.testing.assert_allclose(skinWeights.smooth(array_weights, self.adjacency), smoothed)
+        finally:
+            skinWeights.SMOOTH_BLOCK_SIZE = block_size
+
+
+if __name__ == '__main__':
+    unittest.main()
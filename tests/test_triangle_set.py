@@ -0,0 +1,138 @@
+"""
+brute force regression tests for the numpy triangle set closest point queries, they run headless
+"""
+import unittest
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/common/mathUtils')
+
+import triangleSet
+
+# constant
+TOLERANCE = 1e-9
+
+
+# function
+def get_sphere(rows=20, columns=40):
+    """
+    get a closed uv sphere's points and triangles with radius 1
+
+    Args:
+        rows (int): rows number between the poles, default is 20
+        columns (int): columns number around the axis, default is 40
+
+    Returns:
+        points (numpy.ndarray): (V, 3) points positions
+        triangles (numpy.ndarray): (T, 3) triangles' vertices indices
+    """
+    theta, phi = numpy.meshgrid(numpy.linspace(0, numpy.pi, rows + 1)[1:-1],
+                                numpy.linspace(0, 2 * numpy.pi, columns, endpoint=False), indexing='ij')
+    points = numpy.stack((numpy.sin(theta) * numpy.cos(phi), numpy.cos(theta), numpy.sin(theta) * numpy.sin(phi)),
+                         axis=-1).reshape(-1, 3)
+    points = numpy.vstack((points, [[0, 1, 0], [0, -1, 0]]))
+    top = len(points) - 2
+    bottom = len(points) - 1
+
+    indices = numpy.arange((rows - 1) * columns).reshape(rows - 1, columns)
+    indices_next = numpy.roll(indices, -1, axis=1)
+    quads = numpy.stack((indices[:-1], indices[1:], indices_next[1:], indices_next[:-1]), axis=-1).reshape(-1, 4)
+    triangles = numpy.vstack((quads[:, [0, 2, 1]], quads[:, [0, 3, 2]],
+                              numpy.c_[numpy.full(columns, top), indices_next[0], indices[0]],
+                              numpy.c_[numpy.full(columns, bottom), indices[-1], indices_next[-1]]))
+    return points, triangles
+
+
+def brute_force(triangle_set, points):
+    """
+    get the closest distances by testing each point against all triangles
+
+    Args:
+        triangle_set (triangleSet.TriangleSet)
+        points (numpy.ndarray): (M, 3) points positions
+
+    Returns:
+        distances (numpy.ndarray): (M,) closest distances
+    """
+    count = len(triangle_set.triangles)
+    pair_points = numpy.repeat(points, count, axis=0)
+    pair_triangles = numpy.tile(numpy.arange(count), len(points))
+    weights = triangle_set._closest_point_pairs(pair_points, pair_triangles)
+    distances = numpy.linalg.norm(pair_points - triangle_set._get_positions(pair_triangles, weights), axis=1)
+    return distances.reshape(len(points), count).min(axis=1)
+
+
+def get_random_points(count, radius_min, radius_max, seed=0):
+    """
+    get random points between two spheres around the origin
+
+    Args:
+        count (int): points number
+        radius_min (float): min distance to the origin
+        radius_max (float): max distance to the origin
+        seed (int): random seed, default is 0
+
+    Returns:
+        points (numpy.ndarray): (count, 3) points positions
+    """
+    random = numpy.random.RandomState(seed)
+    directions = random.normal(size=(count, 3))
+    directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+    return directions * random.uniform(radius_min, radius_max, (count, 1))
+
+
+# class
+class TestClosestPoint(unittest.TestCase):
+    def setUp(self):
+        self.triangle_set = triangleSet.TriangleSet(*get_sphere())
+
+    def assert_closest(self, points):
+        closest_points, triangle_indices, weights = self.triangle_set.closest_point(points)
+        numpy.testing.assert_allclose(weights.sum(axis=1), 1, atol=TOLERANCE)
+        numpy.testing.assert_allclose(self.triangle_set._get_positions(triangle_indices, weights), closest_points,
+                                      atol=TOLERANCE)
+        numpy.testing.assert_allclose(numpy.linalg.norm(closest_points - points, axis=1),
+                                      brute_force(self.triangle_set, points), atol=TOLERANCE)
+
+    def test_near(self):
+        self.assert_closest(get_random_points(200, 0.9, 1.1, seed=1))
+
+    def test_inside(self):
+        self.assert_closest(get_random_points(200, 0, 0.6, seed=2))
+
+    def test_far(self):
+        self.assert_closest(get_random_points(200, 5, 20, seed=3))
+
+    def test_chunks(self):
+        chunk_pairs = triangleSet.CHUNK_PAIRS
+        triangleSet.CHUNK_PAIRS = 1
+        try:
+            self.assert_closest(get_random_points(50, 0, 20, seed=4))
+        finally:
+            triangleSet.CHUNK_PAIRS = chunk_pairs
+
+    def test_grid_only(self):
+        # all points go through the grid search
+        brute_force_ratio = triangleSet.BRUTE_FORCE_RATIO
+        triangleSet.BRUTE_FORCE_RATIO = numpy.inf
+        try:
+            self.assert_closest(get_random_points(100, 0, 5, seed=5))
+        finally:
+            triangleSet.BRUTE_FORCE_RATIO = brute_force_ratio
+
+    def test_signed_distance(self):
+        points = get_random_points(200, 0, 3, seed=6)
+        distances = self.triangle_set.signed_distance(points)
+        radius = numpy.linalg.norm(points, axis=1)
+        # the sphere is faceted, so only points clearly inside or outside are checked
+        numpy.testing.assert_array_equal(distances[radius < 0.9] < 0, True)
+        numpy.testing.assert_array_equal(distances[radius > 1.1] > 0, True)
+
+    def test_empty(self):
+        self.assertRaises(ValueError, triangleSet.TriangleSet, [[0, 0, 0], [1, 0, 0], [0, 1, 0]], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
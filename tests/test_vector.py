@@ -0,0 +1,183 @@
+"""
+tests comparing the single vector and point functions with their batch functions, they run headless
+"""
+import unittest
+
+import numpy
+
+from tests import headless
+
+headless.add_paths('utils/common/mathUtils')
+
+import vector
+import point
+import matrix
+
+# constant
+TOLERANCE = 1e-12
+
+
+# function
+def get_random_vectors(count, seed=0):
+    """
+    get random vectors, none of them is zero length
+
+    Args:
+        count (int): vectors number
+        seed (int): random seed, default is 0
+
+    Returns:
+        vectors (numpy.ndarray): (count, 3) vectors
+    """
+    return numpy.random.RandomState(seed).uniform(-10, 10, (count, 3)) + [0.5, 0, 0]
+
+
+# class
+class TestVector(unittest.TestCase):
+    def setUp(self):
+        self.vectors_a = get_random_vectors(100, seed=0)
+        self.vectors_b = get_random_vectors(100, seed=1)
+
+    def assert_batch(self, function, function_batch, *args, **kwargs):
+        # single function on each item matches the batch function, and both match the expected values
+        expected = kwargs.pop('expected')
+        values = [function(*[arg[i].tolist() for arg in args], **kwargs) for i in range(len(args[0]))]
+        numpy.testing.assert_allclose(values, expected, rtol=TOLERANCE, atol=TOLERANCE)
+        numpy.testing.assert_allclose(function_batch(*args, **kwargs), expected, rtol=TOLERANCE, atol=TOLERANCE)
+
+    def test_create(self):
+        delta = self.vectors_b - self.vectors_a
+        self.assert_batch(vector.create, vector.create_batch, self.vectors_a, self.vectors_b, normalize=False,
+                          expected=delta)
+        self.assert_batch(vector.create, vector.create_batch, self.vectors_a, self.vectors_b,
+                          expected=delta / numpy.linalg.norm(delta, axis=1)[:, None])
+
+    def test_length_norm(self):
+        lengths = numpy.linalg.norm(self.vectors_a, axis=1)
+        self.assert_batch(vector.length, vector.length_batch, self.vectors_a, expected=lengths)
+        self.assert_batch(vector.norm, vector.norm_batch, self.vectors_a, expected=self.vectors_a / lengths[:, None])
+
+    def test_dot_product(self):
+        self.assert_batch(vector.dot_product, vector.dot_product_batch, self.vectors_a, self.vectors_b,
+                          expected=numpy.sum(self.vectors_a * self.vectors_b, axis=1))
+
+    def test_cross_product(self):
+        cross = numpy.cross(self.vectors_a, self.vectors_b)
+        self.assert_batch(vector.cross_product, vector.cross_product_batch, self.vectors_a, self.vectors_b,
+                          normalize=False, expected=cross)
+        self.assert_batch(vector.cross_product, vector.cross_product_batch, self.vectors_a, self.vectors_b,
+                          expected=cross / numpy.linalg.norm(cross, axis=1)[:, None])
+
+    def test_project_onto_plane(self):
+        normals = self.vectors_b / numpy.linalg.norm(self.vectors_b, axis=1)[:, None]
+        projections = self.vectors_a - numpy.sum(self.vectors_a * normals, axis=1)[:, None] * normals
+        self.assert_batch(vector.project_onto_plane, vector.project_onto_plane_batch, self.vectors_a, normals,
+                          normalize=False, expected=projections)
+        numpy.testing.assert_allclose(numpy.sum(projections * normals, axis=1), 0, atol=1e-9)
+
+    def test_broadcast(self):
+        numpy.testing.assert_allclose(vector.dot_product_batch(self.vectors_a, [1, 0, 0]), self.vectors_a[:, 0])
+        numpy.testing.assert_allclose(vector.cross_product_batch([0, 0, 1], self.vectors_a, normalize=False),
+                                      numpy.cross([0, 0, 1], self.vectors_a))
+
+    def test_out(self):
+        vectors = self.vectors_a.copy()
+        vectors_norm = vector.norm_batch(vectors, out=vectors)
+        self.assertIs(vectors_norm, vectors)
+        numpy.testing.assert_allclose(vectors, vector.norm_batch(self.vectors_a))
+
+        vectors = self.vectors_a.copy()
+        vector.cross_product_batch(vectors, self.vectors_b, normalize=False, out=vectors)
+        numpy.testing.assert_allclose(vectors, numpy.cross(self.vectors_a, self.vectors_b))
+
+
+class TestCoordinateSystem(unittest.TestCase):
+    def test_values(self):
+        vector_x, vector_y, vector_z = vector.coordinate_system([1, 0, 0], [2, 2, 3])
+        numpy.testing.assert_allclose(vector_x, [1, 0, 0])
+        numpy.testing.assert_allclose(vector_y, [0, 0.5547001962252291, 0.8320502943378437], atol=TOLERANCE)
+        numpy.testing.assert_allclose(vector_z, [0, -0.8320502943378437, 0.5547001962252291], atol=TOLERANCE)
+
+    def test_batch(self):
+        vectors_x = get_random_vectors(100, seed=2)
+        vectors_y = get_random_vectors(100, seed=3)
+        vectors_batch = vector.coordinate_system_batch(vectors_x, vectors_y)
+        for i in range(100):
+            vectors = vector.coordinate_system(vectors_x[i].tolist(), vectors_y[i].tolist())
+            for v, v_batch in zip(vectors, vectors_batch):
+                numpy.testing.assert_allclose(v, v_batch[i], atol=TOLERANCE)
+        # orthonormal right handed systems
+        rotation = numpy.stack(vectors_batch, axis=1)
+        numpy.testing.assert_allclose(numpy.matmul(rotation, rotation.transpose(0, 2, 1)),
+                                      numpy.tile(numpy.eye(3), (100, 1, 1)), atol=TOLERANCE)
+        numpy.testing.assert_allclose(numpy.linalg.det(rotation), 1, atol=TOLERANCE)
+
+    def test_flip(self):
+        # the reference's z is opposite, so the system flips around x
+        vectors = vector.coordinate_system([1, 0, 0], [2, 2, 3], reference=[[1, 0, 0], [0, -1, 0], [0, 0, -1]])
+        numpy.testing.assert_allclose(vectors[1], [0, -0.5547001962252291, -0.8320502943378437], atol=TOLERANCE)
+        numpy.testing.assert_allclose(vectors[2], [0, 0.8320502943378437, -0.5547001962252291], atol=TOLERANCE)
+
+        # the reference agrees with the system, nothing flips
+        vectors_keep = vector.coordinate_system([1, 0, 0], [2, 2, 3], reference=numpy.eye(3))
+        numpy.testing.assert_allclose(vectors_keep, vector.coordinate_system([1, 0, 0], [2, 2, 3]), atol=TOLERANCE)
+
+    def test_flip_batch(self):
+        vectors_x = get_random_vectors(100, seed=4)
+        vectors_y = get_random_vectors(100, seed=5)
+        vectors_batch = vector.coordinate_system_batch(vectors_x, vectors_y)
+        # reference as a numpy array, each system's own frame with z flipped on every other system
+        reference = numpy.array(vectors_batch)
+        reference[2, ::2] *= -1
+        vectors_flip = vector.coordinate_system_batch(vectors_x, vectors_y, reference=reference)
+        numpy.testing.assert_allclose(vectors_flip[0], vectors_batch[0], atol=TOLERANCE)
+        numpy.testing.assert_allclose(vectors_flip[2], reference[2], atol=TOLERANCE)
+        numpy.testing.assert_allclose(vectors_flip[1][::2], -vectors_batch[1][::2], atol=TOLERANCE)
+        numpy.testing.assert_allclose(vectors_flip[1][1::2], vectors_batch[1][1::2], atol=TOLERANCE)
+        for i in [0, 1]:
+            vectors = vector.coordinate_system(vectors_x[i].tolist(), vectors_y[i].tolist(),
+                                               reference=reference[:, i])
+            for v, v_flip in zip(vectors, vectors_flip):
+                numpy.testing.assert_allclose(v, v_flip[i], atol=TOLERANCE)
+
+
+class TestPoint(unittest.TestCase):
+    def setUp(self):
+        self.points_a = get_random_vectors(100, seed=6)
+        self.points_b = get_random_vectors(100, seed=7)
+
+    def test_distance(self):
+        distances = numpy.linalg.norm(self.points_b - self.points_a, axis=1)
+        numpy.testing.assert_allclose([point.get_distance(a, b) for a, b in zip(self.points_a.tolist(),
+                                                                                self.points_b.tolist())],
+                                      distances, rtol=TOLERANCE)
+        numpy.testing.assert_allclose(point.get_distance_batch(self.points_a, self.points_b), distances,
+                                      rtol=TOLERANCE)
+
+    def test_point_from_vector(self):
+        distances = numpy.random.RandomState(8).uniform(-2, 2, 100)
+        expected = self.points_a + self.points_b * distances[:, None]
+        numpy.testing.assert_allclose([point.get_point_from_vector(v, p, distance=d) for v, p, d in
+                                       zip(self.points_b.tolist(), self.points_a.tolist(), distances)],
+                                      expected, rtol=TOLERANCE, atol=TOLERANCE)
+        numpy.testing.assert_allclose(point.get_point_from_vector_batch(self.points_b, self.points_a,
+                                                                        distances=distances),
+                                      expected, rtol=TOLERANCE, atol=TOLERANCE)
+
+    def test_mult_matrix(self):
+        matrices = matrix.compose_batch(translate=self.points_b, rotate=self.points_b * 10,
+                                        scale=numpy.abs(self.points_b) + 0.1)
+        expected = numpy.einsum('ni,nij->nj', numpy.c_[self.points_a, numpy.ones(100)], matrices)[:, :3]
+        numpy.testing.assert_allclose([point.mult_matrix(p, m) for p, m in zip(self.points_a, matrices)], expected,
+                                      rtol=TOLERANCE, atol=1e-9)
+        numpy.testing.assert_allclose(point.mult_matrix_batch(self.points_a, matrices), expected,
+                                      rtol=TOLERANCE, atol=1e-9)
+
+        # one matrix for all points
+        numpy.testing.assert_allclose(point.array_mult_matrix(self.points_a, matrices[0]),
+                                      numpy.c_[self.points_a, numpy.ones(100)].dot(matrices[0])[:, :3],
+                                      rtol=TOLERANCE, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,27 @@
+# import external library
+import numpy
+
 # import maya python library
 import maya.api.OpenMaya as OpenMaya2
 
+# constant
+# arrays converted to (N, 3) positions or vectors
+POINT_ARRAY_TYPES = (OpenMaya2.MPointArray, OpenMaya2.MFloatPointArray,
+                     OpenMaya2.MVectorArray, OpenMaya2.MFloatVectorArray)
+
 
+# function
 def to_list(array):
     """
     convert input MPointArray/MDoubleArray object to list
 
     Args:
-        array (MPointArray/MDoubleArray): MPointArray, MDagPathArray or MDoubleArray
+        array (MPointArray/MDoubleArray): MPointArray, MVectorArray, MDagPathArray or MDoubleArray
 
     Returns:
         array_list (list)
     """
-    if isinstance(array, OpenMaya2.MPointArray):
+    if isinstance(array, POINT_ARRAY_TYPES):
         return _point_array_to_list(array)
     elif isinstance(array, OpenMaya2.MDagPathArray):
         return _dag_path_array_to_list(array)
@@ -20,6 +29,45 @@ def to_list(array):
         return _double_array_to_list(array)
 
 
+def to_numpy(array, dtype=None):
+    """
+    convert input Maya api array object to numpy array,
+    api 2.0 arrays don't expose buffer protocol, so numpy reads the array as a sequence in C,
+    which avoids creating a python object for each component like to_list
+
+    Args:
+        array (MPointArray/MDoubleArray): MPointArray, MFloatPointArray, MVectorArray, MFloatVectorArray,
+                                          MDoubleArray, MFloatArray, MIntArray or MDagPathArray
+        dtype (numpy.dtype): output data type, default is None, which uses float for points and vectors,
+                             and keeps the array's own type for others
+
+    Returns:
+        numpy_array (numpy.ndarray): points and vectors are in shape (N, 3), dag paths are partial path names
+
+    Examples:
+        import maya.api.OpenMaya as OpenMaya2
+        import utils.common.apiUtils as apiUtils
+
+        apiUtils.MArray.to_numpy(OpenMaya2.MPointArray([[1, 2, 3], [4, 5, 6]]))
+        # array([[1., 2., 3.],
+        #        [4., 5., 6.]])
+    """
+    if isinstance(array, POINT_ARRAY_TYPES):
+        if dtype is None:
+            dtype = float
+        if not len(array):
+            return numpy.zeros((0, 3), dtype=dtype)
+        # MPoint has 4 components, only keep xyz
+        numpy_array = numpy.array(array, dtype=dtype)
+        if numpy_array.shape[1] > 3:
+            numpy_array = numpy.ascontiguousarray(numpy_array[:, :3])
+        return numpy_array
+    elif isinstance(array, OpenMaya2.MDagPathArray):
+        return numpy.array(_dag_path_array_to_list(array))
+    else:
+        return numpy.array(array, dtype=dtype)
+
+
 def to_MPointArray(points):
     """
     convert points list to MPointArray
@@ -33,6 +81,7 @@ def to_MPointArray(points):
     return OpenMaya2.MPointArray(points)
 
 
+# sub function
 def _point_array_to_list(point_array):
     """
     convert MPointArray to list
@@ -43,12 +92,7 @@ def _point_array_to_list(point_array):
     Returns:
         point_list (list)
     """
-    point_list = []
-    for i in range(len(point_array)):
-        point_list.append([point_array[i].x,
-                           point_array[i].y,
-                           point_array[i].z])
-    return point_list
+    return to_numpy(point_array).tolist()
 
 
 def _double_array_to_list(double_array):
@@ -59,11 +103,7 @@ def _double_array_to_list(double_array):
     Returns:
         array_list(list)
     """
-
-    array_list = []
-    for i in range(len(double_array)):
-        array_list.append(double_array[i])
-    return array_list
+    return numpy.array(double_array).tolist()
 
 
 def _dag_path_array_to_list(dag_path_array):
@@ -1,6 +1,10 @@
 # import python library
+import os
 import json
 
+# import utils
+import pathUtils
+
 
 # function
 def read(file_path):
@@ -27,13 +31,15 @@ def read(file_path):
     return file_data
 
 
-def write(file_path, file_data):
+def write(file_path, file_data, atomic=False):
     """
     write json data to the given path
 
     Args:
         file_path (str): json file path
         file_data (list/dict): json file data
+        atomic (bool): write to a temp file first and rename it to the given path,
+                       so the file is never left half written, default is False
 
     Examples:
         import utils.common.fileUtils as fileUtils
@@ -43,6 +49,22 @@ def write(file_path, file_data):
 
         fileUtils.jsonUtils.write(file_path, file_data)
     """
-    outfile = open(file_path, 'w')
-    json.dump(file_data, outfile, indent=4, sort_keys=True)
-    outfile.close()
+    if not atomic:
+        outfile = open(file_path, 'w')
+        json.dump(file_data, outfile, indent=4, sort_keys=True)
+        outfile.close()
+        return
+
+    temp_path = pathUtils.get_temp_path(file_path)
+    try:
+        outfile = open(temp_path, 'w')
+        try:
+            json.dump(file_data, outfile, indent=4, sort_keys=True)
+        finally:
+            outfile.close()
+        pathUtils.replace_file(temp_path, file_path)
+    except Exception:
+        # don't leave the temp file behind if the data can't be written
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+        raise
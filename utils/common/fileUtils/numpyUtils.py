@@ -1,6 +1,12 @@
+# import python library
+import os
+
 # import external library
 import numpy
 
+# import utils
+import pathUtils
+
 
 # function
 def read(file_path):
@@ -24,13 +30,15 @@ def read(file_path):
     return data
 
 
-def write(file_path, file_data):
+def write(file_path, file_data, atomic=False):
     """
     write data to the given path as numpy file
 
     Args:
         file_path(str): given numpy file path
         file_data(dict/list): given data
+        atomic(bool): write to a temp file first and rename it to the given path,
+                      so the file is never left half written, default is False
 
     Examples:
         import utils.common.fileUtils as fileUtils
@@ -41,4 +49,22 @@ def write(file_path, file_data):
         fileUtils.numpyUtils.write(file_path, file_data)
     """
 
-    numpy.save(file_path, file_data)
+    if not atomic:
+        numpy.save(file_path, file_data)
+    else:
+        # numpy.save adds the extension if not given, keep the same behavior
+        if not file_path.endswith('.npy'):
+            file_path += '.npy'
+        temp_path = pathUtils.get_temp_path(file_path)
+        try:
+            outfile = open(temp_path, 'wb')
+            try:
+                numpy.save(outfile, file_data)
+            finally:
+                outfile.close()
+            pathUtils.replace_file(temp_path, file_path)
+        except Exception:
+            # don't leave the temp file behind if the data can't be written
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
@@ -1,5 +1,12 @@
 # import python library
 import os
+import uuid
+import errno
+
+
+# constant
+# attempts to find an unused temp file name
+TEMP_ATTEMPTS = 100
 
 
 # function
@@ -102,3 +109,73 @@ def get_files_from_path(path, extension=None, exceptions=None, full_path=True):
                         else:
                             file_paths.append(f)
     return file_paths
+
+
+def replace_file(source_path, target_path):
+    """
+    move source file to target path, replace the target file if exists,
+    it is a single atomic rename on posix and python 3's os.replace, so readers never see a half written file,
+    python 2 on windows has to remove the target file before renaming, which is not atomic
+
+    Args:
+        source_path(str): source file path, normally a temp file next to the target
+        target_path(str): target file path
+
+    Examples:
+        import utils.common.fileUtils as fileUtils
+
+        fileUtils.pathUtils.replace_file('C:/_works/_pipeline/tests/tmp_numpy_test.npy',
+                                         'C:/_works/_pipeline/tests/numpy_test.npy')
+    """
+
+    if hasattr(os, 'replace'):
+        os.replace(source_path, target_path)
+        return
+    try:
+        os.rename(source_path, target_path)
+    except OSError:
+        # windows can't rename to an existing file
+        os.remove(target_path)
+        os.rename(source_path, target_path)
+
+
+def get_temp_path(file_path):
+    """
+    get a temp file path in the same folder of the given file path,
+    so the temp file can be renamed to the given path in place,
+    the temp file has the given file's permission if it exists, otherwise the default permission
+
+    Args:
+        file_path(str): given file path
+
+    Returns:
+        temp_path(str): temp file path
+
+    Examples:
+        import utils.common.fileUtils as fileUtils
+
+        fileUtils.pathUtils.get_temp_path('C:/_works/_pipeline/tests/numpy_test.npy')
+        # 'C:/_works/_pipeline/tests/.numpy_test.npy.tmp3f9a1c2e'
+    """
+
+    folder, file_name = os.path.split(file_path)
+    # create the file with the default permission, the os applies the process umask on it,
+    # so there is no need to read the umask, mkstemp would only give owner permission
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for _ in range(TEMP_ATTEMPTS):
+        temp_path = os.path.join(folder, '.{0}.tmp{1}'.format(file_name, uuid.uuid4().hex[:8]))
+        try:
+            handle = os.open(temp_path, flags, 0o666)
+        except OSError as error:
+            if error.errno == errno.EEXIST:
+                continue
+            raise
+        os.close(handle)
+        break
+    else:
+        raise IOError(errno.EEXIST, 'no usable temp file name found for {0}'.format(file_path))
+
+    # keep the target file's permission
+    if os.path.isfile(file_path):
+        os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+    return temp_path
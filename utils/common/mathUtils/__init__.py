@@ -4,3 +4,7 @@ import point
 import vector
 import line
 import triangle
+import quaternion
+import triangleSet
+import nurbsCurve
+import nurbsSurface
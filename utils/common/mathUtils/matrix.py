@@ -2,7 +2,7 @@
 import numpy
 
 # import utils
-import utils.common.apiUtils as apiUtils
+import vector
 
 # constant
 # maya transform default matrix
@@ -11,11 +11,17 @@ IDENTITY = [1.0, 0.0, 0.0, 0.0,
             0.0, 0.0, 1.0, 0.0,
             0.0, 0.0, 0.0, 1.0]
 
+# axes indices for each maya rotate order, xyz, yzx, zxy, xzy, yxz, zyx
+ROTATE_ORDERS = [[0, 1, 2], [1, 2, 0], [2, 0, 1], [0, 2, 1], [1, 0, 2], [2, 1, 0]]
+
+# cos value of the middle angle treated as gimbal lock when extracting euler rotation
+GIMBAL_TOLERANCE = 1e-12
+
 
 # function
 def list_to_matrix(array, column=4, row=4):
     """
-    convert list to numpy matrix
+    convert list to numpy array
 
     Args:
         array (list/numpy.ndarray): list of float values, normally contains 16 values
@@ -32,14 +38,12 @@ def list_to_matrix(array, column=4, row=4):
                                          0.0, 1.0, 0.0, 0.0,
                                          0.0, 0.0, 1.0, 0.0,
                                          0.0, 0.0, 0.0, 1.0], column=4, row=4)
-        # matrix([[ 1.,  0.,  0.,  0.],
-        #         [ 0.,  1.,  0.,  0.],
-        #         [ 0.,  0.,  1.,  0.],
-        #         [ 0.,  0.,  0.,  1.]]
+        # array([[ 1.,  0.,  0.,  0.],
+        #        [ 0.,  1.,  0.,  0.],
+        #        [ 0.,  0.,  1.,  0.],
+        #        [ 0.,  0.,  0.,  1.]]
     """
-    np_array = numpy.reshape(array, (column, row))
-
-    return numpy.asmatrix(np_array)
+    return numpy.asarray(array, dtype=numpy.float64).reshape(column, row)
 
 
 def matrix_to_list(matrix):
@@ -63,11 +67,7 @@ def matrix_to_list(matrix):
         mathUtils.matrix.matrix_to_list(matrix_numpy)
         # [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
     """
-
-    array = numpy.reshape(matrix, matrix.size)
-    array = numpy.array(array)[0]
-    array = array.tolist()
-    return array
+    return numpy.asarray(matrix, dtype=numpy.float64).reshape(-1).tolist()
 
 
 def inverse(matrix, output_type='list'):
@@ -88,13 +88,8 @@ def inverse(matrix, output_type='list'):
         # [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, -1.0, -2.0, -3.0, 1.0]
     """
 
-    if isinstance(matrix, list):
-        matrix = list_to_matrix(matrix)
-    matrix_inverse = numpy.linalg.inv(matrix)
-    if output_type == 'list':
-        matrix_inverse = matrix_to_list(matrix_inverse)
-
-    return matrix_inverse
+    matrix_inverse = inverse_batch(matrix)[0]
+    return _output(matrix_inverse, output_type)
 
 
 def multiply(*matrices, **kwargs):
@@ -129,24 +124,8 @@ def multiply(*matrices, **kwargs):
         #  2.444217966960632, 3.7033255666227105, 5.301719614370485, 1.0]
     """
     output_type = kwargs.get('output_type', 'list')
-
-    # check the first argument type
-    if isinstance(matrices[0], list):
-        # convert to numpy array
-        matrix_mult = list_to_matrix(matrices[0])
-    else:
-        matrix_mult = matrices[0]
-
-    # loop in each matrix in list, multiply to get the final matrix
-    for matrix in matrices[1:]:
-        if isinstance(matrix, list):
-            matrix = list_to_matrix(matrix)
-        matrix_mult = numpy.dot(matrix_mult, matrix)
-
-    if output_type == 'list':
-        matrix_mult = matrix_to_list(matrix_mult)
-
-    return matrix_mult
+    matrix_mult = multiply_batch(*matrices)[0]
+    return _output(matrix_mult, output_type)
 
 
 def localize(matrix_a, matrix_b, output_type='list'):
@@ -180,10 +159,8 @@ def localize(matrix_a, matrix_b, output_type='list'):
         #  -0.9396926207859083, 0.5104722665003956, 0.9254165783983233, 1.0]
     """
 
-    matrix_b_inverse = inverse(matrix_b)
-    matrix_local = multiply(matrix_a, matrix_b_inverse, output_type=output_type)
-
-    return matrix_local
+    matrix_local = localize_batch(matrix_a, matrix_b)[0]
+    return _output(matrix_local, output_type)
 
 
 def four_by_four_matrix(vector_x, vector_y, vector_z, position, output_type='list'):
@@ -232,12 +209,8 @@ def compose(translate=None, rotate=None, scale=None, rotate_order=0):
     Returns:
         matrix (list)
     """
-    # get MMatrix
-    m_matrix = apiUtils.MMatrix.compose(translate=translate, rotate=rotate, scale=scale, rotate_order=rotate_order)
-
-    matrix = apiUtils.MMatrix.to_list(m_matrix)
-
-    return matrix
+    return compose_batch(translate=translate, rotate=rotate, scale=scale, rotate_order=rotate_order)[0].reshape(
+        -1).tolist()
 
 
 def decompose(matrix, rotate_order=0):
@@ -251,10 +224,8 @@ def decompose(matrix, rotate_order=0):
     Returns:
         [translate, rotate, scale](list)
     """
-    # get MMatrix
-    m_matrix = apiUtils.MMatrix.compose(matrix=matrix)
-    # decompose to transform values
-    return apiUtils.MMatrix.decompose(m_matrix, rotate_order=rotate_order)
+    translate, rotate, scale = decompose_batch(matrix, rotate_order=rotate_order)[:3]
+    return [translate[0].tolist(), rotate[0].tolist(), scale[0].tolist()]
 
 
 def update(matrix, translate=None, rotate=None, scale=None, rotate_order=0):
@@ -287,3 +258,538 @@ def update(matrix, translate=None, rotate=None, scale=None, rotate_order=0):
         kwargs.update({'scale': scale})
     # recompose the matrix and return it
     return compose(**kwargs)
+
+
+# batch function
+# batch functions work on contiguous (N, 4, 4) float64 arrays with maya's row vector convention,
+# single matrices and (4, 4) arrays are broadcast against the other inputs
+def to_array(matrices):
+    """
+    convert matrices to a contiguous (N, 4, 4) float64 array
+
+    Args:
+        matrices (list/numpy.ndarray): a matrix as 16 values or 4x4 array, or a list/array of matrices
+
+    Returns:
+        matrices_array (numpy.ndarray): (N, 4, 4) array
+
+    Examples:
+        import utils.common.mathUtils as mathUtils
+
+        mathUtils.matrix.to_array(mathUtils.matrix.IDENTITY).shape
+        # (1, 4, 4)
+    """
+    return numpy.ascontiguousarray(matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+
+
+def to_list(matrices):
+    """
+    convert (N, 4, 4) array to matrices list
+
+    Args:
+        matrices (numpy.ndarray): (N, 4, 4) array
+
+    Returns:
+        matrices_list (list): list of matrices, each matrix is a list of 16 values
+    """
+    return numpy.asarray(matrices, dtype=numpy.float64).reshape(-1, 16).tolist()
+
+
+def multiply_batch(*matrices):
+    """
+    multiply given matrices chains, each input can be a single matrix or N matrices, and are multiplied in order
+
+    Args:
+        matrices (list/numpy.ndarray): matrices chain, each item is a matrix or a list/array of N matrices
+
+    Returns:
+        matrices_mult (numpy.ndarray): (N, 4, 4) array
+
+    Examples:
+        import numpy
+        import utils.common.timeUtils as timeUtils
+        import utils.common.mathUtils as mathUtils
+
+        matrices_a = numpy.random.rand(100000, 4, 4)
+        matrices_b = numpy.random.rand(100000, 4, 4)
+        with timeUtils.Timer('matrix.multiply_batch'):
+            mathUtils.matrix.multiply_batch(matrices_a, matrices_b)
+
+        list_a = mathUtils.matrix.to_list(matrices_a)
+        list_b = mathUtils.matrix.to_list(matrices_b)
+        with timeUtils.Timer('matrix.multiply'):
+            for m_a, m_b in zip(list_a, list_b):
+                mathUtils.matrix.multiply(m_a, m_b)
+
+        timeUtils.get_report(['matrix.multiply_batch', 'matrix.multiply'])
+    """
+    matrices_mult = to_array(matrices[0])
+    for matrix in matrices[1:]:
+        matrices_mult = numpy.matmul(matrices_mult, to_array(matrix))
+    return matrices_mult
+
+
+def inverse_batch(matrices):
+    """
+    inverse given matrices
+
+    Args:
+        matrices (list/numpy.ndarray): a matrix or a list/array of N matrices
+
+    Returns:
+        matrices_inverse (numpy.ndarray): (N, 4, 4) array
+    """
+    return numpy.linalg.inv(to_array(matrices))
+
+
+def rigid_inverse_batch(matrices):
+    """
+    inverse given rigid matrices, matrices should only contain rotation and translation,
+    it transposes the rotation instead of a general inverse
+
+    Args:
+        matrices (list/numpy.ndarray): a matrix or a list/array of N matrices
+
+    Returns:
+        matrices_inverse (numpy.ndarray): (N, 4, 4) array
+    """
+    matrices = to_array(matrices)
+    rotation_transpose = matrices[:, :3, :3].transpose(0, 2, 1)
+
+    matrices_inverse = numpy.zeros_like(matrices)
+    matrices_inverse[:, :3, :3] = rotation_transpose
+    matrices_inverse[:, 3, :3] = -numpy.einsum('ni,nij->nj', matrices[:, 3, :3], rotation_transpose)
+    matrices_inverse[:, 3, 3] = 1
+    return matrices_inverse
+
+
+def localize_batch(matrices_a, matrices_b, rigid=False):
+    """
+    get matrices_a's local matrices on matrices_b
+
+    Args:
+        matrices_a (list/numpy.ndarray): matrices need to be localized
+        matrices_b (list/numpy.ndarray): parent matrices
+        rigid (bool): parent matrices only contain rotation and translation, use rigid inverse, default is False
+
+    Returns:
+        matrices_local (numpy.ndarray): (N, 4, 4) array
+    """
+    if rigid:
+        matrices_b_inverse = rigid_inverse_batch(matrices_b)
+    else:
+        matrices_b_inverse = inverse_batch(matrices_b)
+    return numpy.matmul(to_array(matrices_a), matrices_b_inverse)
+
+
+def compose_batch(translate=None, rotate=None, scale=None, shear=None, rotate_order=0):
+    """
+    compose matrices from transformation arrays, matrix = scale * shear * rotate * translate,
+    same as maya's transformation matrix
+
+    Args:
+        translate (list/numpy.ndarray): (N, 3) translation values, default is None
+        rotate (list/numpy.ndarray): (N, 3) euler rotation values in degrees, default is None
+        scale (list/numpy.ndarray): (N, 3) scale values, default is None
+        shear (list/numpy.ndarray): (N, 3) shear values as xy, xz, yz, default is None
+        rotate_order (int): rotation values' rotate order, default is 0
+
+    Returns:
+        matrices (numpy.ndarray): (N, 4, 4) array
+
+    Examples:
+        import utils.common.mathUtils as mathUtils
+
+        mathUtils.matrix.compose_batch(translate=[[1, 2, 3], [0, 0, 0]], rotate=[10, 20, 30],
+                                       scale=[1, 0.5, 0.5])[0]
+        # array([[ 0.81379768,  0.46984631, -0.34202014,  0.        ],
+        #        [-0.22048481,  0.44128206,  0.08158796,  0.        ],
+        #        [ 0.18926115,  0.00901416,  0.46270829,  0.        ],
+        #        [ 1.        ,  2.        ,  3.        ,  1.        ]])
+    """
+    inputs = [translate, rotate, scale, shear]
+    count = max([len(numpy.reshape(values, (-1, 3))) for values in inputs if values is not None] or [1])
+
+    matrices = numpy.zeros((count, 4, 4))
+    if rotate is not None:
+        matrices[:, :3, :3] = euler_to_rotation(rotate, rotate_order=rotate_order)
+    else:
+        matrices[:, :3, :3] = numpy.eye(3)
+    if shear is not None:
+        shear = numpy.reshape(shear, (-1, 3))
+        shear_matrices = numpy.zeros((len(shear), 3, 3))
+        shear_matrices[:] = numpy.eye(3)
+        shear_matrices[:, 1, 0] = shear[:, 0]
+        shear_matrices[:, 2, 0] = shear[:, 1]
+        shear_matrices[:, 2, 1] = shear[:, 2]
+        matrices[:, :3, :3] = numpy.matmul(shear_matrices, matrices[:, :3, :3])
+    if scale is not None:
+        matrices[:, :3, :3] *= numpy.reshape(scale, (-1, 3, 1))
+    if translate is not None:
+        matrices[:, 3, :3] = numpy.reshape(translate, (-1, 3))
+    matrices[:, 3, 3] = 1
+    return matrices
+
+
+def decompose_batch(matrices, rotate_order=0):
+    """
+    decompose matrices to transformation arrays, negative scale is applied to all axes,
+    so the rotation stays right handed
+
+    Args:
+        matrices (list/numpy.ndarray): a matrix or a list/array of N matrices
+        rotate_order (int): output rotation values' rotate order, default is 0
+
+    Returns:
+        translate (numpy.ndarray): (N, 3) translation values
+        rotate (numpy.ndarray): (N, 3) euler rotation values in degrees
+        scale (numpy.ndarray): (N, 3) scale values
+        shear (numpy.ndarray): (N, 3) shear values as xy, xz, yz
+    """
+    translate, rotation, scale, shear = _extract_rotation(matrices)
+    return translate, rotation_to_euler(rotation, rotate_order=rotate_order), scale, shear
+
+
+def euler_to_rotation(rotate, rotate_order=0):
+    """
+    convert euler rotation values to rotation matrices
+
+    Args:
+        rotate (list/numpy.ndarray): (N, 3) euler rotation values in degrees
+        rotate_order (int): rotation values' rotate order, default is 0
+
+    Returns:
+        rotation (numpy.ndarray): (N, 3, 3) rotation matrices
+    """
+    radians = numpy.radians(numpy.reshape(rotate, (-1, 3)).astype(numpy.float64))
+    rotation = None
+    for axis in ROTATE_ORDERS[rotate_order]:
+        axis_rotation = _get_axis_rotation(radians[:, axis], axis)
+        if rotation is None:
+            rotation = axis_rotation
+        else:
+            rotation = numpy.matmul(rotation, axis_rotation)
+    return rotation
+
+
+def rotation_to_euler(rotation, rotate_order=0):
+    """
+    convert rotation matrices to euler rotation values, the middle rotation axis is in range [-90, 90],
+    and the last axis is set to 0 if gimbal locked
+
+    Args:
+        rotation (numpy.ndarray): (N, 3, 3) rotation matrices, or (N, 4, 4) matrices without scale and shear
+        rotate_order (int): output rotation values' rotate order, default is 0
+
+    Returns:
+        rotate (numpy.ndarray): (N, 3) euler rotation values in degrees
+    """
+    rotation = numpy.asarray(rotation, dtype=numpy.float64)
+    if rotation.shape[-1] == 4 or rotation.size == 16:
+        rotation = to_array(rotation)[:, :3, :3]
+    rotation = rotation.reshape(-1, 3, 3)
+    i, j, k = ROTATE_ORDERS[rotate_order]
+    # cyclic orders (xyz, yzx, zxy) have positive parity
+    parity = 1 if rotate_order < 3 else -1
+
+    # row vector matrix, rotation[a, b] is the column vector matrix's [b, a]
+    sin_j = numpy.clip(-parity * rotation[:, i, k], -1, 1)
+    cos_j = numpy.sqrt(rotation[:, i, i] ** 2 + rotation[:, i, j] ** 2)
+    gimbal = cos_j < GIMBAL_TOLERANCE
+
+    angles = numpy.zeros((len(rotation), 3))
+    # arcsin loses precision close to 90 degrees, arctan2 keeps it
+    angles[:, j] = numpy.arctan2(sin_j, cos_j)
+    angles[:, i] = numpy.where(gimbal,
+                               numpy.arctan2(-parity * rotation[:, k, j], rotation[:, j, j]),
+                               numpy.arctan2(parity * rotation[:, j, k], rotation[:, k, k]))
+    angles[:, k] = numpy.where(gimbal, 0, numpy.arctan2(parity * rotation[:, i, j], rotation[:, i, i]))
+    return numpy.degrees(angles)
+
+
+def reorder_euler(rotate, rotate_order, target_rotate_order):
+    """
+    convert euler rotation values to another rotate order, the overall rotation is preserved
+
+    Args:
+        rotate (list/numpy.ndarray): (N, 3) euler rotation values in degrees
+        rotate_order (int): rotation values' rotate order
+        target_rotate_order (int): output rotation values' rotate order
+
+    Returns:
+        rotate (numpy.ndarray): (N, 3) euler rotation values in degrees
+    """
+    return rotation_to_euler(euler_to_rotation(rotate, rotate_order=rotate_order),
+                             rotate_order=target_rotate_order)
+
+
+def rotation_to_quaternion(rotation):
+    """
+    convert rotation matrices to quaternions, quaternion is stored as x, y, z, w same as maya's MQuaternion
+
+    Args:
+        rotation (numpy.ndarray): (N, 3, 3) rotation matrices, or (N, 4, 4) matrices without scale and shear
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions, w is positive
+    """
+    rotation = numpy.asarray(rotation, dtype=numpy.float64)
+    if rotation.shape[-1] == 4 or rotation.size == 16:
+        rotation = to_array(rotation)[:, :3, :3]
+    # column vector matrix
+    matrices = rotation.reshape(-1, 3, 3).transpose(0, 2, 1)
+    count = len(matrices)
+
+    # pick the largest component to keep the computation stable
+    diagonal = numpy.einsum('nii->ni', matrices)
+    trace = diagonal.sum(axis=1)
+    choices = numpy.argmax(numpy.c_[diagonal, trace], axis=1)
+
+    quaternions = numpy.zeros((count, 4))
+    mask = choices == 3
+    quaternions[mask, 3] = 1 + trace[mask]
+    quaternions[mask, 0] = matrices[mask, 2, 1] - matrices[mask, 1, 2]
+    quaternions[mask, 1] = matrices[mask, 0, 2] - matrices[mask, 2, 0]
+    quaternions[mask, 2] = matrices[mask, 1, 0] - matrices[mask, 0, 1]
+    for i in range(3):
+        j = (i + 1) % 3
+        k = (j + 1) % 3
+        mask = choices == i
+        quaternions[mask, i] = 1 - trace[mask] + 2 * matrices[mask, i, i]
+        quaternions[mask, j] = matrices[mask, j, i] + matrices[mask, i, j]
+        quaternions[mask, k] = matrices[mask, k, i] + matrices[mask, i, k]
+        quaternions[mask, 3] = matrices[mask, k, j] - matrices[mask, j, k]
+
+    quaternions /= numpy.linalg.norm(quaternions, axis=1)[:, None]
+    quaternions[quaternions[:, 3] < 0] *= -1
+    return quaternions
+
+
+def quaternion_to_rotation(quaternions):
+    """
+    convert quaternions to rotation matrices, quaternion is stored as x, y, z, w same as maya's MQuaternion
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions, will be normalized
+
+    Returns:
+        rotation (numpy.ndarray): (N, 3, 3) rotation matrices
+    """
+    quaternions = numpy.reshape(quaternions, (-1, 4)).astype(numpy.float64)
+    quaternions = quaternions / numpy.linalg.norm(quaternions, axis=1)[:, None]
+    x, y, z, w = quaternions.T
+
+    rotation = numpy.empty((len(quaternions), 3, 3))
+    rotation[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    rotation[:, 0, 1] = 2 * (x * y + z * w)
+    rotation[:, 0, 2] = 2 * (x * z - y * w)
+    rotation[:, 1, 0] = 2 * (x * y - z * w)
+    rotation[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    rotation[:, 1, 2] = 2 * (y * z + x * w)
+    rotation[:, 2, 0] = 2 * (x * z + y * w)
+    rotation[:, 2, 1] = 2 * (y * z - x * w)
+    rotation[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return rotation
+
+
+def vectors_to_rotation(vectors_a, vectors_b):
+    """
+    get the shortest arc rotation matrices rotating vectors_a to vectors_b, same as maya's MVector.rotateTo,
+    if two vectors are opposite, it rotates 180 degrees around an axis perpendicular to vectors_a
+
+    Args:
+        vectors_a (list/numpy.ndarray): (N, 3) source vectors, or one vector for all
+        vectors_b (list/numpy.ndarray): (N, 3) target vectors, or one vector for all
+
+    Returns:
+        rotation (numpy.ndarray): (N, 3, 3) row vector rotation matrices, vectors_a * rotation = vectors_b
+    """
+    vectors_a, vectors_b = numpy.broadcast_arrays(numpy.reshape(vectors_a, (-1, 3)).astype(numpy.float64),
+                                                  numpy.reshape(vectors_b, (-1, 3)).astype(numpy.float64))
+    vectors_a = vectors_a / numpy.linalg.norm(vectors_a, axis=1)[:, None]
+    vectors_b = vectors_b / numpy.linalg.norm(vectors_b, axis=1)[:, None]
+    axes = numpy.cross(vectors_a, vectors_b)
+    cos = numpy.einsum('ij,ij->i', vectors_a, vectors_b)
+    opposite = 1 + cos < GIMBAL_TOLERANCE ** 0.5
+
+    # rodrigues rotation, rotation = I + K + K^2 / (1 + cos), K is the cross product matrix of the axis,
+    # row vector matrix is the transpose, which flips the sign of K
+    x, y, z = axes.T
+    cross_matrices = numpy.zeros((len(axes), 3, 3))
+    cross_matrices[:, 0, 1] = z
+    cross_matrices[:, 0, 2] = -y
+    cross_matrices[:, 1, 0] = -z
+    cross_matrices[:, 1, 2] = x
+    cross_matrices[:, 2, 0] = y
+    cross_matrices[:, 2, 1] = -x
+    scale = 1 / numpy.where(opposite, 1, 1 + cos)
+    rotation = numpy.eye(3) + cross_matrices + numpy.matmul(cross_matrices, cross_matrices) * scale[:, None, None]
+
+    if numpy.any(opposite):
+        # rotate 180 degrees around a perpendicular axis, 2 * n * n^T - I
+        vectors_opposite = vectors_a[opposite]
+        perpendicular = numpy.cross(vectors_opposite, [1, 0, 0])
+        parallel_x = numpy.linalg.norm(perpendicular, axis=1) < 1e-6
+        perpendicular[parallel_x] = numpy.cross(vectors_opposite[parallel_x], [0, 1, 0])
+        perpendicular /= numpy.linalg.norm(perpendicular, axis=1)[:, None]
+        rotation[opposite] = 2 * perpendicular[:, :, None] * perpendicular[:, None, :] - numpy.eye(3)
+
+    return rotation
+
+
+def frames_batch(positions, target_vectors, aim_vector=None, up_vector=None, up_vectors=None, flip_check=True,
+                 parallel_transport=False):
+    """
+    build matrices for points along a path, the aim vector is aimed to each target vector,
+    frames are computed for all points together
+
+    Args:
+        positions (list/numpy.ndarray): (N, 3) positions
+        target_vectors (list/numpy.ndarray): (N, 3) aim target vectors, like tangents
+        aim_vector (list): the vector aim to the target vector, default is [1, 0, 0]
+        up_vector (list): up vector for aiming, only used with up vectors, default is [0, 1, 0]
+        up_vectors (list/numpy.ndarray): (N, 3) world up vectors for each point, default is None,
+                                         will rotate the aim vector to the target vector with the shortest arc
+        flip_check (bool): will automatically fix flipping transform if set to True, only used with up vectors,
+                           default is True
+        parallel_transport (bool): carry the first frame along the path with the minimal rotation between points,
+                                   which doesn't flip or twist, only used without up vectors, default is False
+
+    Returns:
+        matrices (numpy.ndarray): (N, 4, 4) matrices
+    """
+    # get aim vector
+    if not aim_vector:
+        aim_vector = [1, 0, 0]
+    # get up vector
+    if not up_vector:
+        up_vector = [0, 1, 0]
+
+    positions = vector.to_array(positions)
+    target_vectors = vector.to_array(target_vectors)
+
+    matrices = numpy.zeros((len(positions), 4, 4))
+    matrices[:, 3, :3] = positions
+    matrices[:, 3, 3] = 1
+
+    if up_vectors is None:
+        # rotate aim vector to match each target vector
+        if parallel_transport:
+            # only the first frame rotates from the aim vector,
+            # the following ones rotate from the previous frame with the minimal rotation between targets
+            rotations = vectors_to_rotation(target_vectors[:-1], target_vectors[1:])
+            rotation = vectors_to_rotation(aim_vector, target_vectors[0])[0]
+            matrices[0, :3, :3] = rotation
+            for i, rotation_step in enumerate(rotations):
+                rotation = numpy.dot(rotation, rotation_step)
+                matrices[i + 1, :3, :3] = rotation
+        else:
+            matrices[:, :3, :3] = vectors_to_rotation(aim_vector, target_vectors)
+        return matrices
+
+    vectors_x, vectors_y, vectors_z = vector.coordinate_system_batch(target_vectors, up_vectors)
+    if flip_check and len(positions) > 1:
+        # compare each frame with the previous one, a frame flips if its z vector projected on the previous
+        # yz plane is opposite to the previous z vector, previous frame's flip carries to the next comparison
+        project_vectors = vector.project_onto_plane_batch(vectors_z[1:], vectors_x[:-1], normalize=True)
+        dots = vector.dot_product_batch(project_vectors, vectors_z[:-1])
+        signs = numpy.ones(len(positions))
+        for i, dot in enumerate(dots):
+            if signs[i] * dot < 0:
+                signs[i + 1] = -1
+        vectors_y *= signs[:, None]
+        vectors_z *= signs[:, None]
+
+    matrices[:, 0, :3] = vectors_x
+    matrices[:, 1, :3] = vectors_y
+    matrices[:, 2, :3] = vectors_z
+
+    # multiply with aim vector's local inverse matrix, it's the same for all positions
+    vectors_local = vector.coordinate_system(aim_vector, up_vector)
+    matrix_local = four_by_four_matrix(vectors_local[0], vectors_local[1], vectors_local[2], [0, 0, 0])
+    return multiply_batch(inverse_batch(matrix_local), matrices)
+
+
+# sub function
+def _output(matrix, output_type):
+    """
+    convert (4, 4) array to the given output type
+
+    Args:
+        matrix (numpy.ndarray): (4, 4) array
+        output_type (str): 'list'/'numpy'
+
+    Returns:
+        matrix (list/numpy.ndarray)
+    """
+    if output_type == 'list':
+        return matrix.reshape(-1).tolist()
+    return matrix
+
+
+def _get_axis_rotation(radians, axis):
+    """
+    get rotation matrices around the given axis
+
+    Args:
+        radians (numpy.ndarray): (N,) rotation angles in radians
+        axis (int): 0/1/2 for x/y/z
+
+    Returns:
+        rotation (numpy.ndarray): (N, 3, 3) row vector rotation matrices
+    """
+    i = (axis + 1) % 3
+    j = (axis + 2) % 3
+    cos = numpy.cos(radians)
+    sin = numpy.sin(radians)
+
+    rotation = numpy.zeros((len(radians), 3, 3))
+    rotation[:, axis, axis] = 1
+    rotation[:, i, i] = cos
+    rotation[:, j, j] = cos
+    rotation[:, i, j] = sin
+    rotation[:, j, i] = -sin
+    return rotation
+
+
+def _extract_rotation(matrices):
+    """
+    extract translation, rotation matrices, scale and shear from matrices
+
+    Args:
+        matrices (list/numpy.ndarray): a matrix or a list/array of N matrices
+
+    Returns:
+        translate (numpy.ndarray): (N, 3) translation values
+        rotation (numpy.ndarray): (N, 3, 3) rotation matrices
+        scale (numpy.ndarray): (N, 3) scale values
+        shear (numpy.ndarray): (N, 3) shear values as xy, xz, yz
+    """
+    matrices = to_array(matrices)
+    translate = matrices[:, 3, :3].copy()
+    row_x, row_y, row_z = [matrices[:, i, :3].copy() for i in range(3)]
+
+    # gram schmidt, same order as the scale * shear * rotate composition
+    scale_x = numpy.linalg.norm(row_x, axis=1)
+    row_x /= scale_x[:, None]
+    shear_xy = numpy.einsum('ni,ni->n', row_x, row_y)
+    row_y -= shear_xy[:, None] * row_x
+    scale_y = numpy.linalg.norm(row_y, axis=1)
+    row_y /= scale_y[:, None]
+    shear_xz = numpy.einsum('ni,ni->n', row_x, row_z)
+    row_z -= shear_xz[:, None] * row_x
+    shear_yz = numpy.einsum('ni,ni->n', row_y, row_z)
+    row_z -= shear_yz[:, None] * row_y
+    scale_z = numpy.linalg.norm(row_z, axis=1)
+    row_z /= scale_z[:, None]
+
+    scale = numpy.stack([scale_x, scale_y, scale_z], axis=1)
+    shear = numpy.stack([shear_xy / scale_y, shear_xz / scale_z, shear_yz / scale_z], axis=1)
+    rotation = numpy.stack([row_x, row_y, row_z], axis=1)
+
+    # flip negative determinant
+    flip = numpy.linalg.det(rotation) < 0
+    scale[flip] *= -1
+    rotation[flip] *= -1
+
+    return translate, rotation, scale, shear
@@ -0,0 +1,670 @@
+# import external library
+import numpy
+
+# import utils
+import vector
+import matrix
+
+# constant
+# maya curve forms
+FORM_OPEN = 1
+FORM_CLOSED = 2
+FORM_PERIODIC = 3
+
+# gauss legendre quadrature used to integrate arc length on each length table interval
+GAUSS_POINTS, GAUSS_WEIGHTS = numpy.polynomial.legendre.leggauss(8)
+
+# length table intervals for each knot span
+LENGTH_SUBDIVISIONS = 8
+
+# samples for each knot span and degree to get the closest point's initial guess
+CLOSEST_SAMPLES = 8
+
+# consecutive samples grouped in one bounding sphere, so query points only test samples in the nearby spheres
+SAMPLE_BLOCK_SIZE = 16
+
+# points evaluated in each interval between samples to get the interval's bounding sphere
+INTERVAL_SUBDIVISIONS = 4
+
+# intervals' bounding spheres are scaled up by this ratio, the curve can bulge slightly between the evaluated points
+BOUND_SCALE = 1.1
+
+# newton iterations and parameter tolerance
+NEWTON_ITERATIONS = 20
+NEWTON_TOLERANCE = 1e-12
+
+# newton ranges are shrunk by this ratio on both ends, so derivatives are never evaluated across a knot
+RANGE_MARGIN = 1e-10
+
+# max number of point-sample pairs compared in one chunk when searching initial guesses
+CHUNK_SIZE = 1000000
+
+
+# function
+def get_knots(knots, degree, num_cvs):
+    """
+    get full knots vector from maya knots, maya skips the first and the last knots,
+    which don't affect the curve shape
+
+    Args:
+        knots (list/numpy.ndarray): maya knots, number is num_cvs + degree - 1
+        degree (int): curve degree
+        num_cvs (int): control vertices number
+
+    Returns:
+        knots (numpy.ndarray): full knots vector, number is num_cvs + degree + 1
+    """
+    knots = numpy.asarray(knots, dtype=numpy.float64).reshape(-1)
+    if len(knots) == num_cvs + degree + 1:
+        return knots
+    return numpy.concatenate((knots[:1], knots, knots[-1:]))
+
+
+def find_spans(knots, degree, num_cvs, parameters):
+    """
+    find the knot span index for each parameter, knots[span] <= parameter < knots[span + 1]
+
+    Args:
+        knots (numpy.ndarray): full knots vector
+        degree (int): curve degree
+        num_cvs (int): control vertices number
+        parameters (numpy.ndarray): (N,) parameters
+
+    Returns:
+        spans (numpy.ndarray): (N,) knot span indices
+    """
+    spans = numpy.searchsorted(knots, parameters, side='right') - 1
+    return numpy.clip(spans, degree, num_cvs - 1)
+
+
+def basis_functions(knots, degree, spans, parameters, order=0):
+    """
+    get non-zero basis functions and their derivatives for all parameters,
+    it's The NURBS Book's algorithm A2.3, vectorized on parameters
+
+    Args:
+        knots (numpy.ndarray): full knots vector
+        degree (int): curve degree
+        spans (numpy.ndarray): (N,) knot span indices from find_spans
+        parameters (numpy.ndarray): (N,) parameters
+        order (int): derivatives order, default is 0
+
+    Returns:
+        basis (numpy.ndarray): (N, order + 1, degree + 1) basis functions' derivatives,
+                               basis[:, k, j] is the k-th derivative of the basis function for cv spans - degree + j
+    """
+    num = len(parameters)
+    basis = numpy.zeros((num, order + 1, degree + 1))
+
+    ndu = numpy.zeros((num, degree + 1, degree + 1))
+    ndu[:, 0, 0] = 1
+    left = numpy.zeros((num, degree + 1))
+    right = numpy.zeros((num, degree + 1))
+    for j in range(1, degree + 1):
+        left[:, j] = parameters - knots[spans + 1 - j]
+        right[:, j] = knots[spans + j] - parameters
+        saved = numpy.zeros(num)
+        for r in range(j):
+            # lower triangle keeps knot differences
+            ndu[:, j, r] = right[:, r + 1] + left[:, j - r]
+            temp = ndu[:, r, j - 1] / ndu[:, j, r]
+            # upper triangle keeps basis functions
+            ndu[:, r, j] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        ndu[:, j, j] = saved
+
+    basis[:, 0] = ndu[:, :, degree]
+
+    # derivatives
+    a = numpy.zeros((2, num, degree + 1))
+    for r in range(degree + 1):
+        s1 = 0
+        s2 = 1
+        a[0, :, 0] = 1
+        for k in range(1, min(order, degree) + 1):
+            d = numpy.zeros(num)
+            rk = r - k
+            pk = degree - k
+            if r >= k:
+                a[s2, :, 0] = a[s1, :, 0] / ndu[:, pk + 1, rk]
+                d = a[s2, :, 0] * ndu[:, rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else degree - r
+            for j in range(j1, j2 + 1):
+                a[s2, :, j] = (a[s1, :, j] - a[s1, :, j - 1]) / ndu[:, pk + 1, rk + j]
+                d += a[s2, :, j] * ndu[:, rk + j, pk]
+            if r <= pk:
+                a[s2, :, k] = -a[s1, :, k - 1] / ndu[:, pk + 1, r]
+                d += a[s2, :, k] * ndu[:, r, pk]
+            basis[:, k, r] = d
+            s1, s2 = s2, s1
+
+    # multiply by the correct factors
+    factor = degree
+    for k in range(1, min(order, degree) + 1):
+        basis[:, k] *= factor
+        factor *= degree - k
+
+    return basis
+
+
+def get_span_parameters(knots, degree, num_cvs, subdivisions):
+    """
+    subdivide each knot span in the curve domain evenly
+
+    Args:
+        knots (numpy.ndarray): full knots vector
+        degree (int): curve degree
+        num_cvs (int): control vertices number
+        subdivisions (int): intervals number for each knot span
+
+    Returns:
+        parameters (numpy.ndarray): (M,) sorted parameters from domain start to end
+    """
+    breaks = numpy.unique(knots[degree: num_cvs + 1])
+    weights = numpy.arange(subdivisions) / float(subdivisions)
+    parameters = breaks[:-1, None] + (breaks[1:] - breaks[:-1])[:, None] * weights
+    return numpy.append(parameters.reshape(-1), breaks[-1])
+
+
+def binomial(n, k):
+    """
+    binomial coefficient
+
+    Args:
+        n (int)
+        k (int)
+
+    Returns:
+        coefficient (int)
+    """
+    coefficient = 1
+    for i in range(min(k, n - k)):
+        coefficient = coefficient * (n - i) // (i + 1)
+    return coefficient
+
+
+def rational_derivatives(derivatives):
+    """
+    convert homogeneous derivatives to rational curve derivatives with the quotient rule
+
+    Args:
+        derivatives (numpy.ndarray): (order + 1, N, 4) homogeneous derivatives, weighted positions and weights
+
+    Returns:
+        derivatives (numpy.ndarray): (order + 1, N, 3) curve derivatives
+    """
+    weighted = derivatives[..., :3]
+    weights = derivatives[..., 3]
+    output = numpy.zeros(weighted.shape)
+    for k in range(len(derivatives)):
+        value = weighted[k].copy()
+        for i in range(1, k + 1):
+            value -= binomial(k, i) * weights[i][:, None] * output[k - i]
+        output[k] = value / weights[0][:, None]
+    return output
+
+
+# class
+class NurbsCurve(object):
+    """
+    numpy nurbs curve, it evaluates positions, derivatives, arc lengths and closest points for many parameters
+    in one batch without maya, so curve driven placement can be computed and cached outside maya
+
+    Args:
+        control_vertices (list/numpy.ndarray): (N, 3) control vertices positions, periodic curves include
+                                               the overlapping cvs, same as maya
+        knots (list/numpy.ndarray): maya knots (num_cvs + degree - 1), or full knots (num_cvs + degree + 1)
+        degree (int): curve degree, default is 3
+        form (int): 1 for open, 2 for closed, 3 for periodic, default is 1
+        weights (list/numpy.ndarray): (N,) control vertices weights for rational curves, default is None
+
+    Examples:
+        import utils.modeling.curveUtils as curveUtils
+        import utils.common.mathUtils as mathUtils
+
+        nurbs_curve = mathUtils.nurbsCurve.NurbsCurve.from_shape_info(curveUtils.get_shape_info('spine_curve'))
+        positions, parameters, tangents = nurbs_curve.get_points(20)
+        matrices = nurbs_curve.get_matrices(20, parallel_transport=True)
+        closest_points, parameters = nurbs_curve.closest_point(guide_positions)
+    """
+    def __init__(self, control_vertices, knots, degree=3, form=FORM_OPEN, weights=None):
+        self._control_vertices = vector.to_array(control_vertices)
+        self._degree = degree
+        self._form = form
+        self._num_cvs = len(self._control_vertices)
+        self._knots = get_knots(knots, degree, self._num_cvs)
+        self._domain = (self._knots[degree], self._knots[self._num_cvs])
+
+        # homogeneous control vertices for rational curves
+        self._weights = None
+        self._control_vertices_weighted = None
+        if weights is not None:
+            self._weights = numpy.asarray(weights, dtype=numpy.float64).reshape(-1)
+            self._control_vertices_weighted = numpy.hstack((self._control_vertices * self._weights[:, None],
+                                                            self._weights[:, None]))
+
+        # arc length table
+        self._length_parameters = None
+        self._length_values = None
+
+        # closest point samples, each sample starts an interval to the next sample with a bounding sphere,
+        # they are grouped in blocks with bounding spheres
+        self._sample_parameters = None
+        self._sample_positions = None
+        self._interval_ends = None
+        self._interval_centers = None
+        self._interval_radii = None
+        self._block_centers = None
+        self._block_radii = None
+
+    @classmethod
+    def from_shape_info(cls, curve_info, weights=None):
+        """
+        create nurbs curve from curveUtils.get_shape_info
+
+        Args:
+            curve_info (dict): curve shape info from curveUtils.get_shape_info
+            weights (list/numpy.ndarray): control vertices weights for rational curves, default is None
+
+        Returns:
+            nurbs_curve (NurbsCurve)
+        """
+        return cls(curve_info['control_vertices'], curve_info['knots'], degree=curve_info['degree'],
+                   form=curve_info['form'], weights=weights)
+
+    @property
+    def control_vertices(self):
+        return self._control_vertices
+
+    @property
+    def knots(self):
+        return self._knots
+
+    @property
+    def degree(self):
+        return self._degree
+
+    @property
+    def form(self):
+        return self._form
+
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def length(self):
+        self._build_length_table()
+        return self._length_values[-1]
+
+    def evaluate(self, parameters, order=0):
+        """
+        evaluate positions and derivatives at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+            order (int): derivatives order, default is 0
+
+        Returns:
+            derivatives (numpy.ndarray): (order + 1, N, 3), derivatives[0] is positions,
+                                         derivatives[k] is the k-th derivatives
+        """
+        parameters = self._get_parameters(parameters)
+        spans = find_spans(self._knots, self._degree, self._num_cvs, parameters)
+        basis = basis_functions(self._knots, self._degree, spans, parameters, order=order)
+
+        # control vertices affecting each parameter
+        indices = spans[:, None] - self._degree + numpy.arange(self._degree + 1)
+        if self._weights is None:
+            return numpy.einsum('nkj,njd->knd', basis, self._control_vertices[indices])
+        derivatives = numpy.einsum('nkj,njd->knd', basis, self._control_vertices_weighted[indices])
+        return rational_derivatives(derivatives)
+
+    def get_positions(self, parameters):
+        """
+        get positions at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+
+        Returns:
+            positions (numpy.ndarray): (N, 3) positions
+        """
+        return self.evaluate(parameters)[0]
+
+    def get_tangents(self, parameters, normalize=True):
+        """
+        get tangents at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+            normalize (bool): normalize the tangents, default is True
+
+        Returns:
+            tangents (numpy.ndarray): (N, 3) tangents
+        """
+        tangents = self.evaluate(parameters, order=1)[1]
+        if normalize:
+            tangents = vector.norm_batch(tangents, out=tangents)
+        return tangents
+
+    def get_lengths(self, parameters):
+        """
+        get arc lengths from the curve start at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+
+        Returns:
+            lengths (numpy.ndarray): (N,) arc lengths
+        """
+        self._build_length_table()
+        parameters = self._get_parameters(parameters)
+        indices = numpy.searchsorted(self._length_parameters, parameters, side='right') - 1
+        indices = numpy.clip(indices, 0, len(self._length_parameters) - 2)
+        return self._length_values[indices] + self._integrate_length(self._length_parameters[indices], parameters)
+
+    def get_parameters(self, lengths):
+        """
+        get parameters at the given arc lengths from the curve start,
+        initial guesses come from the length table, then refined with newton iterations
+
+        Args:
+            lengths (list/numpy.ndarray): (N,) arc lengths
+
+        Returns:
+            parameters (numpy.ndarray): (N,) parameters
+        """
+        self._build_length_table()
+        lengths = numpy.clip(numpy.asarray(lengths, dtype=numpy.float64).reshape(-1), 0, self._length_values[-1])
+        indices = numpy.searchsorted(self._length_values, lengths, side='right') - 1
+        indices = numpy.clip(indices, 0, len(self._length_parameters) - 2)
+
+        # linear interpolate in the table interval as initial guess
+        start = self._length_parameters[indices]
+        end = self._length_parameters[indices + 1]
+        interval_lengths = self._length_values[indices + 1] - self._length_values[indices]
+        weights = (lengths - self._length_values[indices]) / numpy.where(interval_lengths > 0, interval_lengths, 1)
+        parameters = start + (end - start) * weights
+
+        tolerance = NEWTON_TOLERANCE * max(self._length_values[-1], 1)
+        for _ in range(NEWTON_ITERATIONS):
+            errors = self._length_values[indices] + self._integrate_length(start, parameters) - lengths
+            if numpy.all(numpy.abs(errors) < tolerance):
+                break
+            speeds = vector.length_batch(self.evaluate(parameters, order=1)[1])
+            steps = errors / numpy.where(speeds > 0, speeds, 1)
+            parameters = numpy.clip(parameters - steps, start, end)
+
+        return parameters
+
+    def get_uniform_parameters(self, number):
+        """
+        get parameters evenly distributed by arc length, include the curve start and end
+
+        Args:
+            number (int): parameters number
+
+        Returns:
+            parameters (numpy.ndarray): (N,) parameters
+        """
+        return self.get_parameters(numpy.linspace(0, self.length, number))
+
+    def get_points(self, number):
+        """
+        get points evenly on curve by arc length
+
+        Args:
+            number (int): points number
+
+        Returns:
+            positions (numpy.ndarray): (N, 3) positions
+            parameters (numpy.ndarray): (N,) parameters
+            tangents (numpy.ndarray): (N, 3) normalized tangents
+        """
+        parameters = self.get_uniform_parameters(number)
+        derivatives = self.evaluate(parameters, order=1)
+        return derivatives[0], parameters, vector.norm_batch(derivatives[1])
+
+    def get_matrices(self, number, aim_vector=None, up_vector=None, up_curve=None, aim_type='tangent',
+                     flip_check=True, parallel_transport=False):
+        """
+        get matrices evenly along the curve, same as curveUtils.CurveEvaluator.get_matrices
+
+        Args:
+            number (int): matrices number
+            aim_vector (list): the vector aim to the next point, default is [1, 0, 0]
+            up_vector (list): up vector for aiming, only used with up curve, default is [0, 1, 0]
+            up_curve (NurbsCurve): if need points up vectors to aim to a specific curve
+            aim_type (str): tangent/next, aim type for each point,
+                            will be either based on curve's tangent or aim to the next point, default is tangent
+            flip_check (bool): will automatically fix flipping transform if set to True, default is True
+            parallel_transport (bool): carry the first frame along the curve with the minimal rotation between points,
+                                       which doesn't flip or twist, only works without up curve, default is False
+
+        Returns:
+            matrices (numpy.ndarray): (N, 4, 4) matrices
+        """
+        positions, parameters, tangents = self.get_points(number)
+
+        # get target vectors
+        if aim_type == 'tangent':
+            target_vectors = tangents
+        else:
+            # aim to the next point, the last one keeps the previous direction
+            target_vectors = numpy.diff(positions, axis=0)
+            target_vectors = numpy.vstack((target_vectors, target_vectors[-1:]))
+
+        # get up vectors aim to the up curve points at the same parameters
+        up_vectors = None
+        if up_curve:
+            up_vectors = up_curve.get_positions(parameters) - positions
+
+        return matrix.frames_batch(positions, target_vectors, aim_vector=aim_vector, up_vector=up_vector,
+                                   up_vectors=up_vectors, flip_check=flip_check,
+                                   parallel_transport=parallel_transport)
+
+    def closest_point(self, points):
+        """
+        get closest points on curve for the given points,
+        newton iterations refine in every sample interval which can be closer than the closest sample
+
+        Args:
+            points (list/numpy.ndarray): (N, 3) points positions
+
+        Returns:
+            closest_points (numpy.ndarray): (N, 3) closest points positions on curve
+            parameters (numpy.ndarray): (N,) closest points' parameters
+        """
+        points = vector.to_array(points)
+        point_indices, lower, upper = self._get_intervals(points)
+
+        # refine in each interval which can hold the closest point, starts from the interval's start sample,
+        # the curve can have a kink at a c0 knot, so newton never steps across the sample intervals
+        parameters, distances = self._refine_closest_point(points[point_indices], lower, lower, upper)
+
+        # closest candidate for each point
+        order = numpy.lexsort((distances, point_indices))
+        best = order[numpy.searchsorted(point_indices[order], numpy.arange(len(points)))]
+        parameters = self._get_parameters(parameters[best])
+        return self.get_positions(parameters), parameters
+
+    def _get_parameters(self, parameters):
+        """
+        wrap parameters in domain for periodic curve, otherwise clamp them
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+
+        Returns:
+            parameters (numpy.ndarray): (N,) parameters
+        """
+        parameters = numpy.asarray(parameters, dtype=numpy.float64).reshape(-1)
+        if self._form == FORM_PERIODIC:
+            return self._domain[0] + numpy.mod(parameters - self._domain[0], self._domain[1] - self._domain[0])
+        return numpy.clip(parameters, self._domain[0], self._domain[1])
+
+    def _integrate_length(self, start, end):
+        """
+        integrate arc lengths between parameters with gauss legendre quadrature
+
+        Args:
+            start (numpy.ndarray): (N,) start parameters
+            end (numpy.ndarray): (N,) end parameters
+
+        Returns:
+            lengths (numpy.ndarray): (N,) arc lengths
+        """
+        half = (end - start) * 0.5
+        parameters = (start + half)[:, None] + half[:, None] * GAUSS_POINTS
+        speeds = vector.length_batch(self.evaluate(parameters.reshape(-1), order=1)[1]).reshape(parameters.shape)
+        return half * numpy.dot(speeds, GAUSS_WEIGHTS)
+
+    def _build_length_table(self):
+        """
+        build arc lengths table at subdivided knot spans
+        """
+        if self._length_parameters is not None:
+            return
+        self._length_parameters = get_span_parameters(self._knots, self._degree, self._num_cvs,
+                                                      LENGTH_SUBDIVISIONS)
+        interval_lengths = self._integrate_length(self._length_parameters[:-1], self._length_parameters[1:])
+        self._length_values = numpy.concatenate(([0], numpy.cumsum(interval_lengths)))
+
+    def _build_samples(self):
+        """
+        sample the curve densely as a polyline, bound each interval between samples with a sphere,
+        and group consecutive samples in blocks with bounding spheres
+        """
+        if self._sample_parameters is not None:
+            return
+        parameters = get_span_parameters(self._knots, self._degree, self._num_cvs, CLOSEST_SAMPLES * self._degree)
+        # the last sample's interval has no length
+        ends = numpy.append(parameters[1:], parameters[-1])
+
+        # fill the last block with the end sample
+        num_blocks = -(-len(parameters) // SAMPLE_BLOCK_SIZE)
+        fill = num_blocks * SAMPLE_BLOCK_SIZE - len(parameters)
+        parameters = numpy.append(parameters, [parameters[-1]] * fill)
+        ends = numpy.append(ends, [ends[-1]] * fill)
+
+        weights = numpy.linspace(0, 1, INTERVAL_SUBDIVISIONS + 1)
+        interval_parameters = parameters[:, None] + (ends - parameters)[:, None] * weights
+        interval_positions = self.get_positions(interval_parameters.reshape(-1)).reshape(
+            interval_parameters.shape + (3,))
+        interval_centers = (interval_positions.min(axis=1) + interval_positions.max(axis=1)) * 0.5
+        interval_radii = numpy.max(numpy.linalg.norm(interval_positions - interval_centers[:, None], axis=2),
+                                   axis=1) * BOUND_SCALE
+
+        shape = (num_blocks, SAMPLE_BLOCK_SIZE)
+        self._sample_parameters = parameters.reshape(shape)
+        self._sample_positions = interval_positions[:, 0].reshape(shape + (3,))
+        self._interval_ends = ends.reshape(shape)
+        self._interval_centers = interval_centers.reshape(shape + (3,))
+        self._interval_radii = interval_radii.reshape(shape)
+
+        # block spheres bound their intervals' spheres
+        self._block_centers = (self._interval_centers.min(axis=1) + self._interval_centers.max(axis=1)) * 0.5
+        self._block_radii = numpy.max(numpy.linalg.norm(self._interval_centers - self._block_centers[:, None],
+                                                         axis=2) + self._interval_radii, axis=1)
+
+    def _get_intervals(self, points):
+        """
+        get the intervals between samples which can hold the closest points,
+        the closest sample's distance is the upper bound, intervals whose bounding spheres are further are skipped,
+        each point only compares with samples in blocks which can be closer than the nearest block's farthest bound
+
+        Args:
+            points (numpy.ndarray): (N, 3) points positions
+
+        Returns:
+            point_indices (numpy.ndarray): (M,) point index for each interval
+            lower (numpy.ndarray): (M,) intervals' start parameters
+            upper (numpy.ndarray): (M,) intervals' end parameters
+        """
+        self._build_samples()
+
+        point_indices = []
+        lower = []
+        upper = []
+        chunk = max(CHUNK_SIZE // self._sample_parameters.size, 1)
+        for i in range(0, len(points), chunk):
+            points_chunk = points[i: i + chunk]
+            center_distances = numpy.linalg.norm(points_chunk[:, None] - self._block_centers, axis=2)
+            upper_bounds = numpy.min(center_distances + self._block_radii, axis=1)
+            block_points, block_indices = numpy.nonzero(center_distances - self._block_radii <=
+                                                        upper_bounds[:, None])
+
+            # closest sample distance in the candidate blocks
+            sample_distances = numpy.linalg.norm(points_chunk[block_points, None] -
+                                                 self._sample_positions[block_indices], axis=2)
+            upper_bounds[:] = numpy.inf
+            numpy.minimum.at(upper_bounds, block_points, sample_distances.min(axis=1))
+
+            # intervals can be closer than the closest sample
+            lower_bounds = numpy.linalg.norm(points_chunk[block_points, None] -
+                                             self._interval_centers[block_indices], axis=2) - \
+                self._interval_radii[block_indices]
+            pairs, samples = numpy.nonzero(lower_bounds <= upper_bounds[block_points, None])
+            point_indices.append(block_points[pairs] + i)
+            lower.append(self._sample_parameters[block_indices[pairs], samples])
+            upper.append(self._interval_ends[block_indices[pairs], samples])
+
+        return numpy.concatenate(point_indices), numpy.concatenate(lower), numpy.concatenate(upper)
+
+    def _refine_closest_point(self, points, parameters, lower, upper):
+        """
+        refine closest points' parameters with newton iterations in the given parameter ranges,
+        minimize the squared distance, f(u) = C'(u).(C(u) - P) = 0,
+        steps are clamped in the ranges, and go back half way if the distance increases
+
+        Args:
+            points (numpy.ndarray): (N, 3) points positions
+            parameters (numpy.ndarray): (N,) initial parameters
+            lower (numpy.ndarray): (N,) parameter ranges' start
+            upper (numpy.ndarray): (N,) parameter ranges' end
+
+        Returns:
+            parameters (numpy.ndarray): (N,) closest parameters found in the ranges
+            distances (numpy.ndarray): (N,) squared distances at the parameters
+        """
+        margins = (upper - lower) * RANGE_MARGIN
+        lower = lower + margins
+        upper = upper - margins
+        parameters = numpy.clip(parameters, lower, upper)
+        best_parameters = parameters.copy()
+        best_distances = numpy.full(len(points), numpy.inf)
+
+        active = numpy.arange(len(points))
+        for _ in range(NEWTON_ITERATIONS):
+            derivatives = self.evaluate(parameters[active], order=2)
+            offsets = derivatives[0] - points[active]
+            distances = vector.dot_product_batch(offsets, offsets)
+            improved = distances <= best_distances[active]
+            best_parameters[active[improved]] = parameters[active[improved]]
+            best_distances[active[improved]] = distances[improved]
+
+            values = vector.dot_product_batch(derivatives[1], offsets)
+            slopes = vector.dot_product_batch(derivatives[2], offsets) + vector.dot_product_batch(derivatives[1],
+                                                                                                 derivatives[1])
+            # use gauss newton where the slope is not positive, it drops the second derivatives term
+            invalid = slopes <= 0
+            slopes[invalid] = vector.dot_product_batch(derivatives[1][invalid], derivatives[1][invalid])
+            steps = values / numpy.maximum(slopes, NEWTON_TOLERANCE)
+            parameters_active = numpy.clip(parameters[active] - steps, lower[active], upper[active])
+            # the last step increased the distance, go back half way to the best parameter instead
+            parameters_active[~improved] = (parameters[active] + best_parameters[active])[~improved] * 0.5
+            steps = parameters_active - parameters[active]
+            parameters[active] = parameters_active
+            active = active[numpy.abs(steps) > NEWTON_TOLERANCE]
+            if not len(active):
+                break
+
+        # compare the last parameters, they are not evaluated in the loop
+        offsets = self.get_positions(parameters) - points
+        distances = vector.dot_product_batch(offsets, offsets)
+        improved = distances <= best_distances
+        best_parameters[improved] = parameters[improved]
+        best_distances[improved] = distances[improved]
+        return best_parameters, best_distances
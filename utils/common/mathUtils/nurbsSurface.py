@@ -0,0 +1,451 @@
+# import external library
+import numpy
+
+# import utils
+import vector
+import nurbsCurve
+
+# constant
+# samples for each knot span on each direction to get the closest point's initial guess
+CLOSEST_SAMPLES = 6
+
+# newton iterations and parameter tolerance
+NEWTON_ITERATIONS = 20
+NEWTON_TOLERANCE = 1e-12
+
+# points evaluated in each cell between samples on each direction to get the cell's bounding sphere
+CELL_SUBDIVISIONS = 3
+
+# cells' bounding spheres are scaled up by this ratio, the surface can bulge slightly between the evaluated points
+BOUND_SCALE = 1.1
+
+# newton ranges are shrunk by this ratio on both ends, so derivatives are never evaluated across a knot
+RANGE_MARGIN = 1e-10
+
+# max number of point-sample pairs compared in one chunk when searching initial guesses
+CHUNK_SIZE = 1000000
+
+
+# class
+class NurbsSurface(object):
+    """
+    numpy nurbs surface, it evaluates positions, derivatives, normals and closest points for many parameters
+    in one batch without maya
+
+    Args:
+        control_vertices (list/numpy.ndarray): (N, 3) control vertices positions in u major order,
+                                               index is u * num_cvs_v + v, same as maya
+        u_knots (list/numpy.ndarray): maya knots in u, or full knots
+        v_knots (list/numpy.ndarray): maya knots in v, or full knots
+        u_degree (int): degree in u, default is 3
+        v_degree (int): degree in v, default is 3
+        u_form (int): form in u, 1 for open, 2 for closed, 3 for periodic, default is 1
+        v_form (int): form in v, 1 for open, 2 for closed, 3 for periodic, default is 1
+        weights (list/numpy.ndarray): (N,) control vertices weights for rational surfaces, default is None
+
+    Examples:
+        import utils.modeling.surfaceUtils as surfaceUtils
+        import utils.common.mathUtils as mathUtils
+
+        surface_info = surfaceUtils.get_shape_info('ribbon_surface')
+        nurbs_surface = mathUtils.nurbsSurface.NurbsSurface.from_shape_info(surface_info)
+        closest_points, parameters_u, parameters_v = nurbs_surface.closest_point(guide_positions)
+        normals = nurbs_surface.get_normals(parameters_u, parameters_v)
+    """
+    def __init__(self, control_vertices, u_knots, v_knots, u_degree=3, v_degree=3, u_form=nurbsCurve.FORM_OPEN,
+                 v_form=nurbsCurve.FORM_OPEN, weights=None):
+        u_knots = numpy.asarray(u_knots, dtype=numpy.float64).reshape(-1)
+        v_knots = numpy.asarray(v_knots, dtype=numpy.float64).reshape(-1)
+        control_vertices = vector.to_array(control_vertices)
+
+        # maya knots number is num_cvs + degree - 1, full knots number is num_cvs + degree + 1
+        num_cvs_u = len(u_knots) - u_degree + 1
+        num_cvs_v = len(v_knots) - v_degree + 1
+        if num_cvs_u * num_cvs_v != len(control_vertices):
+            num_cvs_u -= 2
+            num_cvs_v -= 2
+
+        self._degrees = (u_degree, v_degree)
+        self._forms = (u_form, v_form)
+        self._num_cvs = (num_cvs_u, num_cvs_v)
+        self._knots = (nurbsCurve.get_knots(u_knots, u_degree, num_cvs_u),
+                       nurbsCurve.get_knots(v_knots, v_degree, num_cvs_v))
+        self._domains = ((self._knots[0][u_degree], self._knots[0][num_cvs_u]),
+                         (self._knots[1][v_degree], self._knots[1][num_cvs_v]))
+
+        # homogeneous control vertices, weights are 1 for non rational surfaces
+        if weights is None:
+            self._rational = False
+            weights = numpy.ones(len(control_vertices))
+        else:
+            self._rational = True
+            weights = numpy.asarray(weights, dtype=numpy.float64).reshape(-1)
+        self._control_vertices = control_vertices.reshape(num_cvs_u, num_cvs_v, 3)
+        self._control_vertices_weighted = numpy.concatenate((control_vertices * weights[:, None], weights[:, None]),
+                                                            axis=1).reshape(num_cvs_u, num_cvs_v, 4)
+
+        # closest point samples, each sample starts a cell to the next samples in u and v with a bounding sphere
+        self._sample_parameters = None
+        self._sample_positions = None
+        self._cell_ends = None
+        self._cell_centers = None
+        self._cell_radii = None
+
+    @classmethod
+    def from_shape_info(cls, surface_info, weights=None):
+        """
+        create nurbs surface from surfaceUtils.get_shape_info
+
+        Args:
+            surface_info (dict): surface shape info from surfaceUtils.get_shape_info
+            weights (list/numpy.ndarray): control vertices weights for rational surfaces, default is None
+
+        Returns:
+            nurbs_surface (NurbsSurface)
+        """
+        return cls(surface_info['control_vertices'], surface_info['u_knots'], surface_info['v_knots'],
+                   u_degree=surface_info['u_degree'], v_degree=surface_info['v_degree'],
+                   u_form=surface_info['u_form'], v_form=surface_info['v_form'], weights=weights)
+
+    @property
+    def control_vertices(self):
+        return self._control_vertices
+
+    @property
+    def knots(self):
+        return self._knots
+
+    @property
+    def degrees(self):
+        return self._degrees
+
+    @property
+    def forms(self):
+        return self._forms
+
+    @property
+    def domains(self):
+        return self._domains
+
+    def evaluate(self, parameters_u, parameters_v, order=0):
+        """
+        evaluate positions and partial derivatives at the given parameters
+
+        Args:
+            parameters_u (list/numpy.ndarray): (N,) parameters in u
+            parameters_v (list/numpy.ndarray): (N,) parameters in v
+            order (int): derivatives order, default is 0
+
+        Returns:
+            derivatives (numpy.ndarray): (order + 1, order + 1, N, 3), derivatives[k, l] is the derivative
+                                         k times in u and l times in v, only k + l <= order are computed
+        """
+        parameters_u, parameters_v = numpy.broadcast_arrays(self._get_parameters(parameters_u, 0),
+                                                            self._get_parameters(parameters_v, 1))
+        basis = []
+        indices = []
+        for direction, parameters in enumerate([parameters_u, parameters_v]):
+            degree = self._degrees[direction]
+            knots = self._knots[direction]
+            spans = nurbsCurve.find_spans(knots, degree, self._num_cvs[direction], parameters)
+            basis.append(nurbsCurve.basis_functions(knots, degree, spans, parameters, order=order))
+            indices.append(spans[:, None] - degree + numpy.arange(degree + 1))
+
+        # control vertices affecting each parameter, (N, u_degree + 1, v_degree + 1, 4)
+        control_vertices = self._control_vertices_weighted[indices[0][:, :, None], indices[1][:, None, :]]
+
+        derivatives = numpy.zeros((order + 1, order + 1, len(parameters_u), 4))
+        for k in range(order + 1):
+            for l in range(order + 1 - k):
+                derivatives[k, l] = numpy.einsum('na,nb,nabd->nd', basis[0][:, k], basis[1][:, l], control_vertices)
+
+        if not self._rational:
+            return derivatives[..., :3]
+        return self._rational_derivatives(derivatives)
+
+    def get_positions(self, parameters_u, parameters_v):
+        """
+        get positions at the given parameters
+
+        Args:
+            parameters_u (list/numpy.ndarray): (N,) parameters in u
+            parameters_v (list/numpy.ndarray): (N,) parameters in v
+
+        Returns:
+            positions (numpy.ndarray): (N, 3) positions
+        """
+        return self.evaluate(parameters_u, parameters_v)[0, 0]
+
+    def get_tangents(self, parameters_u, parameters_v, normalize=True):
+        """
+        get tangents in u and v at the given parameters
+
+        Args:
+            parameters_u (list/numpy.ndarray): (N,) parameters in u
+            parameters_v (list/numpy.ndarray): (N,) parameters in v
+            normalize (bool): normalize the tangents, default is True
+
+        Returns:
+            tangents_u (numpy.ndarray): (N, 3) tangents in u
+            tangents_v (numpy.ndarray): (N, 3) tangents in v
+        """
+        derivatives = self.evaluate(parameters_u, parameters_v, order=1)
+        tangents_u = derivatives[1, 0]
+        tangents_v = derivatives[0, 1]
+        if normalize:
+            tangents_u = vector.norm_batch(tangents_u, out=tangents_u)
+            tangents_v = vector.norm_batch(tangents_v, out=tangents_v)
+        return tangents_u, tangents_v
+
+    def get_normals(self, parameters_u, parameters_v):
+        """
+        get normals at the given parameters, normal is tangent u cross tangent v
+
+        Args:
+            parameters_u (list/numpy.ndarray): (N,) parameters in u
+            parameters_v (list/numpy.ndarray): (N,) parameters in v
+
+        Returns:
+            normals (numpy.ndarray): (N, 3) normalized normals
+        """
+        derivatives = self.evaluate(parameters_u, parameters_v, order=1)
+        return vector.cross_product_batch(derivatives[1, 0], derivatives[0, 1], normalize=True)
+
+    def closest_point(self, points):
+        """
+        get closest points on surface for the given points,
+        newton iterations refine in every sample cell which can be closer than the closest sample
+
+        Args:
+            points (list/numpy.ndarray): (N, 3) points positions
+
+        Returns:
+            closest_points (numpy.ndarray): (N, 3) closest points positions on surface
+            parameters_u (numpy.ndarray): (N,) closest points' parameters in u
+            parameters_v (numpy.ndarray): (N,) closest points' parameters in v
+        """
+        points = vector.to_array(points)
+        point_indices, lower, upper = self._get_cells(points)
+
+        # refine in each cell which can hold the closest point, starts from the cell's start sample,
+        # the surface can have a crease on a c0 knot, so newton never steps across the sample cells
+        parameters, distances = self._refine_closest_point(points[point_indices], lower, lower, upper)
+
+        # closest candidate for each point
+        order = numpy.lexsort((distances, point_indices))
+        best = order[numpy.searchsorted(point_indices[order], numpy.arange(len(points)))]
+        parameters_u = self._get_parameters(parameters[0, best], 0)
+        parameters_v = self._get_parameters(parameters[1, best], 1)
+        return self.get_positions(parameters_u, parameters_v), parameters_u, parameters_v
+
+    def _get_parameters(self, parameters, direction):
+        """
+        wrap parameters in domain for periodic direction, otherwise clamp them
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+            direction (int): 0 for u, 1 for v
+
+        Returns:
+            parameters (numpy.ndarray): (N,) parameters
+        """
+        parameters = numpy.asarray(parameters, dtype=numpy.float64).reshape(-1)
+        domain = self._domains[direction]
+        if self._forms[direction] == nurbsCurve.FORM_PERIODIC:
+            return domain[0] + numpy.mod(parameters - domain[0], domain[1] - domain[0])
+        return numpy.clip(parameters, domain[0], domain[1])
+
+    @staticmethod
+    def _get_clamped(parameters, steps, lower, upper):
+        """
+        check if newton steps push the parameters out of their ranges
+
+        Args:
+            parameters (numpy.ndarray): (N,) current parameters
+            steps (numpy.ndarray): (N,) newton steps, parameters are updated by parameters - steps
+            lower (numpy.ndarray): (N,) parameter ranges' start
+            upper (numpy.ndarray): (N,) parameter ranges' end
+
+        Returns:
+            clamped (numpy.ndarray): (N,) bool array
+        """
+        return ((parameters <= lower) & (steps > 0)) | ((parameters >= upper) & (steps < 0))
+
+    def _rational_derivatives(self, derivatives):
+        """
+        convert homogeneous derivatives to rational surface derivatives with the quotient rule,
+        it's The NURBS Book's algorithm A4.4
+
+        Args:
+            derivatives (numpy.ndarray): (order + 1, order + 1, N, 4) homogeneous derivatives
+
+        Returns:
+            derivatives (numpy.ndarray): (order + 1, order + 1, N, 3) surface derivatives
+        """
+        order = len(derivatives) - 1
+        weighted = derivatives[..., :3]
+        weights = derivatives[..., 3, None]
+        output = numpy.zeros(weighted.shape)
+        for k in range(order + 1):
+            for l in range(order + 1 - k):
+                value = weighted[k, l].copy()
+                for j in range(1, l + 1):
+                    value -= nurbsCurve.binomial(l, j) * weights[0, j] * output[k, l - j]
+                for i in range(1, k + 1):
+                    value -= nurbsCurve.binomial(k, i) * weights[i, 0] * output[k - i, l]
+                    for j in range(1, l + 1):
+                        value -= (nurbsCurve.binomial(k, i) * nurbsCurve.binomial(l, j) * weights[i, j] *
+                                  output[k - i, l - j])
+                output[k, l] = value / weights[0, 0]
+        return output
+
+    def _build_samples(self):
+        """
+        sample the surface as a grid, and bound each cell between samples with a sphere
+        """
+        if self._sample_parameters is not None:
+            return
+        parameters = []
+        ends = []
+        for i in range(2):
+            samples = nurbsCurve.get_span_parameters(self._knots[i], self._degrees[i], self._num_cvs[i],
+                                                     CLOSEST_SAMPLES)
+            parameters.append(samples)
+            # the last sample's cell has no length in this direction
+            ends.append(numpy.append(samples[1:], samples[-1]))
+
+        # parameters and cell ends in u major order, same as the control vertices
+        grid_u, grid_v = numpy.meshgrid(parameters[0], parameters[1], indexing='ij')
+        self._sample_parameters = numpy.vstack((grid_u.reshape(-1), grid_v.reshape(-1)))
+        grid_u, grid_v = numpy.meshgrid(ends[0], ends[1], indexing='ij')
+        self._cell_ends = numpy.vstack((grid_u.reshape(-1), grid_v.reshape(-1)))
+
+        weights_u, weights_v = numpy.meshgrid(numpy.linspace(0, 1, CELL_SUBDIVISIONS + 1),
+                                              numpy.linspace(0, 1, CELL_SUBDIVISIONS + 1), indexing='ij')
+        weights = numpy.vstack((weights_u.reshape(-1), weights_v.reshape(-1)))
+        cell_parameters = self._sample_parameters[:, :, None] + (self._cell_ends -
+                                                                 self._sample_parameters)[:, :, None] * weights[:, None]
+        cell_positions = self.get_positions(cell_parameters[0].reshape(-1), cell_parameters[1].reshape(-1)).reshape(
+            cell_parameters.shape[1:] + (3,))
+        self._sample_positions = cell_positions[:, 0]
+        self._cell_centers = (cell_positions.min(axis=1) + cell_positions.max(axis=1)) * 0.5
+        self._cell_radii = numpy.max(numpy.linalg.norm(cell_positions - self._cell_centers[:, None], axis=2),
+                                     axis=1) * BOUND_SCALE
+
+    def _get_cells(self, points):
+        """
+        get the cells between samples which can hold the closest points,
+        the closest sample's distance is the upper bound, cells whose bounding spheres are further are skipped
+
+        Args:
+            points (numpy.ndarray): (N, 3) points positions
+
+        Returns:
+            point_indices (numpy.ndarray): (M,) point index for each cell
+            lower (numpy.ndarray): (2, M) cells' start parameters in u and v
+            upper (numpy.ndarray): (2, M) cells' end parameters in u and v
+        """
+        self._build_samples()
+
+        point_indices = []
+        cell_indices = []
+        chunk = max(CHUNK_SIZE // len(self._sample_positions), 1)
+        for i in range(0, len(points), chunk):
+            points_chunk = points[i: i + chunk, None]
+            upper_bounds = numpy.min(numpy.linalg.norm(points_chunk - self._sample_positions, axis=2), axis=1)
+            lower_bounds = numpy.linalg.norm(points_chunk - self._cell_centers, axis=2) - self._cell_radii
+            indices, cells = numpy.nonzero(lower_bounds <= upper_bounds[:, None])
+            point_indices.append(indices + i)
+            cell_indices.append(cells)
+
+        cell_indices = numpy.concatenate(cell_indices)
+        return (numpy.concatenate(point_indices), self._sample_parameters[:, cell_indices],
+                self._cell_ends[:, cell_indices])
+
+    def _refine_closest_point(self, points, parameters, lower, upper):
+        """
+        refine closest points' parameters with newton iterations in the given parameter ranges,
+        minimize the squared distance, solve S_u.(S - P) = 0 and S_v.(S - P) = 0,
+        steps are clamped in the ranges, and go back half way if the distance increases
+
+        Args:
+            points (numpy.ndarray): (N, 3) points positions
+            parameters (numpy.ndarray): (2, N) initial parameters in u and v
+            lower (numpy.ndarray): (2, N) parameter ranges' start in u and v
+            upper (numpy.ndarray): (2, N) parameter ranges' end in u and v
+
+        Returns:
+            parameters (numpy.ndarray): (2, N) closest parameters found in the ranges
+            distances (numpy.ndarray): (N,) squared distances at the parameters
+        """
+        margins = (upper - lower) * RANGE_MARGIN
+        lower = lower + margins
+        upper = upper - margins
+        parameters = numpy.clip(parameters, lower, upper)
+        best_parameters = parameters.copy()
+        best_distances = numpy.full(len(points), numpy.inf)
+
+        active = numpy.arange(len(points))
+        for _ in range(NEWTON_ITERATIONS):
+            parameters_u = parameters[0, active]
+            parameters_v = parameters[1, active]
+            derivatives = self.evaluate(parameters_u, parameters_v, order=2)
+            offsets = derivatives[0, 0] - points[active]
+            distances = vector.dot_product_batch(offsets, offsets)
+            improved = distances <= best_distances[active]
+            best_parameters[:, active[improved]] = parameters[:, active[improved]]
+            best_distances[active[improved]] = distances[improved]
+
+            tangents_u = derivatives[1, 0]
+            tangents_v = derivatives[0, 1]
+            values_u = vector.dot_product_batch(tangents_u, offsets)
+            values_v = vector.dot_product_batch(tangents_v, offsets)
+            jacobian_uu = vector.dot_product_batch(tangents_u, tangents_u) + vector.dot_product_batch(
+                derivatives[2, 0], offsets)
+            jacobian_vv = vector.dot_product_batch(tangents_v, tangents_v) + vector.dot_product_batch(
+                derivatives[0, 2], offsets)
+            jacobian_uv = vector.dot_product_batch(tangents_u, tangents_v) + vector.dot_product_batch(
+                derivatives[1, 1], offsets)
+
+            # one parameter solved alone only needs its own second derivative to be positive
+            slopes_u = numpy.where(jacobian_uu > 0, jacobian_uu, vector.dot_product_batch(tangents_u, tangents_u))
+            slopes_v = numpy.where(jacobian_vv > 0, jacobian_vv, vector.dot_product_batch(tangents_v, tangents_v))
+
+            # use gauss newton where the jacobian is not positive definite, it drops the second derivatives terms
+            determinants = jacobian_uu * jacobian_vv - jacobian_uv * jacobian_uv
+            invalid = (determinants <= 0) | (jacobian_uu <= 0)
+            jacobian_uu[invalid] = vector.dot_product_batch(tangents_u[invalid], tangents_u[invalid])
+            jacobian_vv[invalid] = vector.dot_product_batch(tangents_v[invalid], tangents_v[invalid])
+            jacobian_uv[invalid] = vector.dot_product_batch(tangents_u[invalid], tangents_v[invalid])
+            determinants = jacobian_uu * jacobian_vv - jacobian_uv * jacobian_uv
+            determinants[determinants <= 0] = 1
+            steps_u = (jacobian_vv * values_u - jacobian_uv * values_v) / determinants
+            steps_v = (jacobian_uu * values_v - jacobian_uv * values_u) / determinants
+
+            # if one parameter is pushed out of its range, keep it on the boundary and solve the other one
+            clamp_u = self._get_clamped(parameters_u, steps_u, lower[0, active], upper[0, active])
+            clamp_v = self._get_clamped(parameters_v, steps_v, lower[1, active], upper[1, active])
+            # on a corner both can be pushed out, but each one solved alone can still move along its boundary
+            steps_u[clamp_v] = values_u[clamp_v] / numpy.maximum(slopes_u[clamp_v], NEWTON_TOLERANCE)
+            steps_v[clamp_u] = values_v[clamp_u] / numpy.maximum(slopes_v[clamp_u], NEWTON_TOLERANCE)
+            steps_u[self._get_clamped(parameters_u, steps_u, lower[0, active], upper[0, active])] = 0
+            steps_v[self._get_clamped(parameters_v, steps_v, lower[1, active], upper[1, active])] = 0
+
+            parameters_active = numpy.clip(parameters[:, active] - numpy.vstack((steps_u, steps_v)),
+                                           lower[:, active], upper[:, active])
+            # the last step increased the distance, go back half way to the best parameters instead
+            parameters_active[:, ~improved] = (parameters[:, active] +
+                                               best_parameters[:, active])[:, ~improved] * 0.5
+            steps = numpy.max(numpy.abs(parameters_active - parameters[:, active]), axis=0)
+            parameters[:, active] = parameters_active
+            active = active[steps > NEWTON_TOLERANCE]
+            if not len(active):
+                break
+
+        # compare the last parameters, they are not evaluated in the loop
+        offsets = self.get_positions(parameters[0], parameters[1]) - points
+        distances = vector.dot_product_batch(offsets, offsets)
+        improved = distances <= best_distances
+        best_parameters[:, improved] = parameters[:, improved]
+        best_distances[improved] = distances[improved]
+        return best_parameters, best_distances
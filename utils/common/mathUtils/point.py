@@ -2,6 +2,7 @@
 import math
 import numpy
 import matrix
+import vector
 import numeric
 
 
@@ -23,9 +24,9 @@ def get_distance(point_a, point_b):
         # 1
     """
 
-    dis = math.sqrt(math.pow(point_b[0] - point_a[0], 2) +
-                    math.pow(point_b[1] - point_a[1], 2) +
-                    math.pow(point_b[2] - point_a[2], 2))
+    # plain python is faster than numpy for a single pair of points
+    delta = [point_b[0] - point_a[0], point_b[1] - point_a[1], point_b[2] - point_a[2]]
+    dis = math.sqrt(delta[0] * delta[0] + delta[1] * delta[1] + delta[2] * delta[2])
     return dis
 
 
@@ -83,18 +84,7 @@ def mult_matrix(point, input_matrix, output_type='list'):
     Returns:
         point (list/numpy.ndarray)
     """
-    if isinstance(point, list):
-        # convert to numpy
-        point = numpy.array(point)
-
-    # add the last column for calculation
-    point = numpy.append(point, 1)
-
-    if isinstance(input_matrix, list):
-        input_matrix = matrix.list_to_matrix(input_matrix)
-
-    # get output point, and remove the last column
-    point = point.dot(input_matrix).A1[:-1]
+    point = mult_matrix_batch(point, input_matrix)[0]
     if output_type == 'list':
         point = point.tolist()
 
@@ -113,23 +103,87 @@ def array_mult_matrix(point_array, input_matrix, output_type='list'):
     Returns:
         point_array (list/numpy.ndarray)
     """
-    if isinstance(point_array, list):
-        point_array = numpy.array(point_array)
+    point_array = mult_matrix_batch(point_array, input_matrix)
 
-    # add one column for calculation
-    point_array = numpy.c_[point_array, numpy.ones(point_array.shape[0])]
+    if output_type == 'list':
+        point_array = point_array.tolist()
 
-    if isinstance(input_matrix, list):
-        # convert to numpy
-        input_matrix = matrix.list_to_matrix(input_matrix)
+    return point_array
 
-    # get output points array
-    point_array = point_array.dot(input_matrix)
 
-    # remove last column
-    point_array = numpy.delete(point_array, (-1), axis=1)
+# batch function
+# batch functions work on (N, 3) float64 arrays without python loops,
+# a single point is broadcast against the other inputs, and out can be given to write the result in place
+def get_distance_batch(points_a, points_b, out=None):
+    """
+    distances between points
 
-    if output_type == 'list':
-        point_array = point_array.tolist()
+    Args:
+        points_a (list/numpy.ndarray): (N, 3) points
+        points_b (list/numpy.ndarray): (N, 3) points
+        out (numpy.ndarray): (N,) array to store the output distances, default is None
 
-    return point_array
+    Returns:
+        distances (numpy.ndarray): (N,) distances
+
+    Examples:
+        import numpy
+        import utils.common.timeUtils as timeUtils
+        import utils.common.mathUtils as mathUtils
+
+        points_a = numpy.random.rand(100000, 3)
+        points_b = numpy.random.rand(100000, 3)
+        with timeUtils.Timer('point.get_distance_batch'):
+            mathUtils.point.get_distance_batch(points_a, points_b)
+
+        list_a = points_a.tolist()
+        list_b = points_b.tolist()
+        with timeUtils.Timer('point.get_distance'):
+            for point_a, point_b in zip(list_a, list_b):
+                mathUtils.point.get_distance(point_a, point_b)
+
+        timeUtils.get_report(['point.get_distance_batch', 'point.get_distance'])
+    """
+    delta = vector.to_array(points_b) - vector.to_array(points_a)
+    return numpy.sqrt(numpy.einsum('ni,ni->n', delta, delta), out=out)
+
+
+def get_point_from_vector_batch(vectors, start_points, distances=1, out=None):
+    """
+    get points from vectors and start positions, vectors can be scaled by distances
+
+    Args:
+        vectors (list/numpy.ndarray): (N, 3) vectors to shoot from the start positions
+        start_points (list/numpy.ndarray): (N, 3) start positions
+        distances (float/list/numpy.ndarray): (N,) scale factors for the vectors, default is 1
+        out (numpy.ndarray): (N, 3) array to store the output points, default is None
+
+    Returns:
+        points (numpy.ndarray): (N, 3) points
+    """
+    distances = numpy.reshape(distances, (-1, 1))
+    return numpy.add(vector.to_array(start_points), vector.to_array(vectors) * distances, out=out)
+
+
+def mult_matrix_batch(points, matrices, out=None):
+    """
+    multiply points with a matrix, or each point with its own matrix
+
+    Args:
+        points (list/numpy.ndarray): (N, 3) points
+        matrices (list/numpy.ndarray): a matrix, or (N, 4, 4) matrices
+        out (numpy.ndarray): (N, 3) array to store the output points, can be the input points, default is None
+
+    Returns:
+        points (numpy.ndarray): (N, 3) points
+    """
+    points = vector.to_array(points)
+    matrices = matrix.to_array(matrices)
+    if len(matrices) == 1:
+        points_mult = numpy.dot(points, matrices[0, :3, :3]) + matrices[0, 3, :3]
+    else:
+        points_mult = numpy.einsum('ni,nij->nj', points, matrices[:, :3, :3]) + matrices[:, 3, :3]
+    if out is not None:
+        out[:] = points_mult
+        points_mult = out
+    return points_mult
@@ -0,0 +1,486 @@
+# import external library
+import numpy
+
+# import utils
+import matrix
+
+# constant
+# quaternions are stored as x, y, z, w same as maya's MQuaternion, all functions work on (N, 4) arrays,
+# a single quaternion is broadcast against the other inputs
+IDENTITY = [0.0, 0.0, 0.0, 1.0]
+
+AXIS = {'x': 0,
+        'y': 1,
+        'z': 2}
+
+# dot value over this tolerance will use nlerp instead of slerp to avoid dividing by zero
+SLERP_TOLERANCE = 1 - 1e-9
+
+
+# function
+def to_array(quaternions):
+    """
+    convert quaternions to a contiguous (N, 4) float64 array
+
+    Args:
+        quaternions (list/numpy.ndarray): a quaternion or a list/array of quaternions
+
+    Returns:
+        quaternions_array (numpy.ndarray): (N, 4) array
+    """
+    return numpy.ascontiguousarray(quaternions, dtype=numpy.float64).reshape(-1, 4)
+
+
+def normalize(quaternions):
+    """
+    normalize quaternions
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+    """
+    quaternions = to_array(quaternions)
+    return quaternions / numpy.linalg.norm(quaternions, axis=1)[:, None]
+
+
+def conjugate(quaternions):
+    """
+    get quaternions' conjugates, it's the inverse rotation for unit quaternions
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) conjugate quaternions
+    """
+    quaternions = to_array(quaternions).copy()
+    quaternions[:, :3] *= -1
+    return quaternions
+
+
+def multiply(*quaternions):
+    """
+    multiply given quaternions in order, same as maya's quaternion multiplication,
+    the result rotates by the first quaternion, then the next one, same as multiplying their matrices
+
+    Args:
+        quaternions (list/numpy.ndarray): quaternions chain, each item is a quaternion or (N, 4) quaternions
+
+    Returns:
+        quaternions_mult (numpy.ndarray): (N, 4) quaternions
+
+    Examples:
+        import utils.common.mathUtils as mathUtils
+
+        quat_x = mathUtils.quaternion.from_euler([90, 0, 0])
+        quat_y = mathUtils.quaternion.from_euler([0, 90, 0])
+        mathUtils.quaternion.to_euler(mathUtils.quaternion.multiply(quat_x, quat_y))
+        # array([[90., 90.,  0.]])
+    """
+    quaternions_mult = to_array(quaternions[0])
+    for quat in quaternions[1:]:
+        quaternions_mult = _hamilton(to_array(quat), quaternions_mult)
+    return quaternions_mult
+
+
+def dot(quaternions_a, quaternions_b):
+    """
+    get dot products between quaternions
+
+    Args:
+        quaternions_a (list/numpy.ndarray): (N, 4) quaternions
+        quaternions_b (list/numpy.ndarray): (N, 4) quaternions
+
+    Returns:
+        dot_values (numpy.ndarray): (N,) dot values
+    """
+    return numpy.einsum('ni,ni->n', *numpy.broadcast_arrays(to_array(quaternions_a), to_array(quaternions_b)))
+
+
+def from_matrix(matrices):
+    """
+    convert matrices to quaternions, matrices should not contain scale or shear
+
+    Args:
+        matrices (list/numpy.ndarray): (N, 4, 4) matrices or (N, 3, 3) rotation matrices
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+    """
+    return matrix.rotation_to_quaternion(matrices)
+
+
+def to_matrix(quaternions, translate=None):
+    """
+    convert quaternions to matrices
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions
+        translate (list/numpy.ndarray): (N, 3) translation values, default is None
+
+    Returns:
+        matrices (numpy.ndarray): (N, 4, 4) matrices
+    """
+    rotation = matrix.quaternion_to_rotation(quaternions)
+    matrices = numpy.zeros((len(rotation), 4, 4))
+    matrices[:, :3, :3] = rotation
+    if translate is not None:
+        matrices[:, 3, :3] = numpy.reshape(translate, (-1, 3))
+    matrices[:, 3, 3] = 1
+    return matrices
+
+
+def from_euler(rotate, rotate_order=0):
+    """
+    convert euler rotation values to quaternions
+
+    Args:
+        rotate (list/numpy.ndarray): (N, 3) euler rotation values in degrees
+        rotate_order (int): rotation values' rotate order, default is 0
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+    """
+    return matrix.rotation_to_quaternion(matrix.euler_to_rotation(rotate, rotate_order=rotate_order))
+
+
+def to_euler(quaternions, rotate_order=0):
+    """
+    convert quaternions to euler rotation values
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions
+        rotate_order (int): output rotation values' rotate order, default is 0
+
+    Returns:
+        rotate (numpy.ndarray): (N, 3) euler rotation values in degrees
+    """
+    return matrix.rotation_to_euler(matrix.quaternion_to_rotation(quaternions), rotate_order=rotate_order)
+
+
+def from_axis_angle(axes, angles):
+    """
+    get quaternions rotating around given axes
+
+    Args:
+        axes (list/numpy.ndarray): (N, 3) rotation axes, will be normalized
+        angles (list/numpy.ndarray): (N,) rotation angles in degrees
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+    """
+    axes = numpy.reshape(axes, (-1, 3)).astype(numpy.float64)
+    axes = axes / numpy.linalg.norm(axes, axis=1)[:, None]
+    half_angles = numpy.radians(numpy.reshape(angles, -1)) * 0.5
+    axes, half_angles = numpy.broadcast_arrays(axes, half_angles[:, None])
+    return numpy.c_[axes * numpy.sin(half_angles), numpy.cos(half_angles[:, 0])]
+
+
+def log(quaternions):
+    """
+    get quaternions' logarithms, the output is the rotation axis scaled by half of the rotation angle in radians
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) unit quaternions
+
+    Returns:
+        vectors (numpy.ndarray): (N, 3) log vectors
+    """
+    quaternions = normalize(quaternions)
+    sin_half = numpy.linalg.norm(quaternions[:, :3], axis=1)
+    half_angles = numpy.arctan2(sin_half, quaternions[:, 3])
+    # sin(x) / x is 1 when the rotation is close to zero
+    scale = numpy.ones(len(quaternions))
+    mask = sin_half > 1e-12
+    scale[mask] = half_angles[mask] / sin_half[mask]
+    return quaternions[:, :3] * scale[:, None]
+
+
+def exp(vectors):
+    """
+    get quaternions from log vectors, it's the inverse of the log function
+
+    Args:
+        vectors (list/numpy.ndarray): (N, 3) log vectors
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+    """
+    vectors = numpy.reshape(vectors, (-1, 3)).astype(numpy.float64)
+    half_angles = numpy.linalg.norm(vectors, axis=1)
+    scale = numpy.ones(len(vectors))
+    mask = half_angles > 1e-12
+    scale[mask] = numpy.sin(half_angles[mask]) / half_angles[mask]
+    return numpy.c_[vectors * scale[:, None], numpy.cos(half_angles)]
+
+
+def nlerp(quaternions_a, quaternions_b, weights, shortest=True):
+    """
+    normalized linear interpolation between quaternions
+
+    Args:
+        quaternions_a (list/numpy.ndarray): (N, 4) quaternions when weight is 0
+        quaternions_b (list/numpy.ndarray): (N, 4) quaternions when weight is 1
+        weights (float/list/numpy.ndarray): (N,) interpolation weights
+        shortest (bool): interpolate along the shortest path, default is True
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+    """
+    quaternions_a, quaternions_b, weights = _get_interpolation_inputs(quaternions_a, quaternions_b, weights,
+                                                                      shortest)
+    return normalize(quaternions_a * (1 - weights) + quaternions_b * weights)
+
+
+def slerp(quaternions_a, quaternions_b, weights, shortest=True):
+    """
+    spherical linear interpolation between quaternions, same as the constraint node's shortest interpolation
+
+    Args:
+        quaternions_a (list/numpy.ndarray): (N, 4) quaternions when weight is 0
+        quaternions_b (list/numpy.ndarray): (N, 4) quaternions when weight is 1
+        weights (float/list/numpy.ndarray): (N,) interpolation weights
+        shortest (bool): interpolate along the shortest path, default is True
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions
+
+    Examples:
+        import numpy
+        import utils.common.mathUtils as mathUtils
+
+        # bake 10000 frames of blending between two rotations
+        quat_a = mathUtils.quaternion.from_euler([0, 0, 0])
+        quat_b = mathUtils.quaternion.from_euler([0, 90, 0])
+        rotate = mathUtils.quaternion.to_euler(mathUtils.quaternion.slerp(quat_a, quat_b,
+                                                                          numpy.linspace(0, 1, 10000)))
+    """
+    quaternions_a, quaternions_b, weights = _get_interpolation_inputs(quaternions_a, quaternions_b, weights,
+                                                                      shortest)
+    cos_angles = numpy.clip(numpy.einsum('ni,ni->n', quaternions_a, quaternions_b), -1, 1)
+    angles = numpy.arccos(cos_angles)[:, None]
+    sin_angles = numpy.sin(angles)
+
+    # fall back to nlerp for almost identical quaternions
+    close = numpy.abs(cos_angles) > SLERP_TOLERANCE
+    sin_angles[close] = 1
+    weights_a = numpy.where(close[:, None], 1 - weights, numpy.sin((1 - weights) * angles) / sin_angles)
+    weights_b = numpy.where(close[:, None], weights, numpy.sin(weights * angles) / sin_angles)
+    return normalize(quaternions_a * weights_a + quaternions_b * weights_b)
+
+
+def average(quaternions, weights=None):
+    """
+    get weighted average rotations, it uses the largest eigenvector of the weighted quaternions outer products,
+    so the result doesn't depend on quaternions' signs or order
+
+    Args:
+        quaternions (list/numpy.ndarray): (K, 4) quaternions to be averaged, or (N, K, 4) for N averages
+        weights (list/numpy.ndarray): (K,) or (N, K) weights, default is None, which averages equally
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) unit quaternions, N is 1 if given (K, 4) quaternions
+
+    Examples:
+        import utils.common.mathUtils as mathUtils
+
+        quats = mathUtils.quaternion.from_euler([[0, 0, 0], [0, 90, 0]])
+        mathUtils.quaternion.to_euler(mathUtils.quaternion.average(quats, weights=[0.5, 0.5]))
+        # array([[ 0., 45.,  0.]])
+    """
+    quaternions = numpy.asarray(quaternions, dtype=numpy.float64)
+    quaternions = quaternions.reshape(-1, quaternions.shape[-2], 4)
+    if weights is None:
+        weights = numpy.ones(quaternions.shape[:2])
+    weights = numpy.broadcast_to(numpy.asarray(weights, dtype=numpy.float64), quaternions.shape[:2])
+
+    outer = numpy.einsum('nk,nki,nkj->nij', weights, quaternions, quaternions)
+    eigen_vectors = numpy.linalg.eigh(outer)[1]
+    # eigen values are sorted ascending, the last one is the largest
+    averages = eigen_vectors[:, :, -1]
+    averages[averages[:, 3] < 0] *= -1
+    return normalize(averages)
+
+
+def swing_twist(quaternions, axis='x'):
+    """
+    decompose quaternions to swing and twist rotations, quaternion = twist * swing,
+    twist rotates around the given local axis first, then swing rotates the axis to the final direction
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions
+        axis (str): twist axis, x/y/z, default is x
+
+    Returns:
+        swing (numpy.ndarray): (N, 4) swing quaternions
+        twist (numpy.ndarray): (N, 4) twist quaternions
+    """
+    quaternions = normalize(quaternions)
+    index = AXIS[axis]
+
+    # twist keeps the axis component and w
+    twist = numpy.zeros_like(quaternions)
+    twist[:, index] = quaternions[:, index]
+    twist[:, 3] = quaternions[:, 3]
+    length = numpy.linalg.norm(twist, axis=1)
+    # 180 degrees swing has no twist component
+    degenerate = length < 1e-12
+    twist[degenerate] = IDENTITY
+    length[degenerate] = 1
+    twist /= length[:, None]
+
+    swing = multiply(conjugate(twist), quaternions)
+    return swing, twist
+
+
+def twist_angle(quaternions, axis='x'):
+    """
+    get twist angles around the given axis,
+    same as the twist value nodeUtils.matrix.twist_extraction computes in DG
+
+    Args:
+        quaternions (list/numpy.ndarray): (N, 4) quaternions
+        axis (str): twist axis, x/y/z, default is x
+
+    Returns:
+        angles (numpy.ndarray): (N,) twist angles in degrees, in range (-180, 180]
+    """
+    quaternions = to_array(quaternions)
+    angles = numpy.degrees(2 * numpy.arctan2(quaternions[:, AXIS[axis]], quaternions[:, 3]))
+    # wrap to (-180, 180], the quaternion's sign flips the angle by 360
+    return 180 - numpy.mod(180 - angles, 360)
+
+
+# dual quaternion function
+# dual quaternions are stored as (N, 8) arrays, real quaternion first then dual quaternion
+def dual_quaternion_from_matrix(matrices):
+    """
+    convert matrices to dual quaternions, matrices should not contain scale or shear
+
+    Args:
+        matrices (list/numpy.ndarray): (N, 4, 4) matrices
+
+    Returns:
+        dual_quaternions (numpy.ndarray): (N, 8) unit dual quaternions
+    """
+    matrices = matrix.to_array(matrices)
+    real = matrix.rotation_to_quaternion(matrices[:, :3, :3])
+    translate = numpy.c_[matrices[:, 3, :3], numpy.zeros(len(matrices))]
+    dual = 0.5 * _hamilton(translate, real)
+    return numpy.c_[real, dual]
+
+
+def dual_quaternion_to_matrix(dual_quaternions):
+    """
+    convert dual quaternions to matrices
+
+    Args:
+        dual_quaternions (list/numpy.ndarray): (N, 8) dual quaternions, will be normalized
+
+    Returns:
+        matrices (numpy.ndarray): (N, 4, 4) matrices
+    """
+    dual_quaternions = _normalize_dual_quaternion(dual_quaternions)
+    real = dual_quaternions[:, :4]
+    dual = dual_quaternions[:, 4:]
+    translate = 2 * _hamilton(dual, conjugate(real))[:, :3]
+    return to_matrix(real, translate=translate)
+
+
+def dual_quaternion_blend(dual_quaternions, weights):
+    """
+    blend dual quaternions linearly, same as dual quaternion skinning,
+    dual quaternions are flipped to the first one's hemisphere before blending
+
+    Args:
+        dual_quaternions (list/numpy.ndarray): (K, 8) dual quaternions, or (N, K, 8) for N blends
+        weights (list/numpy.ndarray): (K,) or (N, K) weights
+
+    Returns:
+        dual_quaternions (numpy.ndarray): (N, 8) unit dual quaternions
+
+    Examples:
+        import utils.common.mathUtils as mathUtils
+
+        matrices = mathUtils.matrix.compose_batch(translate=[[0, 0, 0], [10, 0, 0]], rotate=[[0, 0, 0], [0, 90, 0]])
+        dual_quats = mathUtils.quaternion.dual_quaternion_from_matrix(matrices)
+        blend = mathUtils.quaternion.dual_quaternion_blend(dual_quats, [0.5, 0.5])
+        mathUtils.quaternion.dual_quaternion_to_matrix(blend)
+    """
+    dual_quaternions = numpy.asarray(dual_quaternions, dtype=numpy.float64)
+    dual_quaternions = dual_quaternions.reshape(-1, dual_quaternions.shape[-2], 8)
+    weights = numpy.broadcast_to(numpy.asarray(weights, dtype=numpy.float64), dual_quaternions.shape[:2])
+
+    # flip to the first dual quaternion's hemisphere
+    signs = numpy.sign(numpy.einsum('nki,ni->nk', dual_quaternions[:, :, :4], dual_quaternions[:, 0, :4]))
+    signs[signs == 0] = 1
+    blend = numpy.einsum('nk,nki->ni', weights * signs, dual_quaternions)
+    return _normalize_dual_quaternion(blend)
+
+
+# sub function
+def _hamilton(quaternions_a, quaternions_b):
+    """
+    hamilton product a * b, it rotates by b first then a, which is the reversed order of maya's multiplication
+
+    Args:
+        quaternions_a (numpy.ndarray): (N, 4) quaternions
+        quaternions_b (numpy.ndarray): (N, 4) quaternions
+
+    Returns:
+        quaternions (numpy.ndarray): (N, 4) quaternions
+    """
+    quaternions_a, quaternions_b = numpy.broadcast_arrays(quaternions_a, quaternions_b)
+    x_a, y_a, z_a, w_a = quaternions_a.T
+    x_b, y_b, z_b, w_b = quaternions_b.T
+    return numpy.stack([w_a * x_b + x_a * w_b + y_a * z_b - z_a * y_b,
+                        w_a * y_b - x_a * z_b + y_a * w_b + z_a * x_b,
+                        w_a * z_b + x_a * y_b - y_a * x_b + z_a * w_b,
+                        w_a * w_b - x_a * x_b - y_a * y_b - z_a * z_b], axis=1)
+
+
+def _get_interpolation_inputs(quaternions_a, quaternions_b, weights, shortest):
+    """
+    broadcast interpolation inputs to the same length, and flip quaternions_b to the shortest path if needed
+
+    Args:
+        quaternions_a (list/numpy.ndarray): (N, 4) quaternions
+        quaternions_b (list/numpy.ndarray): (N, 4) quaternions
+        weights (float/list/numpy.ndarray): (N,) interpolation weights
+        shortest (bool): interpolate along the shortest path
+
+    Returns:
+        quaternions_a (numpy.ndarray): (N, 4) unit quaternions
+        quaternions_b (numpy.ndarray): (N, 4) unit quaternions
+        weights (numpy.ndarray): (N, 1) weights
+    """
+    weights = numpy.reshape(weights, (-1, 1)).astype(numpy.float64)
+    quaternions_a, quaternions_b, weights = numpy.broadcast_arrays(normalize(quaternions_a),
+                                                                   normalize(quaternions_b), weights)
+    weights = weights[:, :1]
+    quaternions_b = quaternions_b.copy()
+    if shortest:
+        flip = numpy.einsum('ni,ni->n', quaternions_a, quaternions_b) < 0
+        quaternions_b[flip] *= -1
+    return quaternions_a, quaternions_b, weights
+
+
+def _normalize_dual_quaternion(dual_quaternions):
+    """
+    normalize dual quaternions, the real part is unit length and orthogonal to the dual part
+
+    Args:
+        dual_quaternions (list/numpy.ndarray): (N, 8) dual quaternions
+
+    Returns:
+        dual_quaternions (numpy.ndarray): (N, 8) unit dual quaternions
+    """
+    dual_quaternions = numpy.reshape(dual_quaternions, (-1, 8)).astype(numpy.float64)
+    length = numpy.linalg.norm(dual_quaternions[:, :4], axis=1)[:, None]
+    real = dual_quaternions[:, :4] / length
+    dual = dual_quaternions[:, 4:] / length
+    # remove the dual part parallel to the real part
+    dual -= numpy.einsum('ni,ni->n', real, dual)[:, None] * real
+    return numpy.c_[real, dual]
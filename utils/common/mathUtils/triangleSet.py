@@ -0,0 +1,514 @@
+# import external library
+import numpy
+
+# import utils
+import vector
+
+# constant
+# ring of grid cells searched around each query point before the exact search
+SEARCH_RING = 1
+
+# points are tested against all triangles if their grid search is expected to test more pairs than
+# this ratio of the triangles number, like points inside a closed mesh or far away from it
+BRUTE_FORCE_RATIO = 0.5
+
+# max point and triangle pairs tested at once, limits the memory used by the brute force search
+CHUNK_PAIRS = 200000
+
+
+class TriangleSet(object):
+    """
+    vectorized triangles wrapper to query many points against all triangles of a mesh in one batch,
+    triangles' edge vectors and dot products are precomputed into arrays,
+    and triangles are bucketed in a uniform grid to only test the triangles near each query point
+
+    Args:
+        points (list/numpy.ndarray): (V, 3) vertices positions
+        triangles (list/numpy.ndarray): (T, 3) triangles' vertices indices
+        cell_size (float): grid cell size, default is None, which uses the triangles' average bounding box size
+
+    Examples:
+        import utils.modeling.meshUtils as meshUtils
+        import utils.common.mathUtils as mathUtils
+
+        mesh_info = meshUtils.get_shape_info('pSphere1', as_numpy=True)
+        triangle_set = mathUtils.triangleSet.TriangleSet.from_mesh_info(mesh_info)
+        # get closest points, triangles and barycentric coordinates for all rivet positions
+        closest_points, triangle_indices, weights = triangle_set.closest_point(rivet_positions)
+        # get polygon face indices
+        faces = triangle_set.face_indices[triangle_indices]
+        # get signed distances, positive is on the normal side
+        distances = triangle_set.signed_distance(rivet_positions)
+    """
+    def __init__(self, points, triangles, cell_size=None):
+        self._points = vector.to_array(points)
+        self._triangles = numpy.asarray(triangles, dtype=numpy.int64).reshape(-1, 3)
+        if not len(self._triangles):
+            raise ValueError('triangle set needs at least one triangle')
+        self._face_indices = numpy.arange(len(self._triangles))
+
+        # triangle info
+        self._point_a = None
+        self._vectors_ab = None
+        self._vectors_ac = None
+        self._normals = None
+        self._areas = None
+        self._barycentric_dots = None
+        self._barycentric_denom_inv = None
+
+        # pseudo normals for signed distance
+        self._vertex_normals = None
+        self._edge_normals = None
+        self._triangle_edges = None
+
+        # grid
+        self._cell_size = cell_size
+        self._grid_origin = None
+        self._grid_dimensions = None
+        self._cell_keys = None
+        self._cell_starts = None
+        self._cell_triangles = None
+
+        self._get_triangles_info()
+        self._build_grid()
+
+    @classmethod
+    def from_mesh_info(cls, mesh_info, cell_size=None):
+        """
+        create triangle set from meshUtils.get_shape_info, polygons are fan triangulated
+
+        Args:
+            mesh_info (dict): mesh shape info from meshUtils.get_shape_info
+            cell_size (float): grid cell size, default is None
+
+        Returns:
+            triangle_set (TriangleSet)
+        """
+        poly_count = numpy.asarray(mesh_info['poly_count_array'], dtype=numpy.int64)
+        poly_connects = numpy.asarray(mesh_info['poly_connects'], dtype=numpy.int64)
+        offsets = numpy.cumsum(poly_count) - poly_count
+
+        # each polygon with n vertices has n - 2 triangles, (0, k, k + 1)
+        triangle_count = numpy.maximum(poly_count - 2, 0)
+        faces = numpy.repeat(numpy.arange(len(poly_count)), triangle_count)
+        corners = numpy.arange(len(faces)) - numpy.repeat(numpy.cumsum(triangle_count) - triangle_count,
+                                                          triangle_count) + 1
+        starts = offsets[faces]
+        triangles = numpy.stack([poly_connects[starts], poly_connects[starts + corners],
+                                 poly_connects[starts + corners + 1]], axis=1)
+
+        triangle_set = cls(mesh_info['points_array'], triangles, cell_size=cell_size)
+        triangle_set._face_indices = faces
+        return triangle_set
+
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def triangles(self):
+        return self._triangles
+
+    @property
+    def face_indices(self):
+        """
+        polygon face index for each triangle
+        """
+        return self._face_indices
+
+    @property
+    def normals(self):
+        return self._normals
+
+    @property
+    def areas(self):
+        return self._areas
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def barycentric_coordinates(self, points, triangle_indices):
+        """
+        get barycentric coordinates for given points and triangles, points are projected on the triangles' planes
+
+        Args:
+            points (list/numpy.ndarray): (M, 3) points positions
+            triangle_indices (list/numpy.ndarray): (M,) triangle index for each point
+
+        Returns:
+            weights (numpy.ndarray): (M, 3) weight values to each triangle points, the sum is 1
+        """
+        triangle_indices = numpy.asarray(triangle_indices, dtype=numpy.int64).reshape(-1)
+        vectors_point = vector.to_array(points) - self._point_a[triangle_indices]
+        dot_20 = numpy.einsum('ni,ni->n', vectors_point, self._vectors_ab[triangle_indices])
+        dot_21 = numpy.einsum('ni,ni->n', vectors_point, self._vectors_ac[triangle_indices])
+        dot_00, dot_01, dot_11 = self._barycentric_dots[triangle_indices].T
+        denom_inv = self._barycentric_denom_inv[triangle_indices]
+
+        v = (dot_11 * dot_20 - dot_01 * dot_21) * denom_inv
+        w = (dot_00 * dot_21 - dot_01 * dot_20) * denom_inv
+        return numpy.stack([1 - v - w, v, w], axis=1)
+
+    def closest_point(self, points):
+        """
+        get closest points on the triangles for given points,
+        the grid helps most for points near the surface, points without triangles in the cells nearby,
+        or whose exact search needs too many cells, are tested against all triangles in chunks
+
+        Args:
+            points (list/numpy.ndarray): (M, 3) points positions
+
+        Returns:
+            closest_points (numpy.ndarray): (M, 3) closest points positions
+            triangle_indices (numpy.ndarray): (M,) closest triangle index for each point
+            weights (numpy.ndarray): (M, 3) barycentric weight values on the closest triangles, the sum is 1
+        """
+        points = vector.to_array(points)
+        count = len(points)
+        point_cells = numpy.clip(numpy.floor((points - self._grid_origin) / self._cell_size).astype(numpy.int64), 0,
+                                 self._grid_dimensions - 1)
+
+        # search the cells around each point first
+        triangle_indices = numpy.full(count, -1, dtype=numpy.int64)
+        weights = numpy.zeros((count, 3))
+        distances = numpy.full(count, numpy.inf)
+        self._search(points, numpy.arange(count), point_cells - SEARCH_RING, point_cells + SEARCH_RING,
+                     triangle_indices, weights, distances)
+
+        # triangles outside the searched block can still be closer,
+        # search again with the cells overlapping the closest distance sphere if the sphere is not inside the block
+        block_min = self._grid_origin + (point_cells - SEARCH_RING) * self._cell_size
+        block_max = self._grid_origin + (point_cells + SEARCH_RING + 1) * self._cell_size
+        block_distances = numpy.minimum(points - block_min, block_max - points).min(axis=1)
+        pending = numpy.nonzero(distances > block_distances)[0]
+
+        radius = distances[pending][:, None]
+        cells_min = numpy.floor((points[pending] - radius - self._grid_origin) / self._cell_size)
+        cells_max = numpy.floor((points[pending] + radius - self._grid_origin) / self._cell_size)
+        # clip before converting, the radius is infinite for points without any triangle nearby
+        cells_min = numpy.clip(cells_min, 0, self._grid_dimensions - 1).astype(numpy.int64)
+        cells_max = numpy.clip(cells_max, 0, self._grid_dimensions - 1).astype(numpy.int64)
+
+        # expected pairs number from the cells number and the average triangles in each grid cell
+        triangles_per_cell = len(self._cell_triangles) / float(numpy.prod(self._grid_dimensions))
+        pairs = (cells_max - cells_min + 1).prod(axis=1) * triangles_per_cell
+        brute_force = pairs > BRUTE_FORCE_RATIO * len(self._triangles)
+
+        self._search(points, pending[~brute_force], cells_min[~brute_force], cells_max[~brute_force],
+                     triangle_indices, weights, distances)
+        self._search_all(points, pending[brute_force], triangle_indices, weights, distances)
+
+        closest_points = self._get_positions(triangle_indices, weights)
+        return closest_points, triangle_indices, weights
+
+    def signed_distance(self, points):
+        """
+        get signed distances from given points to the triangles, positive is on the normals side,
+        the sign uses angle weighted pseudo normals, so it's stable when the closest point is on edges or vertices
+
+        Args:
+            points (list/numpy.ndarray): (M, 3) points positions
+
+        Returns:
+            distances (numpy.ndarray): (M,) signed distances
+        """
+        points = vector.to_array(points)
+        closest_points, triangle_indices, weights = self.closest_point(points)
+        pseudo_normals = self._get_pseudo_normals(triangle_indices, weights)
+        vectors = points - closest_points
+        distances = numpy.linalg.norm(vectors, axis=1)
+        signs = numpy.where(numpy.einsum('ni,ni->n', vectors, pseudo_normals) < 0, -1.0, 1.0)
+        return distances * signs
+
+    def _get_triangles_info(self):
+        """
+        precompute triangles' edge vectors, normals, areas and barycentric dot products
+        """
+        point_a, point_b, point_c = [self._points[self._triangles[:, i]] for i in range(3)]
+        self._point_a = point_a
+        self._vectors_ab = point_b - point_a
+        self._vectors_ac = point_c - point_a
+        vec_cross = vector.cross_product_batch(self._vectors_ab, self._vectors_ac, normalize=False)
+        lengths = vector.length_batch(vec_cross)
+        self._areas = lengths * 0.5
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            self._normals = vec_cross / lengths[:, None]
+
+        dot_00 = numpy.einsum('ni,ni->n', self._vectors_ab, self._vectors_ab)
+        dot_01 = numpy.einsum('ni,ni->n', self._vectors_ab, self._vectors_ac)
+        dot_11 = numpy.einsum('ni,ni->n', self._vectors_ac, self._vectors_ac)
+        self._barycentric_dots = numpy.stack([dot_00, dot_01, dot_11], axis=1)
+        with numpy.errstate(divide='ignore'):
+            self._barycentric_denom_inv = 1.0 / (dot_00 * dot_11 - dot_01 * dot_01)
+
+    def _build_grid(self):
+        """
+        bucket triangles into uniform grid cells by their bounding boxes
+        """
+        corners = self._points[self._triangles]
+        bounds_min = corners.min(axis=1)
+        bounds_max = corners.max(axis=1)
+        if not self._cell_size:
+            self._cell_size = max(float(numpy.mean((bounds_max - bounds_min).max(axis=1))), 1e-6)
+
+        self._grid_origin = bounds_min.min(axis=0)
+        self._grid_dimensions = numpy.floor((bounds_max.max(axis=0) - self._grid_origin) /
+                                            self._cell_size).astype(numpy.int64) + 1
+
+        cells_min = numpy.floor((bounds_min - self._grid_origin) / self._cell_size).astype(numpy.int64)
+        cells_max = numpy.floor((bounds_max - self._grid_origin) / self._cell_size).astype(numpy.int64)
+        triangle_indices, cell_keys = self._expand_cells(numpy.arange(len(self._triangles)), cells_min, cells_max)
+
+        order = numpy.argsort(cell_keys, kind='stable')
+        cell_keys = cell_keys[order]
+        self._cell_triangles = triangle_indices[order]
+        self._cell_keys, self._cell_starts = numpy.unique(cell_keys, return_index=True)
+        self._cell_starts = numpy.append(self._cell_starts, len(cell_keys))
+
+    def _expand_cells(self, indices, cells_min, cells_max):
+        """
+        expand each item's cell box to all the cells inside, cells are clipped to the grid
+
+        Args:
+            indices (numpy.ndarray): (K,) item indices
+            cells_min (numpy.ndarray): (K, 3) min cells
+            cells_max (numpy.ndarray): (K, 3) max cells, included
+
+        Returns:
+            item_indices (numpy.ndarray): item index for each cell
+            cell_keys (numpy.ndarray): linear cell keys
+        """
+        cells_min = numpy.clip(cells_min, 0, self._grid_dimensions - 1)
+        cells_max = numpy.clip(cells_max, 0, self._grid_dimensions - 1)
+        sizes = cells_max - cells_min + 1
+        counts = sizes.prod(axis=1)
+
+        item_indices = numpy.repeat(indices, counts)
+        # local index of each cell inside its item's box
+        local = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        sizes = numpy.repeat(sizes, counts, axis=0)
+        cells = numpy.repeat(cells_min, counts, axis=0)
+        cells[:, 0] += local % sizes[:, 0]
+        cells[:, 1] += (local // sizes[:, 0]) % sizes[:, 1]
+        cells[:, 2] += local // (sizes[:, 0] * sizes[:, 1])
+
+        dimensions = self._grid_dimensions
+        cell_keys = (cells[:, 2] * dimensions[1] + cells[:, 1]) * dimensions[0] + cells[:, 0]
+        return item_indices, cell_keys
+
+    def _search(self, points, point_indices, cells_min, cells_max, triangle_indices, weights, distances):
+        """
+        test given points against the triangles in their cell boxes, and update the closest results in place
+
+        Args:
+            points (numpy.ndarray): (M, 3) all query points
+            point_indices (numpy.ndarray): (K,) points need to be searched
+            cells_min (numpy.ndarray): (K, 3) min cells
+            cells_max (numpy.ndarray): (K, 3) max cells, included
+            triangle_indices (numpy.ndarray): (M,) closest triangle indices, updated in place
+            weights (numpy.ndarray): (M, 3) closest barycentric weights, updated in place
+            distances (numpy.ndarray): (M,) closest distances, updated in place
+        """
+        # get triangles in each searched cell
+        pair_points, cell_keys = self._expand_cells(point_indices, cells_min, cells_max)
+        slots = numpy.searchsorted(self._cell_keys, cell_keys)
+        slots = numpy.minimum(slots, len(self._cell_keys) - 1)
+        found = self._cell_keys[slots] == cell_keys
+        pair_points = pair_points[found]
+        slots = slots[found]
+
+        starts = self._cell_starts[slots]
+        counts = self._cell_starts[slots + 1] - starts
+        pair_points = numpy.repeat(pair_points, counts)
+        local = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        pair_triangles = self._cell_triangles[numpy.repeat(starts, counts) + local]
+        if not len(pair_points):
+            return
+
+        # triangles overlapping multiple cells are only tested once
+        pair_keys = numpy.unique(pair_points * len(self._triangles) + pair_triangles)
+        pair_points = pair_keys // len(self._triangles)
+        pair_triangles = pair_keys % len(self._triangles)
+
+        # closest point for each point and triangle pair
+        pair_weights = self._closest_point_pairs(points[pair_points], pair_triangles)
+        pair_positions = self._get_positions(pair_triangles, pair_weights)
+        pair_distances = numpy.linalg.norm(points[pair_points] - pair_positions, axis=1)
+
+        # keep the closest pair for each point
+        order = numpy.lexsort((pair_distances, pair_points))
+        pair_points = pair_points[order]
+        first = numpy.r_[True, pair_points[1:] != pair_points[:-1]]
+        order = order[first]
+        pair_points = pair_points[first]
+
+        closer = pair_distances[order] < distances[pair_points]
+        pair_points = pair_points[closer]
+        order = order[closer]
+        triangle_indices[pair_points] = pair_triangles[order]
+        weights[pair_points] = pair_weights[order]
+        distances[pair_points] = pair_distances[order]
+
+    def _search_all(self, points, point_indices, triangle_indices, weights, distances):
+        """
+        test given points against all triangles in chunks, and update the closest results in place
+
+        Args:
+            points (numpy.ndarray): (M, 3) all query points
+            point_indices (numpy.ndarray): (K,) points need to be searched
+            triangle_indices (numpy.ndarray): (M,) closest triangle indices, updated in place
+            weights (numpy.ndarray): (M, 3) closest barycentric weights, updated in place
+            distances (numpy.ndarray): (M,) closest distances, updated in place
+        """
+        triangle_count = len(self._triangles)
+        chunk_size = max(CHUNK_PAIRS // triangle_count, 1)
+        for start in range(0, len(point_indices), chunk_size):
+            chunk = point_indices[start: start + chunk_size]
+            pair_points = numpy.repeat(chunk, triangle_count)
+            pair_triangles = numpy.tile(numpy.arange(triangle_count), len(chunk))
+
+            pair_weights = self._closest_point_pairs(points[pair_points], pair_triangles)
+            pair_positions = self._get_positions(pair_triangles, pair_weights)
+            pair_distances = numpy.linalg.norm(points[pair_points] - pair_positions, axis=1)
+
+            # pairs are grouped by points, so the closest triangle is the argmin of each row
+            closest = numpy.argmin(pair_distances.reshape(len(chunk), triangle_count), axis=1)
+            order = numpy.arange(len(chunk)) * triangle_count + closest
+            triangle_indices[chunk] = closest
+            weights[chunk] = pair_weights[order]
+            distances[chunk] = pair_distances[order]
+
+    def _closest_point_pairs(self, points, triangle_indices):
+        """
+        get barycentric weights of the closest points on the triangles for point and triangle pairs,
+        checks the vertices, edges and face regions of each triangle
+
+        Args:
+            points (numpy.ndarray): (K, 3) points positions
+            triangle_indices (numpy.ndarray): (K,) triangle index for each point
+
+        Returns:
+            weights (numpy.ndarray): (K, 3) barycentric weight values, the sum is 1
+        """
+        vectors_ab = self._vectors_ab[triangle_indices]
+        vectors_ac = self._vectors_ac[triangle_indices]
+        vectors_ap = points - self._point_a[triangle_indices]
+        vectors_bp = vectors_ap - vectors_ab
+        vectors_cp = vectors_ap - vectors_ac
+
+        dot_1 = numpy.einsum('ni,ni->n', vectors_ab, vectors_ap)
+        dot_2 = numpy.einsum('ni,ni->n', vectors_ac, vectors_ap)
+        dot_3 = numpy.einsum('ni,ni->n', vectors_ab, vectors_bp)
+        dot_4 = numpy.einsum('ni,ni->n', vectors_ac, vectors_bp)
+        dot_5 = numpy.einsum('ni,ni->n', vectors_ab, vectors_cp)
+        dot_6 = numpy.einsum('ni,ni->n', vectors_ac, vectors_cp)
+        area_c = dot_1 * dot_4 - dot_3 * dot_2
+        area_b = dot_5 * dot_2 - dot_1 * dot_6
+        area_a = dot_3 * dot_6 - dot_5 * dot_4
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            # inside face
+            denom = 1.0 / (area_a + area_b + area_c)
+            v = area_b * denom
+            w = area_c * denom
+            weights = numpy.stack([1 - v - w, v, w], axis=1)
+
+            # regions are applied in reversed priority, so the vertices regions win over the edges regions
+            # edge bc
+            mask = (area_a <= 0) & (dot_4 - dot_3 >= 0) & (dot_5 - dot_6 >= 0)
+            w = (dot_4 - dot_3) / ((dot_4 - dot_3) + (dot_5 - dot_6))
+            weights[mask] = numpy.stack([numpy.zeros(len(w)), 1 - w, w], axis=1)[mask]
+            # edge ac
+            mask = (area_b <= 0) & (dot_2 >= 0) & (dot_6 <= 0)
+            w = dot_2 / (dot_2 - dot_6)
+            weights[mask] = numpy.stack([1 - w, numpy.zeros(len(w)), w], axis=1)[mask]
+            # vertex c
+            mask = (dot_6 >= 0) & (dot_5 <= dot_6)
+            weights[mask] = [0, 0, 1]
+            # edge ab
+            mask = (area_c <= 0) & (dot_1 >= 0) & (dot_3 <= 0)
+            v = dot_1 / (dot_1 - dot_3)
+            weights[mask] = numpy.stack([1 - v, v, numpy.zeros(len(v))], axis=1)[mask]
+            # vertex b
+            mask = (dot_3 >= 0) & (dot_4 <= dot_3)
+            weights[mask] = [0, 1, 0]
+            # vertex a
+            mask = (dot_1 <= 0) & (dot_2 <= 0)
+            weights[mask] = [1, 0, 0]
+
+        # degenerated triangles fall back to the first vertex
+        weights[~numpy.isfinite(weights).all(axis=1)] = [1, 0, 0]
+        return weights
+
+    def _get_positions(self, triangle_indices, weights):
+        """
+        get positions from triangles and barycentric weights
+
+        Args:
+            triangle_indices (numpy.ndarray): (K,) triangle indices
+            weights (numpy.ndarray): (K, 3) barycentric weights
+
+        Returns:
+            positions (numpy.ndarray): (K, 3) positions
+        """
+        return (self._point_a[triangle_indices] + self._vectors_ab[triangle_indices] * weights[:, 1:2] +
+                self._vectors_ac[triangle_indices] * weights[:, 2:3])
+
+    def _get_pseudo_normals(self, triangle_indices, weights):
+        """
+        get angle weighted pseudo normals at the closest points, face normal if it's inside the triangle,
+        edge normal if it's on an edge, and vertex normal if it's on a vertex
+
+        Args:
+            triangle_indices (numpy.ndarray): (K,) closest triangle indices
+            weights (numpy.ndarray): (K, 3) barycentric weights
+
+        Returns:
+            normals (numpy.ndarray): (K, 3) pseudo normals
+        """
+        if self._vertex_normals is None:
+            self._get_pseudo_normals_info()
+
+        normals = self._normals[triangle_indices].copy()
+        zeros = weights == 0
+
+        # on edge, the zero weight is the opposite vertex
+        on_edge = zeros.sum(axis=1) == 1
+        edge_slots = numpy.argmax(zeros[on_edge], axis=1)
+        edges = self._triangle_edges[triangle_indices[on_edge], edge_slots]
+        normals[on_edge] = self._edge_normals[edges]
+
+        # on vertex
+        on_vertex = zeros.sum(axis=1) == 2
+        vertex_slots = numpy.argmax(~zeros[on_vertex], axis=1)
+        vertices = self._triangles[triangle_indices[on_vertex], vertex_slots]
+        normals[on_vertex] = self._vertex_normals[vertices]
+
+        return normals
+
+    def _get_pseudo_normals_info(self):
+        """
+        compute angle weighted vertex normals and edge normals
+        """
+        normals = numpy.nan_to_num(self._normals)
+
+        # vertex normals weighted by each triangle's corner angle
+        self._vertex_normals = numpy.zeros_like(self._points)
+        for i in range(3):
+            vectors_a = self._points[self._triangles[:, (i + 1) % 3]] - self._points[self._triangles[:, i]]
+            vectors_b = self._points[self._triangles[:, (i + 2) % 3]] - self._points[self._triangles[:, i]]
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                cos_angles = (numpy.einsum('ni,ni->n', vectors_a, vectors_b) /
+                              (vector.length_batch(vectors_a) * vector.length_batch(vectors_b)))
+            angles = numpy.nan_to_num(numpy.arccos(numpy.clip(cos_angles, -1, 1)))
+            numpy.add.at(self._vertex_normals, self._triangles[:, i], normals * angles[:, None])
+
+        # edge normals, edge slot i is the edge opposite to vertex i
+        edges = numpy.stack([self._triangles[:, [1, 2]], self._triangles[:, [0, 2]], self._triangles[:, [0, 1]]],
+                            axis=1).reshape(-1, 2)
+        edges.sort(axis=1)
+        edge_keys, edge_indices = numpy.unique(edges[:, 0] * len(self._points) + edges[:, 1], return_inverse=True)
+        self._triangle_edges = edge_indices.reshape(-1, 3)
+        self._edge_normals = numpy.zeros((len(edge_keys), 3))
+        numpy.add.at(self._edge_normals, edge_indices, numpy.repeat(normals, 3, axis=0))
@@ -52,7 +52,8 @@ def length(vec):
         mathUtils.vector.length([5, 0, 0])
         # 5
     """
-    length_value = math.sqrt(math.pow(vec[0], 2) + math.pow(vec[1], 2) + math.pow(vec[2], 2))
+    # plain python is faster than numpy for a single vector
+    length_value = math.sqrt(vec[0] * vec[0] + vec[1] * vec[1] + vec[2] * vec[2])
     return length_value
 
 
@@ -72,11 +73,7 @@ def norm(vector):
         mathUtils.vector.norm([5, 0, 0])
         # [1, 0, 0]
     """
-    vector = numpy.array(vector)
-    scalar = numpy.linalg.norm(vector)
-    vector = vector / scalar
-
-    return vector.tolist()
+    return norm_batch(vector)[0].tolist()
 
 
 def reverse(vector, normalize=True):
@@ -158,8 +155,7 @@ def dot_product(vector_a, vector_b):
         mathUtils.vector.dot_product([1, 0, 0], [1, 2, 3])
         # 1
     """
-    val = numpy.dot(vector_a, vector_b)
-    return float(val)
+    return float(dot_product_batch(vector_a, vector_b)[0])
 
 
 def cross_product(vector_a, vector_b, normalize=True):
@@ -183,12 +179,7 @@ def cross_product(vector_a, vector_b, normalize=True):
         mathUtils.vector.cross_product([1, 0, 0], [1, 2, 3], normalize=True)
         # [ 0, -3,  2]
     """
-    output_vector = numpy.cross(vector_a, vector_b)
-    if normalize:
-        output_vector = norm(output_vector)
-    else:
-        output_vector = output_vector.tolist()
-    return output_vector
+    return cross_product_batch(vector_a, vector_b, normalize=normalize)[0].tolist()
 
 
 def project_onto_plane(vector, normal, normalize=True):
@@ -213,15 +204,7 @@ def project_onto_plane(vector, normal, normalize=True):
         mathUtils.vector.project_onto_plane([1, 0, 0], [2, 2, 3], normalize=True)
         # [-3, -4, -6]
     """
-    dot_val = dot_product(vector, normal)
-    vector = numpy.array(vector)
-    normal = numpy.array(normal)
-    project_vector = vector - dot_val * normal
-    if normalize:
-        project_vector = norm(project_vector)
-    else:
-        project_vector = project_vector.tolist()
-    return project_vector
+    return project_onto_plane_batch(vector, normal, normalize=normalize)[0].tolist()
 
 
 def coordinate_system(vector_x, vector_y, reference=None):
@@ -251,18 +234,181 @@ def coordinate_system(vector_x, vector_y, reference=None):
         # [0.0, -0.5547001962252291, -0.8320502943378437],
         # [-0.0, 0.8320502943378437, -0.5547001962252291]
     """
-    vector_x = norm(vector_x)
-    vector_z = cross_product(vector_x, vector_y, normalize=True)
+    vectors = coordinate_system_batch(vector_x, vector_y, reference=reference)
+    return vectors[0][0].tolist(), vectors[1][0].tolist(), vectors[2][0].tolist()
+
+
+# batch function
+# batch functions work on (N, 3) float64 arrays without python loops,
+# a single vector is broadcast against the other inputs, and out can be given to write the result in place
+def to_array(vectors):
+    """
+    convert vectors to a (N, 3) float64 array, numpy arrays are not copied
+
+    Args:
+        vectors (list/numpy.ndarray): a vector or a list/array of vectors
+
+    Returns:
+        vectors_array (numpy.ndarray): (N, 3) array
+    """
+    return numpy.asarray(vectors, dtype=numpy.float64).reshape(-1, 3)
+
+
+def create_batch(points_a, points_b, normalize=True, out=None):
+    """
+    create vectors from points_a to points_b
+
+    Args:
+        points_a (list/numpy.ndarray): (N, 3) start points
+        points_b (list/numpy.ndarray): (N, 3) end points
+        normalize (bool): normalize the output vectors if True, default is True
+        out (numpy.ndarray): (N, 3) array to store the output vectors, default is None
+
+    Returns:
+        vectors (numpy.ndarray): (N, 3) vectors
+
+    Examples:
+        import numpy
+        import utils.common.timeUtils as timeUtils
+        import utils.common.mathUtils as mathUtils
+
+        points_a = numpy.random.rand(100000, 3)
+        points_b = numpy.random.rand(100000, 3)
+        with timeUtils.Timer('vector.create_batch'):
+            mathUtils.vector.create_batch(points_a, points_b)
+
+        list_a = points_a.tolist()
+        list_b = points_b.tolist()
+        with timeUtils.Timer('vector.create'):
+            for point_a, point_b in zip(list_a, list_b):
+                mathUtils.vector.create(point_a, point_b)
+
+        timeUtils.get_report(['vector.create_batch', 'vector.create'])
+    """
+    vectors = numpy.subtract(to_array(points_b), to_array(points_a), out=out)
+    if normalize:
+        vectors = norm_batch(vectors, out=vectors)
+    return vectors
+
+
+def length_batch(vectors, out=None):
+    """
+    get vectors' lengths
+
+    Args:
+        vectors (list/numpy.ndarray): (N, 3) vectors
+        out (numpy.ndarray): (N,) array to store the output lengths, default is None
+
+    Returns:
+        lengths (numpy.ndarray): (N,) lengths
+    """
+    vectors = to_array(vectors)
+    return numpy.sqrt(numpy.einsum('ni,ni->n', vectors, vectors), out=out)
+
+
+def norm_batch(vectors, out=None):
+    """
+    normalize vectors
+
+    Args:
+        vectors (list/numpy.ndarray): (N, 3) vectors
+        out (numpy.ndarray): (N, 3) array to store the normalized vectors, can be the input array, default is None
+
+    Returns:
+        vectors (numpy.ndarray): (N, 3) normalized vectors
+    """
+    vectors = to_array(vectors)
+    return numpy.divide(vectors, length_batch(vectors)[:, None], out=out)
+
+
+def dot_product_batch(vectors_a, vectors_b, out=None):
+    """
+    dot products between vectors
+
+    Args:
+        vectors_a (list/numpy.ndarray): (N, 3) vectors
+        vectors_b (list/numpy.ndarray): (N, 3) vectors
+        out (numpy.ndarray): (N,) array to store the output values, default is None
+
+    Returns:
+        values (numpy.ndarray): (N,) dot values
+    """
+    vectors_a, vectors_b = numpy.broadcast_arrays(to_array(vectors_a), to_array(vectors_b))
+    return numpy.einsum('ni,ni->n', vectors_a, vectors_b, out=out)
+
+
+def cross_product_batch(vectors_a, vectors_b, normalize=True, out=None):
+    """
+    cross products between vectors
+
+    Args:
+        vectors_a (list/numpy.ndarray): (N, 3) vectors
+        vectors_b (list/numpy.ndarray): (N, 3) vectors
+        normalize (bool): normalize the output vectors, default is True
+        out (numpy.ndarray): (N, 3) array to store the output vectors, can be one of the inputs, default is None
+
+    Returns:
+        vectors (numpy.ndarray): (N, 3) vectors
+    """
+    vectors_a = to_array(vectors_a)
+    vectors_b = to_array(vectors_b)
+    # fancy indexing copies the inputs, so out can be one of the inputs
+    vectors = numpy.subtract(vectors_a[:, [1, 2, 0]] * vectors_b[:, [2, 0, 1]],
+                             vectors_a[:, [2, 0, 1]] * vectors_b[:, [1, 2, 0]], out=out)
+    if normalize:
+        vectors = norm_batch(vectors, out=vectors)
+    return vectors
+
+
+def project_onto_plane_batch(vectors, normals, normalize=True, out=None):
+    """
+    project vectors onto planes, vector - (vector.normal)*normal
+
+    Args:
+        vectors (list/numpy.ndarray): (N, 3) vectors need to be projected
+        normals (list/numpy.ndarray): (N, 3) planes' normal vectors, must be normalized
+        normalize (bool): normalize the output vectors, default is True
+        out (numpy.ndarray): (N, 3) array to store the output vectors, can be the input vectors, default is None
+
+    Returns:
+        vectors (numpy.ndarray): (N, 3) projected vectors
+    """
+    vectors = to_array(vectors)
+    normals = to_array(normals)
+    dot_values = dot_product_batch(vectors, normals)
+    vectors = numpy.subtract(vectors, dot_values[:, None] * normals, out=out)
+    if normalize:
+        vectors = norm_batch(vectors, out=vectors)
+    return vectors
+
+
+def coordinate_system_batch(vectors_x, vectors_y, reference=None):
+    """
+    build coordinate systems base on the given primary and secondary vectors
+
+    Args:
+        vectors_x (list/numpy.ndarray): (N, 3) primary vectors
+        vectors_y (list/numpy.ndarray): (N, 3) secondary vectors
+        reference (list/numpy.ndarray): reference coordinate systems to avoid flipping,
+                                        [vectors_x, vectors_y, vectors_z], each item is a vector or (N, 3) vectors,
+                                        default is None
+
+    Returns:
+        vectors_x (numpy.ndarray): (N, 3) vectors
+        vectors_y (numpy.ndarray): (N, 3) vectors
+        vectors_z (numpy.ndarray): (N, 3) vectors
+    """
+    vectors_x, vectors_y = numpy.broadcast_arrays(to_array(vectors_x), to_array(vectors_y))
+    vectors_x = norm_batch(vectors_x)
+    vectors_z = cross_product_batch(vectors_x, vectors_y, normalize=True)
 
-    if reference:
-        # get z projected vector on reference plane (yz), so use x as normal
-        project_vec = project_onto_plane(vector_z, reference[0], normalize=True)
-        # dot product to check the angle between the project vector and reference z vector
-        # if value lesser than 0, means the current system is flipping, reverse the z vector
-        dot_val = dot_product(project_vec, reference[2])
-        if dot_val < 0:
-            vector_z = reverse(vector_z)
+    if reference is not None:
+        # get z projected vectors on reference planes (yz), so use x as normal
+        project_vectors = project_onto_plane_batch(vectors_z, reference[0], normalize=True)
+        # if the projected vector and reference z vector are opposite, the current system is flipping
+        flip = dot_product_batch(project_vectors, reference[2]) < 0
+        vectors_z[flip] *= -1
 
-    vector_y = cross_product(vector_z, vector_x, normalize=True)
+    vectors_y = cross_product_batch(vectors_z, vectors_x, normalize=True)
 
-    return vector_x, vector_y, vector_z
+    return vectors_x, vectors_y, vectors_z
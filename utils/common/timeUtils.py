@@ -0,0 +1,111 @@
+# import python library
+import time
+import functools
+import collections
+
+# constant
+# elapsed time aggregates for each timer name, [count, total, min, max],
+# only running aggregates are kept so timing hot functions doesn't grow memory
+RECORDS = collections.OrderedDict()
+
+
+# class
+class Timer(object):
+    """
+    context manager to record the elapsed time of a code block
+
+    Examples:
+        import utils.common.timeUtils as timeUtils
+
+        with timeUtils.Timer('skinCluster.create_batch'):
+            do_something()
+
+        timeUtils.get_report()
+        # {'skinCluster.create_batch': {'count': 1, 'total': 0.12, 'average': 0.12, 'min': 0.12, 'max': 0.12}}
+    """
+    def __init__(self, name):
+        self._name = name
+        self._start = None
+        self.elapsed = 0
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.elapsed = time.time() - self._start
+        record = RECORDS.get(self._name)
+        if record is None:
+            RECORDS[self._name] = [1, self.elapsed, self.elapsed, self.elapsed]
+        else:
+            record[0] += 1
+            record[1] += self.elapsed
+            record[2] = min(record[2], self.elapsed)
+            record[3] = max(record[3], self.elapsed)
+
+
+# function
+def timer(name=None):
+    """
+    decorator to record the decorated function's elapsed time every time it is called
+
+    Args:
+        name (str): timer name, default is the function's module and name
+
+    Examples:
+        import utils.common.timeUtils as timeUtils
+
+        @timeUtils.timer()
+        def create_batch(geos, influence_objects):
+            ...
+    """
+    def decorator(func):
+        timer_name = name or '{0}.{1}'.format(func.__module__.split('.')[-1], func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Timer(timer_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_report(names=None):
+    """
+    get recorded elapsed time summary
+
+    Args:
+        names (str/list): only report the given timer names, default is None
+
+    Returns:
+        report (dict): each timer's count, total, average, min and max time in seconds
+    """
+    if isinstance(names, basestring):
+        names = [names]
+    report = collections.OrderedDict()
+    for timer_name, record in RECORDS.iteritems():
+        if names and timer_name not in names:
+            continue
+        count, total, time_min, time_max = record
+        report.update({timer_name: {'count': count,
+                                    'total': total,
+                                    'average': total / count,
+                                    'min': time_min,
+                                    'max': time_max}})
+    return report
+
+
+def reset(names=None):
+    """
+    remove recorded elapsed time
+
+    Args:
+        names (str/list): only remove the given timer names, default is None, which removes all records
+    """
+    if not names:
+        RECORDS.clear()
+        return
+    if isinstance(names, basestring):
+        names = [names]
+    for timer_name in names:
+        RECORDS.pop(timer_name, None)
@@ -4,6 +4,7 @@ import maya.cmds as cmds
 # import utils
 import namingUtils
 import apiUtils
+import mathUtils
 import attributeUtils
 import hierarchyUtils
 import utils.modeling.curveUtils as curveUtils
@@ -83,7 +84,7 @@ def offset_group(node, name):
 
 
 def create_along_curve(curve, number, node_type='group', additional_description=None, aim_vector=None, up_vector=None,
-                       up_curve=None, aim_type='tangent', flip_check=True, parent_node=None):
+                       up_curve=None, aim_type='tangent', flip_check=True, parent_node=None, parallel_transport=False):
     """
     create transform nodes evenly along given curve
     Args:
@@ -98,13 +99,16 @@ def create_along_curve(curve, number, node_type='group', additional_description=
                         will be either based on curve's tangent or aim to the next point, default is tangent
         flip_check (bool): will automatically fix flipping transform if set to True, default is True
         parent_node (str): parent transform nodes under the given node
+        parallel_transport (bool): carry the first frame along the curve with the minimal rotation between points,
+                                   which doesn't flip or twist, only works without up curve, default is False
 
     Returns:
         transform_nodes (list): transform nodes along given curve
     """
     # get matrices
     matrices = curveUtils.get_matrices(curve, number, aim_vector=aim_vector, up_vector=up_vector, up_curve=up_curve,
-                                       aim_type=aim_type, flip_check=flip_check)
+                                       aim_type=aim_type, flip_check=flip_check,
+                                       parallel_transport=parallel_transport)
 
     # check naming convention
     name_check = namingUtils.check(curve)
@@ -230,10 +234,11 @@ def _snap_node_position(node, position, rotate_order=0, translate=True, rotate=T
             else:
                 # get node's rotate order first
                 ro_node = cmds.getAttr(node + '.rotateOrder')
-                # set rotation with given rotate order
-                cmds.xform(node, rotation=position[1], worldSpace=True, rotateOrder=ro[rotate_order])
-                # set back node's rotate order, and preserve overall rotation
-                cmds.xform(node, rotateOrder=ro[ro_node])
+                # convert rotation to node's rotate order, so it only needs to be set once
+                rotation = position[1]
+                if ro_node != rotate_order:
+                    rotation = mathUtils.matrix.reorder_euler(rotation, rotate_order, ro_node)[0].tolist()
+                cmds.xform(node, rotation=rotation, worldSpace=True, rotateOrder=ro[ro_node])
 
         if len(position) > 2 and position[2] and scale:
             if isinstance(position[2], basestring):
@@ -1,3 +1,6 @@
+# import external library
+import numpy
+
 # import maya python library
 import maya.cmds as cmds
 import maya.api.OpenMaya as OpenMaya2
@@ -8,6 +11,11 @@ import utils.common.apiUtils as apiUtils
 import utils.common.attributeUtils as attributeUtils
 import utils.common.hierarchyUtils as hierarchyUtils
 
+# constant
+# display attributes kept when a curve shape is rebuilt
+DISPLAY_ATTRS = ['overrideEnabled', 'overrideDisplayType', 'overrideRGBColors', 'overrideColor', 'overrideColorRGB',
+                 'lineWidth', 'alwaysDrawOnTop']
+
 
 # function
 def create(name, control_vertices, knots, degree=1, form=1, parent=None):
@@ -66,16 +74,18 @@ def get_info(curve):
     return curve_info
 
 
-def get_shape_info(curve):
+def get_shape_info(curve, as_numpy=False):
     """
     get curve's shape info
 
     Args:
         curve (str): curve's shape node or transform node
+        as_numpy (bool): return control vertices as float (N, 3) and knots as numpy arrays instead of lists,
+                         default is False
 
     Returns:
         curve_info (dict): curve shape information
-                           include control_vertices, knots, degree, form
+                           include num_cvs, control_vertices, knots, degree, form
     """
     # get MFnNurbsCurve
     mfn_crv = get_MFnNurbsCurve(curve)
@@ -86,12 +96,17 @@ def get_shape_info(curve):
     degree = mfn_crv.degree
     form = mfn_crv.form
 
-    control_vertices = apiUtils.MArray.to_list(cv_array)
+    if as_numpy:
+        control_vertices = apiUtils.MArray.to_numpy(cv_array)
+        knots = apiUtils.MArray.to_numpy(knots_array)
+    else:
+        control_vertices = apiUtils.MArray.to_list(cv_array)
+        knots = apiUtils.MArray.to_list(knots_array)
     num_cvs = len(control_vertices)
 
     curve_info = {'num_cvs': num_cvs,
                   'control_vertices': control_vertices,
-                  'knots': apiUtils.MArray.to_list(knots_array),
+                  'knots': knots,
                   'degree': degree,
                   'form': form}
 
@@ -113,6 +128,69 @@ def set_points(curve, points):
 
     # set pos
     m_curve.setCVPositions(pnt_array)
+    m_curve.updateCurve()
+
+
+def update_shape(curve, control_vertices, knots, degree=1, form=1):
+    """
+    update curve shape with given information,
+    cvs and knots are set in place if the curve has the same degree, form and cvs number,
+    otherwise the shape will be rebuilt under the same transform, with name, connections and display settings kept
+
+    Args:
+        curve (str): curve's shape node or transform node
+        control_vertices (list): control vertices position list
+        knots (list): curve shape's knots information
+        degree (int): curve shape's degree, default is 1
+        form (int): curve's form, default is 1
+
+    Returns:
+        shape_name (str): curve's shape name
+        rebuilt (bool): True if the shape is rebuilt
+    """
+    mfn_crv = get_MFnNurbsCurve(curve)
+    shape = mfn_crv.partialPathName()
+
+    if (mfn_crv.degree == degree and mfn_crv.form == form and mfn_crv.numCVs == len(control_vertices) and
+            mfn_crv.numKnots == len(knots)):
+        # same topology, edit in place
+        mfn_crv.setCVPositions(OpenMaya2.MPointArray(control_vertices), OpenMaya2.MSpace.kObject)
+        mfn_crv.setKnots(knots, 0, len(knots) - 1)
+        mfn_crv.updateCurve()
+        return shape, False
+
+    # get connections and display settings
+    connections_in = cmds.listConnections(shape, source=True, destination=False, plugs=True,
+                                          connections=True) or []
+    connections_out = cmds.listConnections(shape, source=False, destination=True, plugs=True,
+                                           connections=True) or []
+    display_settings = []
+    for attr in DISPLAY_ATTRS:
+        attr_path = '{0}.{1}'.format(shape, attr)
+        if cmds.objExists(attr_path):
+            display_settings.append([attr, cmds.getAttr(attr_path)])
+
+    # rebuild shape under the same transform
+    transform = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+    m_obj_parent = apiUtils.MSelectionList.get_nodes_info(transform, info_type='MObject')[0]
+    cmds.delete(shape)
+    m_obj = OpenMaya2.MFnNurbsCurve().create(control_vertices, knots, degree, form, False, True, m_obj_parent)
+    shape_new = OpenMaya2.MDagPath.getAPathTo(m_obj).partialPathName()
+    shape = cmds.rename(shape_new, shape.split('|')[-1])
+
+    # set back display settings and connections
+    for attr, value in display_settings:
+        attr_path = '{0}.{1}'.format(shape, attr)
+        if isinstance(value, list):
+            cmds.setAttr(attr_path, *value[0])
+        else:
+            cmds.setAttr(attr_path, value)
+    for plug_shape, plug_source in zip(connections_in[::2], connections_in[1::2]):
+        cmds.connectAttr(plug_source, '{0}.{1}'.format(shape, plug_shape.split('.', 1)[-1]), force=True)
+    for plug_shape, plug_destination in zip(connections_out[::2], connections_out[1::2]):
+        cmds.connectAttr('{0}.{1}'.format(shape, plug_shape.split('.', 1)[-1]), plug_destination, force=True)
+
+    return shape, True
 
 
 def set_display_setting(curve, display_type='normal', color=None):
@@ -147,7 +225,7 @@ def get_color(curve):
 
 def get_closest_point(curve, position):
     """
-    get closest point position and parameter on given curve
+    get closest point position and parameter on given curve, use get_closest_points for many positions
 
     Args:
         curve (str): nurbs curve
@@ -170,6 +248,62 @@ def get_closest_point(curve, position):
     return [m_point.x, m_point.y, m_point.z], parameter
 
 
+def get_closest_points(curve, positions, space='world'):
+    """
+    get closest points positions and parameters on given curve for all given positions in one batch,
+    it evaluates the curve with numpy instead of querying maya for each position
+
+    the results are only checked against brute force sampling headless, not against MFnNurbsCurve.closestPoint yet,
+    tests/test_curve_closest_point_maya.py compares them to 1e-6 and only runs in a maya session,
+    its speed against querying the api for each position hasn't been measured either
+
+    Args:
+        curve (str): nurbs curve
+        positions (list/numpy.ndarray): (N, 3) given positions
+        space (str): world/object, positions' space, default is world
+
+    Returns:
+        closest_points (numpy.ndarray): (N, 3) closest points positions on curve
+        parameters (numpy.ndarray): (N,) closest points' parameters on curve
+
+    Examples:
+        import maya.cmds as cmds
+        import utils.modeling.curveUtils as curveUtils
+
+        positions = [cmds.xform(node, query=True, translation=True, worldSpace=True) for node in nodes]
+        closest_points, parameters = curveUtils.get_closest_points('spine_curve', positions)
+    """
+    return get_nurbs_curve(curve, space=space).closest_point(positions)
+
+
+def get_nurbs_curve(curve, space='object'):
+    """
+    get numpy nurbs curve from given curve, it can be evaluated without maya
+
+    Args:
+        curve (str): nurbs curve
+        space (str): world/object, control vertices' space, default is object
+
+    Returns:
+        nurbs_curve (mathUtils.nurbsCurve.NurbsCurve)
+    """
+    if space == 'world':
+        space = OpenMaya2.MSpace.kWorld
+    else:
+        space = OpenMaya2.MSpace.kObject
+
+    mfn_crv = get_MFnNurbsCurve(curve)
+    # cvs come with their weights in w, keep all 4 components to read the weights for rational curves
+    control_vertices = numpy.array(mfn_crv.cvPositions(space), dtype=float).reshape(-1, 4)
+    knots = apiUtils.MArray.to_numpy(mfn_crv.knots())
+
+    weights = control_vertices[:, 3]
+    if numpy.allclose(weights, 1):
+        weights = None
+    return mathUtils.nurbsCurve.NurbsCurve(control_vertices[:, :3], knots, degree=mfn_crv.degree, form=mfn_crv.form,
+                                           weights=weights)
+
+
 def get_point(curve, parameter, space='world'):
     """
     get point information (position, tangent) on given parameter
@@ -208,29 +342,12 @@ def get_points(curve, number, space='world'):
         parameters (list): parameters on curve
         tangents (list): points tangent vectors list
     """
-    mfn_curve = get_MFnNurbsCurve(curve)
-    # get curve length
-    length = mfn_curve.length()
-    # get length per section
-    length_section = float(length) / (number - 1)
-
-    # loop in each point
-    positions = []
-    parameters = []
-    tangents = []
-    for i in range(number):
-        parameter = mfn_curve.findParamFromLength(i * length_section)
-        # get point on parameter
-        point, tangent = get_point(curve, parameter, space=space)
-        # add to list
-        positions.append(point)
-        parameters.append(parameter)
-        tangents.append(tangent)
-
-    return positions, parameters, tangents
-
-
-def get_matrices(curve, number, aim_vector=None, up_vector=None, up_curve=None, aim_type='tangent', flip_check=True):
+    positions, parameters, tangents = CurveEvaluator(curve, space=space).get_points(number)
+    return positions.tolist(), parameters.tolist(), tangents.tolist()
+
+
+def get_matrices(curve, number, aim_vector=None, up_vector=None, up_curve=None, aim_type='tangent', flip_check=True,
+                 parallel_transport=False):
     """
     get matrices along the given curve uniformly
 
@@ -243,72 +360,16 @@ def get_matrices(curve, number, aim_vector=None, up_vector=None, up_curve=None,
         aim_type (str): tangent/next, aim type for each point,
                         will be either based on curve's tangent or aim to the next point, default is tangent
         flip_check (bool): will automatically fix flipping transform if set to True, default is True
+        parallel_transport (bool): carry the first frame along the curve with the minimal rotation between points,
+                                   which doesn't flip or twist, only works without up curve, default is False
 
     Returns:
         matrices (list): list of output matrices
     """
-    # get aim vector
-    if not aim_vector:
-        aim_vector = [1, 0, 0]
-    # get up vector
-    if not up_vector:
-        up_vector = [0, 1, 0]
-
-    # get points info on curve
-    positions, parameters, tangents = get_points(curve, number)
-    # loop in each position, and get matrix, skip the last one for now
-    matrices = []
-    reference_vectors = None
-    for i, pos in enumerate(positions):
-        # get target vector
-        if aim_type == 'tangent':
-            target_vector = tangents[i]
-        elif i < number - 1:
-            target_vector = mathUtils.vector.create(pos, positions[i + 1])
-        else:
-            target_vector = mathUtils.vector.create(positions[i - 1], pos)
-
-        # get rotation vectors
-        if not up_curve:
-            # use quaternion rotation match the target vector
-            # get target vector and aim vector as MVector
-            m_aim = OpenMaya2.MVector(aim_vector)
-            m_target = OpenMaya2.MVector(target_vector)
-            # rotate to match target vector
-            m_quaternion = m_aim.rotateTo(m_target)
-            # convert to MMatrix
-            m_matrix = m_quaternion.asMatrix()
-            # update translation
-            m_matrix.setElement(3, 0, pos[0])
-            m_matrix.setElement(3, 1, pos[1])
-            m_matrix.setElement(3, 2, pos[2])
-            # convert to list
-            matrix = apiUtils.MMatrix.to_list(m_matrix)
-        else:
-            # get point on up curve
-            up_pos, up_tangent = get_point(up_curve, parameters[i])
-            # get up vector
-            aim_up_vector = mathUtils.vector.create(pos, up_pos)
-            # get coordinate vectors
-            vectors = mathUtils.vector.coordinate_system(target_vector, aim_up_vector, reference=reference_vectors)
-
-            if flip_check:
-                # override reference vectors with current ones for flip check
-                reference_vectors = vectors
-            # compose matrix
-            matrix_aim = mathUtils.matrix.four_by_four_matrix(vectors[0], vectors[1], vectors[2], pos,
-                                                              output_type='numpy')
-            # get aim vector's matrix
-            vectors_local = mathUtils.vector.coordinate_system(aim_vector, up_vector)
-            matrix_local = mathUtils.matrix.four_by_four_matrix(vectors_local[0], vectors_local[1], vectors_local[2],
-                                                                [0, 0, 0], output_type='numpy')
-            # get inverse local matrix
-            matrix_local_inverse = mathUtils.matrix.inverse(matrix_local, output_type='numpy')
-            # multiply to get output matrix
-            matrix = mathUtils.matrix.multiply(matrix_local_inverse, matrix_aim, output_type='list')
-        # append matrix to list
-        matrices.append(matrix)
-    return matrices
+    matrices = CurveEvaluator(curve).get_matrices(number, aim_vector=aim_vector, up_vector=up_vector,
+                                                  up_curve=up_curve, aim_type=aim_type, flip_check=flip_check,
+                                                  parallel_transport=parallel_transport)
+    return mathUtils.matrix.to_list(matrices)
 
 
 def get_MFnNurbsCurve(curve):
@@ -331,3 +392,160 @@ def get_MFnNurbsCurve(curve):
     mfn_crv = OpenMaya2.MFnNurbsCurve(dag_path)
 
     return mfn_crv
+
+
+# class
+class CurveEvaluator(object):
+    """
+    curve evaluator for sampling many points on the same curve,
+    the MFnNurbsCurve is resolved once, and samples are returned as numpy arrays
+
+    Args:
+        curve (str): curve's shape node or transform node
+        space (str): world/object, default is world
+
+    Examples:
+        import utils.modeling.curveUtils as curveUtils
+
+        evaluator = curveUtils.CurveEvaluator('spine_curve')
+        positions, parameters, tangents = evaluator.get_points(20)
+        # flip free frames along the curve
+        matrices = evaluator.get_matrices(20, parallel_transport=True)
+    """
+    def __init__(self, curve, space='world'):
+        self._curve = curve
+        self._mfn_curve = get_MFnNurbsCurve(curve)
+        self._space_name = space
+        if space == 'world':
+            self._space = OpenMaya2.MSpace.kWorld
+        else:
+            self._space = OpenMaya2.MSpace.kObject
+
+    @property
+    def curve(self):
+        return self._curve
+
+    @property
+    def length(self):
+        return self._mfn_curve.length()
+
+    def get_parameters(self, lengths):
+        """
+        get parameters at the given arc lengths from the curve start
+
+        Args:
+            lengths (list/numpy.ndarray): (N,) arc lengths
+
+        Returns:
+            parameters (numpy.ndarray): (N,) parameters
+        """
+        return numpy.array([self._mfn_curve.findParamFromLength(length) for length in numpy.ravel(lengths)])
+
+    def get_lengths(self, parameters):
+        """
+        get arc lengths from the curve start at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+
+        Returns:
+            lengths (numpy.ndarray): (N,) arc lengths
+        """
+        return numpy.array([self._mfn_curve.findLengthFromParam(parameter) for parameter in numpy.ravel(parameters)])
+
+    def get_uniform_parameters(self, number):
+        """
+        get parameters evenly distributed by arc length, include the curve start and end
+
+        Args:
+            number (int): parameters number
+
+        Returns:
+            parameters (numpy.ndarray): (N,) parameters
+        """
+        return self.get_parameters(numpy.linspace(0, self.length, number))
+
+    def get_positions(self, parameters):
+        """
+        get positions at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+
+        Returns:
+            positions (numpy.ndarray): (N, 3) positions
+        """
+        positions = numpy.empty((numpy.size(parameters), 3))
+        for i, parameter in enumerate(numpy.ravel(parameters)):
+            m_point = self._mfn_curve.getPointAtParam(parameter, space=self._space)
+            positions[i] = [m_point.x, m_point.y, m_point.z]
+        return positions
+
+    def get_tangents(self, parameters):
+        """
+        get normalized tangents at the given parameters
+
+        Args:
+            parameters (list/numpy.ndarray): (N,) parameters
+
+        Returns:
+            tangents (numpy.ndarray): (N, 3) tangents
+        """
+        tangents = numpy.empty((numpy.size(parameters), 3))
+        for i, parameter in enumerate(numpy.ravel(parameters)):
+            m_vector = self._mfn_curve.tangent(parameter, space=self._space)
+            tangents[i] = [m_vector.x, m_vector.y, m_vector.z]
+        return mathUtils.vector.norm_batch(tangents, out=tangents)
+
+    def get_points(self, number):
+        """
+        get points evenly on curve by arc length
+
+        Args:
+            number (int): points number
+
+        Returns:
+            positions (numpy.ndarray): (N, 3) positions
+            parameters (numpy.ndarray): (N,) parameters
+            tangents (numpy.ndarray): (N, 3) normalized tangents
+        """
+        parameters = self.get_uniform_parameters(number)
+        return self.get_positions(parameters), parameters, self.get_tangents(parameters)
+
+    def get_matrices(self, number, aim_vector=None, up_vector=None, up_curve=None, aim_type='tangent',
+                     flip_check=True, parallel_transport=False):
+        """
+        get matrices evenly along the curve, frames are computed for all points together
+
+        Args:
+            number (int): matrices number
+            aim_vector (list): the vector aim to the next point, default is [1, 0, 0]
+            up_vector (list): up vector for aiming, only used with up curve, default is [0, 1, 0]
+            up_curve (str): if need points up vectors to aim to a specific curve
+            aim_type (str): tangent/next, aim type for each point,
+                            will be either based on curve's tangent or aim to the next point, default is tangent
+            flip_check (bool): will automatically fix flipping transform if set to True, default is True
+            parallel_transport (bool): carry the first frame along the curve with the minimal rotation between points,
+                                       which doesn't flip or twist, only works without up curve, default is False
+
+        Returns:
+            matrices (numpy.ndarray): (N, 4, 4) matrices
+        """
+        positions, parameters, tangents = self.get_points(number)
+
+        # get target vectors
+        if aim_type == 'tangent':
+            target_vectors = tangents
+        else:
+            # aim to the next point, the last one keeps the previous direction
+            target_vectors = numpy.diff(positions, axis=0)
+            target_vectors = numpy.vstack((target_vectors, target_vectors[-1:]))
+
+        # get up vectors aim to the up curve points at the same parameters
+        up_vectors = None
+        if up_curve:
+            up_vectors = CurveEvaluator(up_curve, space=self._space_name).get_positions(parameters) - positions
+
+        return mathUtils.matrix.frames_batch(positions, target_vectors, aim_vector=aim_vector, up_vector=up_vector,
+                                             up_vectors=up_vectors, flip_check=flip_check,
+                                             parallel_transport=parallel_transport)
@@ -1,3 +1,5 @@
+import numpy
+
 import maya.cmds as cmds
 import maya.api.OpenMaya as OpenMaya2
 
@@ -5,16 +7,19 @@ import utils.common.apiUtils as apiUtils
 import utils.common.mathUtils as mathUtils
 
 
-def get_shape_info(mesh):
+def get_shape_info(mesh, as_numpy=False):
     """
     get mesh's shape info
 
     Args:
         mesh (str): mesh's shape node or transform node
+        as_numpy (bool): return points and polygons info as numpy arrays instead of lists, default is False,
+                         points_array will be float (N, 3), poly_count_array and poly_connects will be int32,
+                         it's much faster and lighter on dense meshes
 
     Returns:
         mesh_info (dict): mesh shape information
-                          include control_vertices, knots, degree, form
+                          include num_vertices, num_polygons, points_array, poly_count_array, poly_connects
     """
     # get MFnMesh
     mfn_mesh = get_MFnMesh(mesh)
@@ -24,18 +29,28 @@ def get_shape_info(mesh):
     points_array = mfn_mesh.getPoints(space=OpenMaya2.MSpace.kObject)
     poly_count_array, poly_connects = mfn_mesh.getVertices()
 
+    if as_numpy:
+        points_array = apiUtils.MArray.to_numpy(points_array)
+        poly_count_array = apiUtils.MArray.to_numpy(poly_count_array, dtype=numpy.int32)
+        poly_connects = apiUtils.MArray.to_numpy(poly_connects, dtype=numpy.int32)
+    else:
+        points_array = apiUtils.MArray.to_list(points_array)
+        poly_count_array = apiUtils.MArray.to_list(poly_count_array)
+        poly_connects = apiUtils.MArray.to_list(poly_connects)
+
     mesh_info = {'num_vertices': num_vertices,
                  'num_polygons': num_polygons,
-                 'points_array': apiUtils.MArray.to_list(points_array),
-                 'poly_count_array': apiUtils.MArray.to_list(poly_count_array),
-                 'poly_connects': apiUtils.MArray.to_list(poly_connects)}
+                 'points_array': points_array,
+                 'poly_count_array': poly_count_array,
+                 'poly_connects': poly_connects}
 
     return mesh_info
 
 
 def ray_casting_intersection_closest(mesh, point, direction, radius=1, both_direction=False):
     """
-    ray casting from given point and direction to get the closest intersection point on mesh
+    ray casting from given point and direction to get the closest intersection point on mesh,
+    use MeshIntersector to cast many rays against the same mesh
 
     Args:
         mesh (str): mesh name
@@ -73,7 +88,8 @@ def ray_casting_intersection_closest(mesh, point, direction, radius=1, both_dire
 
 def ray_casting_intersection_all(mesh, point, direction, radius=1, both_direction=False):
     """
-    ray casting from given point and direction to get intersection points on mesh
+    ray casting from given point and direction to get intersection points on mesh,
+    use MeshIntersector to cast many rays against the same mesh
 
     Args:
         mesh (str): mesh name
@@ -134,3 +150,139 @@ def get_MFnMesh(mesh):
     mfn_mesh = OpenMaya2.MFnMesh(dag_path)
 
     return mfn_mesh
+
+
+# class
+class MeshIntersector(object):
+    """
+    mesh intersector for casting many rays against the same mesh,
+    the MFnMesh and the intersection acceleration grid are built once and reused for all rays,
+    rays are cast in world space
+
+    Args:
+        mesh (str): mesh's shape node or transform node
+
+    Examples:
+        import utils.modeling.meshUtils as meshUtils
+
+        intersector = meshUtils.MeshIntersector('body')
+        hit_points, hit_ray_params, hit_faces = intersector.closest_intersection(guide_positions, [0, 0, 1],
+                                                                                 radius=100, both_direction=True)
+        # faces index is -1 if the ray doesn't hit the mesh
+        hits = hit_faces >= 0
+        # free the acceleration grid kept by maya after casting
+        intersector.free()
+    """
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._mfn_mesh = get_MFnMesh(mesh)
+        self._accel_params = self._mfn_mesh.autoUniformGridParams()
+
+    @property
+    def mesh(self):
+        return self._mesh
+
+    def closest_intersection(self, points, directions, radius=1, both_direction=False):
+        """
+        cast rays from given points and directions to get the closest intersection on mesh for each ray
+
+        Args:
+            points (list/numpy.ndarray): (N, 3) rays' start positions
+            directions (list/numpy.ndarray): (N, 3) rays' directions, or one direction for all rays
+            radius (float): radius to calculate the intersection, any point outside the radius won't be calculated,
+                            default is 1
+            both_direction (bool): calculate intersection points on both direction if set to True, default is False
+
+        Returns:
+            hit_points (numpy.ndarray): (N, 3) hit positions, nan if the ray doesn't hit the mesh
+            hit_ray_params (numpy.ndarray): (N,) parametric distances along the rays, nan if no hit
+            hit_faces (numpy.ndarray): (N,) hit faces index, -1 if no hit
+        """
+        points, directions = self._get_rays(points, directions)
+        num_rays = len(points)
+
+        hit_points = numpy.full((num_rays, 3), numpy.nan)
+        hit_ray_params = numpy.full(num_rays, numpy.nan)
+        hit_faces = numpy.full(num_rays, -1, dtype=numpy.int64)
+
+        for i, (point, direction) in enumerate(zip(points.tolist(), directions.tolist())):
+            intersection_info = self._mfn_mesh.closestIntersection(OpenMaya2.MFloatPoint(point),
+                                                                   OpenMaya2.MFloatVector(direction),
+                                                                   OpenMaya2.MSpace.kWorld, radius, both_direction,
+                                                                   accelParams=self._accel_params)
+            hit_face = intersection_info[2]
+            if hit_face is not None and hit_face >= 0:
+                hit_point = intersection_info[0]
+                hit_points[i] = [hit_point.x, hit_point.y, hit_point.z]
+                hit_ray_params[i] = intersection_info[1]
+                hit_faces[i] = hit_face
+
+        return hit_points, hit_ray_params, hit_faces
+
+    def all_intersections(self, points, directions, radius=1, both_direction=False):
+        """
+        cast rays from given points and directions to get all intersections on mesh,
+        hits are flattened for all rays, and sorted by the ray parameter for each ray
+
+        Args:
+            points (list/numpy.ndarray): (N, 3) rays' start positions
+            directions (list/numpy.ndarray): (N, 3) rays' directions, or one direction for all rays
+            radius (float): radius to calculate the intersection, any point outside the radius won't be calculated,
+                            default is 1
+            both_direction (bool): calculate intersection points on both direction if set to True, default is False
+
+        Returns:
+            ray_indices (numpy.ndarray): (H,) ray index for each hit
+            hit_points (numpy.ndarray): (H, 3) hit positions
+            hit_ray_params (numpy.ndarray): (H,) parametric distances along the rays
+            hit_faces (numpy.ndarray): (H,) hit faces index
+        """
+        points, directions = self._get_rays(points, directions)
+
+        ray_indices = []
+        hit_points = []
+        hit_ray_params = []
+        hit_faces = []
+        for i, (point, direction) in enumerate(zip(points.tolist(), directions.tolist())):
+            intersection_info = self._mfn_mesh.allIntersections(OpenMaya2.MFloatPoint(point),
+                                                                OpenMaya2.MFloatVector(direction),
+                                                                OpenMaya2.MSpace.kWorld, radius, both_direction,
+                                                                accelParams=self._accel_params, sortHits=True)
+            num_hits = len(intersection_info[2])
+            if num_hits:
+                ray_indices.append(numpy.full(num_hits, i, dtype=numpy.int64))
+                hit_points.append(apiUtils.MArray.to_numpy(intersection_info[0]))
+                hit_ray_params.append(apiUtils.MArray.to_numpy(intersection_info[1], dtype=float))
+                hit_faces.append(apiUtils.MArray.to_numpy(intersection_info[2], dtype=numpy.int64))
+
+        if not ray_indices:
+            return (numpy.zeros(0, dtype=numpy.int64), numpy.zeros((0, 3)), numpy.zeros(0),
+                    numpy.zeros(0, dtype=numpy.int64))
+
+        return (numpy.concatenate(ray_indices), numpy.concatenate(hit_points), numpy.concatenate(hit_ray_params),
+                numpy.concatenate(hit_faces))
+
+    def free(self):
+        """
+        free the intersection acceleration grid maya caches for the mesh
+        """
+        self._mfn_mesh.freeCachedIntersectionAccelerator()
+
+    @staticmethod
+    def _get_rays(points, directions):
+        """
+        get rays' start positions and normalized directions as arrays
+
+        Args:
+            points (list/numpy.ndarray): (N, 3) rays' start positions
+            directions (list/numpy.ndarray): (N, 3) rays' directions, or one direction for all rays
+
+        Returns:
+            points (numpy.ndarray): (N, 3) rays' start positions
+            directions (numpy.ndarray): (N, 3) normalized rays' directions
+        """
+        points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+        directions = numpy.asarray(directions, dtype=float).reshape(-1, 3)
+        directions = mathUtils.vector.norm_batch(directions)
+        points, directions = numpy.broadcast_arrays(points, directions)
+        return points, directions
@@ -4,16 +4,18 @@ import maya.api.OpenMaya as OpenMaya2
 import utils.common.apiUtils as apiUtils
 
 
-def get_shape_info(surface):
+def get_shape_info(surface, as_numpy=False):
     """
     get surface's shape info
 
     Args:
         surface (str): surface's shape node or transform node
+        as_numpy (bool): return control vertices as float (N, 3) and knots as numpy arrays instead of lists,
+                         default is False
 
     Returns:
         surface_info (dict): surface shape information
-                          include control_vertices, knots, degree, form
+                          include num_cvs, control_vertices, u_knots, v_knots, u_degree, v_degree, u_form, v_form
     """
     # get MFnNurbsSurface
     mfn_surface = get_MFnNurbsSurface(surface)
@@ -28,13 +30,18 @@ def get_shape_info(surface):
     u_form = mfn_surface.formInU
     v_form = mfn_surface.formInV
 
-    control_vertices = apiUtils.MArray.to_list(control_vertices)
+    if as_numpy:
+        convert = apiUtils.MArray.to_numpy
+    else:
+        convert = apiUtils.MArray.to_list
+
+    control_vertices = convert(control_vertices)
     num_cvs = len(control_vertices)
 
     surface_info = {'num_cvs': num_cvs,
-                    'control_vertices': apiUtils.MArray.to_list(control_vertices),
-                    'u_knots': apiUtils.MArray.to_list(u_knots),
-                    'v_knots': apiUtils.MArray.to_list(v_knots),
+                    'control_vertices': control_vertices,
+                    'u_knots': convert(u_knots),
+                    'v_knots': convert(v_knots),
                     'u_degree': u_degree,
                     'v_degree': v_degree,
                     'u_form': u_form,
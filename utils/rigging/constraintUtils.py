@@ -464,7 +464,7 @@ def aim_constraint(input_matrix, node, aim_vector=None, up_vector=None, world_up
 
 
 def curve_constraint(curve, nodes, skip_rotate=False, aim_vector=None, up_vector=None, aim_type='tangent',
-                     up_curve=None, parent_inverse_matrix=None, force=True):
+                     up_curve=None, parent_inverse_matrix=None, batch=False, force=True):
     """
     attach node to the given curve
 
@@ -480,6 +480,10 @@ def curve_constraint(curve, nodes, skip_rotate=False, aim_vector=None, up_vector
                         otherwise will use quaternion to match the target vector
                         (aim constraint with world up type to None)
         parent_inverse_matrix (str/list): parent inverse matrix for all attach nodes
+        batch (bool): get all nodes' closest parameters in one numpy query with curveUtils.get_closest_points,
+                      instead of querying MFnNurbsCurve.closestPoint for each node,
+                      the batch query is not validated against the api in a maya session yet,
+                      tests/test_curve_closest_point_maya.py compares them, default is False
         force (bool): force connection
 
     Returns:
@@ -490,11 +494,18 @@ def curve_constraint(curve, nodes, skip_rotate=False, aim_vector=None, up_vector
     if isinstance(nodes, basestring):
         nodes = [nodes]
 
+    # get closest parameters on curve for all nodes together
+    parameters = [None] * len(nodes)
+    if batch:
+        node_positions = [cmds.xform(node, query=True, translation=True, worldSpace=True) for node in nodes]
+        parameters = curveUtils.get_closest_points(curve, node_positions)[1].tolist()
+
     # loop in each node and attach node to curve first
     pos_cons = []
     poci_nodes = []
-    for node in nodes:
-        pos_con, poci_node = _curve_point_attach(curve, node, parent_inverse_matrix=parent_inverse_matrix, force=True)
+    for node, parameter in zip(nodes, parameters):
+        pos_con, poci_node = _curve_point_attach(curve, node, parent_inverse_matrix=parent_inverse_matrix,
+                                                 parameter=parameter, force=True)
         pos_cons.append(pos_con)
         poci_nodes.append(poci_node)
 
@@ -568,13 +579,14 @@ def matrix_connect(input_matrix, nodes, skip=None, force=True):
 
 
 # sub function
-def _curve_point_attach(curve, node, parent_inverse_matrix=None, force=True):
+def _curve_point_attach(curve, node, parent_inverse_matrix=None, parameter=None, force=True):
     """
     attach node's translation to the given curve's closest point
     Args:
         curve (str): curve name
         node (str): driven node name
         parent_inverse_matrix (str): parent inverse matrix for attach node
+        parameter (float): parameter on curve to attach, default is None, will use the node's closest point
         force (bool): force connection
 
     Returns:
@@ -588,10 +600,11 @@ def _curve_point_attach(curve, node, parent_inverse_matrix=None, force=True):
 
     # check node naming convention
     name_check = namingUtils.check(node)
-    # get node position
-    node_position = cmds.xform(node, query=True, translation=True, worldSpace=True)
-    # get closest parameter on curve
-    closest_point, parameter = curveUtils.get_closest_point(curve, node_position)
+    if parameter is None:
+        # get node position
+        node_position = cmds.xform(node, query=True, translation=True, worldSpace=True)
+        # get closest parameter on curve
+        closest_point, parameter = curveUtils.get_closest_point(curve, node_position)
     # create point on curve info node to attach given node
     if name_check:
         poci_node = namingUtils.update(node, type='pointOnCurveInfo')
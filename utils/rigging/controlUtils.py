@@ -1,31 +1,41 @@
 # import python library
 import os
 import warnings
+import collections
+
+# import external library
+import numpy
 
 # import maya python library
 import maya.cmds as cmds
+import maya.mel as mel
+import maya.api.OpenMaya as OpenMaya2
 
 # import utils
 import utils.common.fileUtils as fileUtils
+import utils.common.timeUtils as timeUtils
 import utils.common.mathUtils as mathUtils
 import utils.common.namingUtils as namingUtils
 import utils.common.nodeUtils as nodeUtils
 import utils.common.transformUtils as transformUtils
 import utils.common.hierarchyUtils as hierarchyUtils
 import utils.common.attributeUtils as attributeUtils
+import utils.common.apiUtils as apiUtils
 import utils.modeling.curveUtils as curveUtils
 import jointUtils
+import shapeLibraryUtils
+import paletteUtils
 
 # config
 import config
 
 config_dir = os.path.dirname(config.__file__)
 SHAPE_CONFIG_PATH = os.path.join(config_dir, 'CONTROL_SHAPE.cfg')
-SIDE_CONFIG_PATH = os.path.join(config_dir, 'CONTROL_SIDE_COLOR.cfg')
-COLOR_CONFIG_PATH = os.path.join(config_dir, 'CONTROL_COLOR.cfg')
-SHAPE_CONFIG = fileUtils.jsonUtils.read(SHAPE_CONFIG_PATH)
-SIDE_CONFIG = fileUtils.jsonUtils.read(SIDE_CONFIG_PATH)
-COLOR_CONFIG = fileUtils.jsonUtils.read(COLOR_CONFIG_PATH)
+SHAPE_LIBRARY_PATH = os.path.join(config_dir, 'CONTROL_SHAPE.lib')
+SIDE_CONFIG_PATH = paletteUtils.SIDE_CONFIG_PATH
+COLOR_CONFIG_PATH = paletteUtils.COLOR_CONFIG_PATH
+SIDE_CONFIG = paletteUtils.SIDE_CONFIG
+COLOR_CONFIG = paletteUtils.COLOR_CONFIG
 
 # controller's attributes
 HIERARCHY_ATTR = 'hierarchy'
@@ -41,6 +51,31 @@ OUT_INVERSE_MATRIX_ATTR = 'controlOutInverseMatrix'
 LOCAL_INVERSE_MATRIX_ATTR = 'controlLocalInverseMatrix'
 PARTIAL_INVERSE_MATRIX_ATTR = 'controlPartialInverseMatrix'
 
+# controller's hierarchy nodes, in the same order as the hierarchy multi attr indices
+HIERARCHY_NODES = ['zero', 'driven', 'space', 'connect', 'sdk', 'offset', 'control', 'sub', 'output']
+
+# controllers hierarchy nodes cache, key is the controller's name,
+# value is [controller's MObjectHandle, {node type: MObjectHandle}],
+# handles are checked on each query, so deleted or renamed nodes will be re-queried
+HIERARCHY_CACHE = {}
+
+# cvs and color differences smaller than this value are treated as unchanged when loading control shapes
+SHAPE_TOLERANCE = 1e-5
+
+# control factory prototypes' description, it's replaced by each clone's description when renaming
+PROTOTYPE_DESCRIPTION = 'controlPrototype'
+
+# matrix attrs computed by mult matrix and inverse matrix nodes, ordered by dependency,
+# each item is [matrix attr, node type, additional description, source matrix attr]
+MATRIX_NETWORK = [[PARTIAL_MATRIX_ATTR, 'multMatrix', 'matrixPartial', None],
+                  [LOCAL_MATRIX_ATTR, 'multMatrix', 'matrixLocal', PARTIAL_MATRIX_ATTR],
+                  [OUT_MATRIX_ATTR, 'multMatrix', 'matrixOut', LOCAL_MATRIX_ATTR],
+                  [HIERARCHY_MATRIX_ATTR, 'multMatrix', 'matrixHie', OUT_MATRIX_ATTR],
+                  [PARTIAL_INVERSE_MATRIX_ATTR, 'inverseMatrix', 'matrixPartial', PARTIAL_MATRIX_ATTR],
+                  [LOCAL_INVERSE_MATRIX_ATTR, 'inverseMatrix', 'matrixLocal', LOCAL_MATRIX_ATTR],
+                  [OUT_INVERSE_MATRIX_ATTR, 'inverseMatrix', 'matrixOut', OUT_MATRIX_ATTR],
+                  [HIERARCHY_INVERSE_MATRIX_ATTR, 'inverseMatrix', 'matrixHierarchy', HIERARCHY_MATRIX_ATTR]]
+
 
 # class
 class Control(object):
@@ -154,43 +189,43 @@ class Control(object):
 
     @property
     def world_matrix(self):
-        return cmds.getAttr(self._world_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, WORLD_MATRIX_ATTR))
 
     @property
     def hierarchy_matrix(self):
-        return cmds.getAttr(self._hierarchy_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, HIERARCHY_MATRIX_ATTR))
 
     @property
     def out_matrix(self):
-        return cmds.getAttr(self._out_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, OUT_MATRIX_ATTR))
 
     @property
     def local_matrix(self):
-        return cmds.getAttr(self._local_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, LOCAL_MATRIX_ATTR))
 
     @property
     def partial_matrix(self):
-        return cmds.getAttr(self._partial_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, PARTIAL_MATRIX_ATTR))
 
     @property
     def world_inverse_matrix(self):
-        return cmds.getAttr(self._world_inverse_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, WORLD_INVERSE_MATRIX_ATTR))
 
     @property
     def hierarchy_inverse_matrix(self):
-        return cmds.getAttr(self._hierarchy_inverse_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, HIERARCHY_INVERSE_MATRIX_ATTR))
 
     @property
     def out_inverse_matrix(self):
-        return cmds.getAttr(self._out_inverse_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, OUT_INVERSE_MATRIX_ATTR))
 
     @property
     def local_inverse_matrix(self):
-        return cmds.getAttr(self._local_inverse_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, LOCAL_INVERSE_MATRIX_ATTR))
 
     @property
     def partial_inverse_matrix(self):
-        return cmds.getAttr(self._partial_inverse_matrix_attr)
+        return cmds.getAttr(get_matrix_attr(self._control, PARTIAL_INVERSE_MATRIX_ATTR))
 
     @property
     def world_matrix_attr(self):
@@ -253,31 +288,30 @@ class Control(object):
         self._limb_index = token_info['limb_index']
 
         # get controller's hierarchy nodes
-        ctrl_nodes = get_hierarchy(self._control)
-        self._zero = ctrl_nodes[0]
-        self._driven = ctrl_nodes[1]
-        self._space = ctrl_nodes[2]
-        self._connect = ctrl_nodes[3]
-        self._offset = ctrl_nodes[4]
-        self._output = ctrl_nodes[-1]
+        hierarchy_info = get_hierarchy_info(self._control)
+        self._zero = hierarchy_info['zero']
+        self._driven = hierarchy_info['driven']
+        self._space = hierarchy_info['space']
+        self._connect = hierarchy_info['connect']
+        self._offset = hierarchy_info['offset']
+        self._output = hierarchy_info['output']
 
         # get matrix attrs
         self._world_matrix_attr = '{0}.{1}'.format(self._control, WORLD_MATRIX_ATTR)
+        self._hierarchy_matrix_attr = '{0}.{1}'.format(self._control, HIERARCHY_MATRIX_ATTR)
         self._out_matrix_attr = '{0}.{1}'.format(self._control, OUT_MATRIX_ATTR)
         self._local_matrix_attr = '{0}.{1}'.format(self._control, LOCAL_MATRIX_ATTR)
         self._partial_matrix_attr = '{0}.{1}'.format(self._control, PARTIAL_MATRIX_ATTR)
         self._world_inverse_matrix_attr = '{0}.{1}'.format(self._control, WORLD_INVERSE_MATRIX_ATTR)
+        self._hierarchy_inverse_matrix_attr = '{0}.{1}'.format(self._control, HIERARCHY_INVERSE_MATRIX_ATTR)
         self._out_inverse_matrix_attr = '{0}.{1}'.format(self._control, OUT_INVERSE_MATRIX_ATTR)
         self._local_inverse_matrix_attr = '{0}.{1}'.format(self._control, LOCAL_INVERSE_MATRIX_ATTR)
         self._partial_inverse_matrix_attr = '{0}.{1}'.format(self._control, PARTIAL_INVERSE_MATRIX_ATTR)
 
         # check if controller has sub or not
-        if len(ctrl_nodes) == 9:
-            # it has sub controller
-            self._sub = ctrl_nodes[-2]
+        self._sub = hierarchy_info['sub']
+        if self._sub:
             self._ctrls.append(self._sub)
-        else:
-            self._sub = None
 
         # get tagged nodes
         if is_tagged(self._control):
@@ -310,6 +344,20 @@ class Control(object):
                                     additional_description=additional_description)
         self.get_control_info()
 
+    def create_matrix_network(self, matrix_attrs=None):
+        """
+        create the matrix network for the given matrix attrs, lean controller needs it before plugging the attrs,
+        the matrix attr properties only return the attribute paths and never create nodes,
+        the matrix value properties create the missing network before reading, so they never return a stale matrix
+
+        Args:
+            matrix_attrs (str/list): controller's matrix attributes names, default is None, will create all of them
+
+        Returns:
+            matrix_nodes (list): created matrix nodes
+        """
+        return create_matrix_network(self._control, matrix_attrs=matrix_attrs)
+
     def add_tag(self, parent_node=None):
         """
         tag controller using maya control tag node
@@ -381,11 +429,243 @@ class Control(object):
             curveUtils.set_display_setting(shape, display_type='normal', color=col)
 
 
+class ControlFactory(object):
+    """
+    create controllers by duplicating prototype controllers,
+    each prototype is built once by the create function for a signature (shape, size, color, sub, lock_hide,
+    rotate order and lean), and all controllers share the same signature are duplicated from it
+
+    all clones are renamed in one batch after duplicating, then positioned and tagged together,
+    the example below times both ways in a maya session, the factory hasn't been benchmarked yet
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        factory = controlUtils.ControlFactory()
+        ctrls = factory.create([{'description': 'test', 'side': 'left', 'index': i, 'position': [[i, 0, 0], None]}
+                                for i in range(1, 501)])
+        factory.clear()
+
+        # compare with creating each controller from scratch
+        for i in range(1, 501):
+            controlUtils.create('compare', side='left', index=i, position=[[i, 0, 0], None])
+        import utils.common.timeUtils as timeUtils
+        timeUtils.get_report(['controlUtils.create', 'controlUtils.ControlFactory.create'])
+    """
+    def __init__(self):
+        self._prototypes = {}
+
+    @property
+    def prototypes(self):
+        return self._prototypes.values()
+
+    @timeUtils.timer('controlUtils.ControlFactory.create')
+    def create(self, controls_kwargs):
+        """
+        create controllers from prototypes,
+        controllers need manip orient will be created by the create function directly
+
+        Args:
+            controls_kwargs (list): each controller's keyword arguments, same as the create function
+
+        Returns:
+            ctrls (list): controllers' names
+        """
+        ctrls = [None] * len(controls_kwargs)
+
+        # duplicate prototypes, rename children as well,
+        # so the clone's nodes don't share short names with the prototype or other clones
+        clones = []
+        clone_nodes = []
+        clone_names = []
+        for i, kwargs in enumerate(controls_kwargs):
+            if kwargs.get('manip_orient'):
+                # manip orient needs the controller's joint orient, which can't be set after locking attributes
+                ctrls[i] = create(**kwargs)
+                continue
+            prototype = self.get_prototype(**kwargs)
+            zero = cmds.duplicate(get_hierarchy_node(prototype, 'zero'), upstreamNodes=True, renameChildren=True)[0]
+            ctrls[i] = namingUtils.compose(type='control', side=kwargs.get('side', 'center'),
+                                           description=kwargs['description'], index=kwargs.get('index', 1),
+                                           limb_index=kwargs.get('limb_index', None),
+                                           additional_description=kwargs.get('additional_description', None))
+            nodes, names = _get_clone_names(zero, prototype, ctrls[i])
+            clone_nodes += nodes
+            clone_names += names
+            clones.append(i)
+
+        # rename all clones' nodes in one go
+        _rename_nodes(clone_nodes, clone_names)
+
+        # set position and input matrix, collect tags to build them in one pass
+        tag_parents = []
+        for i in clones:
+            ctrl = ctrls[i]
+            kwargs = controls_kwargs[i]
+            zero = get_hierarchy_node(ctrl, 'zero')
+            sub = get_hierarchy_node(ctrl, 'sub')
+
+            for c in [ctrl, sub]:
+                if c:
+                    jointUtils.label_joint(c)
+
+            parent = kwargs.get('parent', None)
+            if parent:
+                parent_control(zero, parent)
+            position = kwargs.get('position', None)
+            if position:
+                _snap_zero(zero, position)
+
+            input_matrix = kwargs.get('input_matrix', None)
+            if input_matrix:
+                if isinstance(input_matrix, basestring):
+                    cmds.connectAttr(input_matrix, '{0}.{1}'.format(ctrl, INPUT_MATRIX_ATTR))
+                else:
+                    cmds.setAttr('{0}.{1}'.format(ctrl, INPUT_MATRIX_ATTR), input_matrix, type='matrix')
+
+            if kwargs.get('tag', True):
+                ctrl_tag_parents = [[ctrl, kwargs.get('tag_parent', None)]]
+                if sub:
+                    ctrl_tag_parents.append([sub, ctrl])
+                tag_graph = kwargs.get('tag_graph', None)
+                if tag_graph:
+                    for c, p in ctrl_tag_parents:
+                        tag_graph.add(c, parent_node=p)
+                else:
+                    tag_parents += ctrl_tag_parents
+
+        build_tags(tag_parents)
+
+        # controllers without color follow the palette rules, color them in one batch
+        palette_ctrls = [ctrls[i] for i in clones if not controls_kwargs[i].get('color', None)]
+        if palette_ctrls:
+            apply_palette(ctrls=palette_ctrls)
+
+        return ctrls
+
+    def get_prototype(self, **kwargs):
+        """
+        get prototype controller for the given create kwargs, create one if the signature doesn't have prototype
+
+        Keyword Args:
+            same as the create function
+
+        Returns:
+            prototype (str): prototype controller's name
+        """
+        # get color, controllers without color follow the side preset
+        color = kwargs.get('color', None)
+        if not color:
+            side = namingUtils.decompose(namingUtils.compose(type='control', side=kwargs.get('side', 'center'),
+                                                             description='prototype'))['side']
+            color = COLOR_CONFIG[SIDE_CONFIG[side[0]]]
+        elif isinstance(color, basestring):
+            color = COLOR_CONFIG[color]
+
+        lock_hide = kwargs.get('lock_hide', None) or []
+        signature = (kwargs.get('shape', 'cube'), kwargs.get('size', 1), tuple(color), kwargs.get('sub', True),
+                     tuple(sorted(lock_hide)), kwargs.get('rotate_order', 0), kwargs.get('lean', False))
+
+        prototype = self._prototypes.get(signature, None)
+        if not prototype or not cmds.objExists(prototype):
+            prototype = create(PROTOTYPE_DESCRIPTION, index=len(self._prototypes) + 1, sub=signature[3],
+                               rotate_order=signature[5], lock_hide=list(signature[4]), shape=signature[0],
+                               color=list(color), size=signature[1], tag=False, lean=signature[6])
+            self._prototypes.update({signature: prototype})
+        return prototype
+
+    def clear(self):
+        """
+        delete all prototype controllers
+        """
+        for prototype in self._prototypes.values():
+            if cmds.objExists(prototype):
+                cmds.delete(get_hierarchy_node(prototype, 'zero'))
+        self._prototypes = {}
+
+
+class TagGraph(object):
+    """
+    collect controllers pick walk hierarchy during the rig build,
+    and create or update all control tag nodes in one pass at the end
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        tag_graph = controlUtils.TagGraph()
+        tag_graph.add_chain(['ctrl__l__armFk__001', 'ctrl__l__armFk__002'], parent_node='ctrl__c__chest__001')
+        tag_graph.add('ctrl__l__armIk__001', parent_node='ctrl__c__chest__001')
+        tag_graph.build()
+    """
+    def __init__(self):
+        self._tag_parents = collections.OrderedDict()
+
+    @property
+    def tag_parents(self):
+        return self._tag_parents.items()
+
+    def add(self, ctrl, parent_node=None):
+        """
+        add controllers to the graph, all given controllers share the same pick walk parent
+
+        Args:
+            ctrl (str/list): controllers names
+            parent_node (str): pick walk parent node, None will keep the controller's current parent
+        """
+        if isinstance(ctrl, basestring):
+            ctrl = [ctrl]
+        for c in ctrl:
+            # re-add controller to keep the latest order
+            self._tag_parents.pop(c, None)
+            self._tag_parents.update({c: parent_node})
+
+    def add_chain(self, ctrls, parent_node=None):
+        """
+        add controllers to the graph as a chain, each controller's pick walk parent is the previous one
+
+        Args:
+            ctrls (list): controllers names
+            parent_node (str): first controller's pick walk parent node,
+                               None will keep the controller's current parent
+        """
+        for c in ctrls:
+            self.add(c, parent_node=parent_node)
+            parent_node = c
+
+    def remove(self, ctrl):
+        """
+        remove controllers from the graph
+
+        Args:
+            ctrl (str/list): controllers names
+        """
+        if isinstance(ctrl, basestring):
+            ctrl = [ctrl]
+        for c in ctrl:
+            self._tag_parents.pop(c, None)
+
+    def clear(self):
+        """
+        remove all controllers from the graph
+        """
+        self._tag_parents.clear()
+
+    def build(self):
+        """
+        create or update control tag nodes for all controllers in the graph
+
+        Returns:
+            tag_nodes (list): controllers' tag nodes
+        """
+        return build_tags([[c, p] for c, p in self._tag_parents.iteritems()])
+
+
 # function
 # create/edit controller related nodes
+@timeUtils.timer()
 def create(description, side='center', index=1, limb_index=None, additional_description=None, sub=True, parent=None,
            position=None, rotate_order=0, manip_orient=None, lock_hide=None, shape='cube', color=None, size=1,
-           input_matrix=None, tag=True, tag_parent=None):
+           input_matrix=None, tag=True, tag_parent=None, tag_graph=None, lean=False):
     """
     create controller
 
@@ -437,6 +717,12 @@ def create(description, side='center', index=1, limb_index=None, additional_desc
                                  normally is the control's parent node's matrix, default is None
         tag (bool): tag control using maya controlTag node, default is True
         tag_parent (str): set pick walk parent node for controller
+        tag_graph (TagGraph): add controller and sub controller to the given tag graph instead of tagging them,
+                              they will be tagged once the graph is built, default is None
+        lean (bool): skip creating the mult matrix and inverse matrix nodes,
+                     each matrix network will be created once it is accessed by get_matrix_attr
+                     or Control.create_matrix_network, so only plug the matrix attrs through those functions
+                     if the controller is lean, default is False
 
     Returns:
         ctrl_name (str): controller's name
@@ -457,9 +743,6 @@ def create(description, side='center', index=1, limb_index=None, additional_desc
     cmds.setAttr(ctrl + '.drawStyle', 2)
     # add control shape
     _add_shape(ctrl, shape=shape, size=size, color=color)
-    # tag controller
-    if tag:
-        add_tag(ctrl, parent_node=tag_parent)
 
     # controller hierarchy
     # add hierarchy message attrs
@@ -492,7 +775,7 @@ def create(description, side='center', index=1, limb_index=None, additional_desc
         zero_position = [ctrl, [0, 0, 0]]
     elif manip_orient:
         zero_position = [ctrl, manip_orient]
-    transformUtils.set_position(ctrl_nodes[0], zero_position, translate=True, rotate=True, scale=False, method='snap')
+    _snap_zero(ctrl_nodes[0], zero_position)
 
     # parent controller under offset group
     cmds.parent(ctrl, ctrl_nodes[-1])
@@ -504,72 +787,14 @@ def create(description, side='center', index=1, limb_index=None, additional_desc
                               PARTIAL_INVERSE_MATRIX_ATTR],
                        attribute_type='matrix')
 
-    # create mult matrix nodes to get output matrix
-    # get partial matrix
-    # the partial matrix is from output node to connect group,
-    # output is the first slot, leave the second slot for sub, if not sub then keep this slot empty
-    partial_nodes = [output, ctrl] + ctrl_nodes[:2:-1]
-    # compose matrix attr
-    partial_matrix_attrs = attributeUtils.compose_attrs(partial_nodes, attributeUtils.MATRIX)
-    # insert an identity matrix to sub matrix slot
-    partial_matrix_attrs.insert(1, mathUtils.matrix.IDENTITY)
-    # create mult matrix node to get output matrix
-    partial_matrix_output = nodeUtils.matrix.mult_matrix(*partial_matrix_attrs,
-                                                         name=namingUtils.update(ctrl, type='multMatrix',
-                                                                                 additional_description='matrixPartial')
-                                                         )
-    # get partial mult matrix node for further using
-    mult_matrix_partial = attributeUtils.compose_attr(partial_matrix_output)[1]
-    # create local matrix to include space, driven matrix
-    local_matrix_output = nodeUtils.matrix.mult_matrix(partial_matrix_output,
-                                                       '{0}.{1}'.format(ctrl_nodes[2], attributeUtils.MATRIX),
-                                                       '{0}.{1}'.format(ctrl_nodes[1], attributeUtils.MATRIX),
-                                                       name=namingUtils.update(ctrl, type='multMatrix',
-                                                                               additional_description='matrixLocal'))
-
-    # create out matrix to include zero matrix
-    out_matrix_output = nodeUtils.matrix.mult_matrix(local_matrix_output, '{0}.{1}'.format(ctrl_nodes[0],
-                                                                                           attributeUtils.MATRIX),
-                                                     name=namingUtils.update(ctrl, type='multMatrix',
-                                                                             additional_description='matrixOut'))
-    # create hierarchy matrix to include out matrix and input matrix
-    hierarchy_matrix_output = nodeUtils.matrix.mult_matrix(out_matrix_output, '{0}.{1}'.format(ctrl, INPUT_MATRIX_ATTR),
-                                                           name=namingUtils.update(ctrl, type='multMatrix',
-                                                                                   additional_description='matrixHie'))
     # set input matrix to attribute or connect input matrix plug
     if input_matrix:
         if isinstance(input_matrix, basestring):
             cmds.connectAttr(input_matrix, '{0}.{1}'.format(ctrl, INPUT_MATRIX_ATTR))
         else:
             cmds.setAttr('{0}.{1}'.format(ctrl, INPUT_MATRIX_ATTR), input_matrix, type='matrix')
-    # connect matrix attrs to attributes
-    cmds.connectAttr(partial_matrix_output, '{0}.{1}'.format(ctrl, PARTIAL_MATRIX_ATTR))
-    cmds.connectAttr(local_matrix_output, '{0}.{1}'.format(ctrl, LOCAL_MATRIX_ATTR))
-    cmds.connectAttr(out_matrix_output, '{0}.{1}'.format(ctrl, OUT_MATRIX_ATTR))
-    cmds.connectAttr(hierarchy_matrix_output, '{0}.{1}'.format(ctrl, HIERARCHY_MATRIX_ATTR))
+    # world matrices come from output node directly, no extra node needed
     cmds.connectAttr('{0}.{1}'.format(output, attributeUtils.WORLD_MATRIX), '{0}.{1}'.format(ctrl, WORLD_MATRIX_ATTR))
-
-    # create inverse matrix node to get inverse matrix
-    nodeUtils.matrix.inverse_matrix(partial_matrix_output,
-                                    name=namingUtils.update(ctrl, type='inverseMatrix',
-                                                            additional_description='matrixPartial'),
-                                    connect_attr='{0}.{1}'.format(ctrl, PARTIAL_INVERSE_MATRIX_ATTR))
-
-    nodeUtils.matrix.inverse_matrix(local_matrix_output,
-                                    name=namingUtils.update(ctrl, type='inverseMatrix',
-                                                            additional_description='matrixLocal'),
-                                    connect_attr='{0}.{1}'.format(ctrl, LOCAL_INVERSE_MATRIX_ATTR))
-
-    nodeUtils.matrix.inverse_matrix(out_matrix_output,
-                                    name=namingUtils.update(ctrl, type='inverseMatrix',
-                                                            additional_description='matrixOut'),
-                                    connect_attr='{0}.{1}'.format(ctrl, OUT_INVERSE_MATRIX_ATTR))
-
-    nodeUtils.matrix.inverse_matrix(hierarchy_matrix_output,
-                                    name=namingUtils.update(ctrl, type='inverseMatrix',
-                                                            additional_description='matrixHierarchy'),
-                                    connect_attr='{0}.{1}'.format(ctrl, HIERARCHY_INVERSE_MATRIX_ATTR))
-
     cmds.connectAttr('{0}.{1}'.format(output, attributeUtils.WORLD_INVERSE_MATRIX),
                      '{0}.{1}'.format(ctrl, WORLD_INVERSE_MATRIX_ATTR))
 
@@ -592,14 +817,20 @@ def create(description, side='center', index=1, limb_index=None, additional_desc
         # connect vis
         cmds.connectAttr(sub_vis, '{0}.{1}'.format(sub_shape, attributeUtils.VISIBILITY))
 
-        # add matrix to calculation
-        cmds.connectAttr('{0}.{1}'.format(sub_ctrl, attributeUtils.MATRIX), mult_matrix_partial + '.matrixIn[1]')
+        ctrls.append(sub_ctrl)
 
-        # tag controller, and pick walk parent to main controller
-        if tag:
-            add_tag(sub_ctrl, parent_node=ctrl)
+    # tag controller and sub controller together, sub controller's pick walk parent is the main controller
+    if tag:
+        tag_parents = [[c, p] for c, p in zip(ctrls, [tag_parent, ctrl])]
+        if tag_graph:
+            for c, p in tag_parents:
+                tag_graph.add(c, parent_node=p)
+        else:
+            build_tags(tag_parents)
 
-        ctrls.append(sub_ctrl)
+    # create matrix nodes, lean controller will create them once the matrix attr is accessed
+    if not lean:
+        create_matrix_network(ctrl)
 
     # lock hide attrs
     if not lock_hide:
@@ -620,6 +851,90 @@ def create(description, side='center', index=1, limb_index=None, additional_desc
     return ctrl
 
 
+@timeUtils.timer()
+def create_chain(controls_kwargs, parent=None, input_matrix=None, lean=False):
+    """
+    create controllers chain, each controller is parented under the previous one and plugs its hierarchy matrix
+
+    if lean, each controller computes its out matrix with one compound mult matrix node, and the hierarchy matrix
+    reuses the out matrix and the parent controller's hierarchy matrix, so each level only adds two matrix nodes
+    instead of the full matrix network, other matrix attrs are created once accessed by get_matrix_attr,
+    raw partial, local and inverse matrix plugs read identity matrices until then
+
+    Args:
+        controls_kwargs (list): each controller's keyword arguments, same as the create function,
+                                parent, input_matrix and lean will be overridden by the chain
+        parent (str): parent node for the first controller, default is None
+        input_matrix (str/list): input matrix for the first controller, default is None
+        lean (bool): create lean controllers with the chain matrix network, default is False
+
+    Returns:
+        ctrls (list): controllers' names
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        ctrls = controlUtils.create_chain([{'description': 'tail', 'index': i, 'position': [[0, 0, -i], None]}
+                                           for i in range(1, 31)], lean=True)
+        compare = [controlUtils.create('compare', index=1)]
+        for i in range(2, 31):
+            compare.append(controlUtils.create('compare', index=i, parent=compare[-1],
+                                               input_matrix='{0}.{1}'.format(compare[-1],
+                                                                             controlUtils.HIERARCHY_MATRIX_ATTR)))
+
+        controlUtils.get_node_report(ctrls)
+        # {'controls': 30, 'matrix_nodes': 60, 'saved_nodes': 180}
+        controlUtils.get_node_report(compare)
+        # {'controls': 30, 'matrix_nodes': 240, 'saved_nodes': 0}
+    """
+    ctrls = []
+    for kwargs in controls_kwargs:
+        kwargs = dict(kwargs)
+        kwargs.update({'parent': parent,
+                       'input_matrix': input_matrix,
+                       'lean': lean})
+        ctrl = create(kwargs.pop('description'), **kwargs)
+        if lean:
+            create_chain_network(ctrl)
+        ctrls.append(ctrl)
+
+        # override parent and input matrix for the next controller
+        parent = ctrl
+        input_matrix = '{0}.{1}'.format(ctrl, HIERARCHY_MATRIX_ATTR)
+
+    return ctrls
+
+
+def create_chain_network(ctrl):
+    """
+    create the chain matrix network for the given controller, the out matrix is computed by one compound
+    mult matrix node from the controller's hierarchy nodes, and the hierarchy matrix reuses it with the input matrix,
+    existing out matrix node will be skipped
+
+    Args:
+        ctrl (str): controller's name
+
+    Returns:
+        matrix_nodes (list): created matrix nodes
+    """
+    matrix_nodes = []
+    if not cmds.listConnections('{0}.{1}'.format(ctrl, OUT_MATRIX_ATTR), source=True, destination=False,
+                                plugs=False):
+        # partial matrix inputs first, so the sub controller slot is the same as the partial mult matrix node
+        input_matrices = _get_matrix_inputs(ctrl, PARTIAL_MATRIX_ATTR)
+        input_matrices += _get_matrix_inputs(ctrl, LOCAL_MATRIX_ATTR)[1:]
+        input_matrices += _get_matrix_inputs(ctrl, OUT_MATRIX_ATTR)[1:]
+        output_attr = nodeUtils.matrix.mult_matrix(*input_matrices,
+                                                   name=namingUtils.update(ctrl, type='multMatrix',
+                                                                           additional_description='matrixOut'),
+                                                   connect_attr='{0}.{1}'.format(ctrl, OUT_MATRIX_ATTR))
+        matrix_nodes.append(attributeUtils.compose_attr(output_attr)[1])
+
+    # hierarchy matrix only multiplies the out matrix with the parent's hierarchy matrix
+    matrix_nodes += create_matrix_network(ctrl, matrix_attrs=HIERARCHY_MATRIX_ATTR)
+    return matrix_nodes
+
+
 def hide_controller(ctrl, shape=False):
     if not shape:
         zero = get_hierarchy_node(ctrl, 'zero')
@@ -676,7 +991,8 @@ def get_hierarchy(ctrl):
         #  'ctrl__l__test_sub__001',
         #  'output__l__test__001']
     """
-    return cmds.listConnections('{0}.{1}'.format(ctrl, HIERARCHY_ATTR), source=True, destination=False, plugs=False)
+    hierarchy_info = get_hierarchy_info(ctrl)
+    return [hierarchy_info[node_type] for node_type in HIERARCHY_NODES if hierarchy_info[node_type]]
 
 
 def get_hierarchy_node(ctrl, node_type):
@@ -708,14 +1024,198 @@ def get_hierarchy_node(ctrl, node_type):
         controlUtils.get_hierarchy_node('ctrl__l__test__001', 'zero')
         # zero__l__test__001
     """
-    # get controller's node index
-    index = ['zero', 'driven', 'space', 'connect', 'sdk', 'offset', 'control', 'sub', 'output'].index(node_type)
-    node_name = cmds.listConnections('{0}.{1}[{2}]'.format(ctrl, HIERARCHY_ATTR, index), source=True, destination=False,
-                                     plugs=False)
-    if node_name:
-        return node_name[0]
-    else:
-        return None
+    return get_hierarchy_info(ctrl)[node_type]
+
+
+def get_hierarchy_info(ctrl):
+    """
+    get controller's hierarchy nodes, the nodes are cached once queried,
+    the cache will be refreshed if any node is deleted, or cleared by update_name, add_sub and remove_sub
+
+    Args:
+        ctrl (str): controller's name
+
+    Returns:
+        hierarchy_info (dict): node type and node name,
+                               node types are zero/driven/space/connect/sdk/offset/control/sub/output,
+                               node name is None if not exist
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        controlUtils.get_hierarchy_info('ctrl__l__test__001')
+        # {'zero': 'zero__l__test__001',
+        #  'driven': 'driven__l__test__001',
+        #  ...
+        #  'sub': 'ctrl__l__test_sub__001',
+        #  'output': 'output__l__test__001'}
+    """
+    cache = HIERARCHY_CACHE.get(ctrl)
+    if cache and _get_handle_name(cache[0]) == ctrl:
+        hierarchy_info = {}
+        for node_type in HIERARCHY_NODES:
+            handle = cache[1].get(node_type)
+            node_name = _get_handle_name(handle) if handle else None
+            if handle and not node_name:
+                # node is deleted, re-query the hierarchy
+                break
+            hierarchy_info.update({node_type: node_name})
+        else:
+            return hierarchy_info
+
+    # query hierarchy nodes in one call
+    connections = cmds.listConnections('{0}.{1}'.format(ctrl, HIERARCHY_ATTR), source=True, destination=False,
+                                       plugs=False, connections=True) or []
+    hierarchy_info = dict.fromkeys(HIERARCHY_NODES)
+    for plug, node in zip(connections[::2], connections[1::2]):
+        hierarchy_info.update({HIERARCHY_NODES[int(plug.split('[')[-1][:-1])]: node})
+
+    # cache node handles
+    node_types = [node_type for node_type in HIERARCHY_NODES if hierarchy_info[node_type]]
+    m_objs = apiUtils.MSelectionList.get_nodes_info(ctrl, *[hierarchy_info[node_type] for node_type in node_types],
+                                                    info_type='MObject')
+    handles = [OpenMaya2.MObjectHandle(m_obj) for m_obj in m_objs]
+    HIERARCHY_CACHE.update({ctrl: [handles[0], dict(zip(node_types, handles[1:]))]})
+
+    return hierarchy_info
+
+
+def clear_hierarchy_cache(ctrl=None):
+    """
+    remove controllers from hierarchy cache
+
+    Args:
+        ctrl (str/list): controllers names, default is None, which clears the whole cache
+    """
+    if ctrl is None:
+        HIERARCHY_CACHE.clear()
+        return
+    if isinstance(ctrl, basestring):
+        ctrl = [ctrl]
+    for c in ctrl:
+        HIERARCHY_CACHE.pop(c, None)
+
+
+def get_matrix_attr(ctrl, matrix_attr):
+    """
+    get controller's matrix attribute path, it will create the matrix network if the controller is lean
+    and the matrix attr has not been computed yet, use this function to plug lean controller's matrices
+
+    Args:
+        ctrl (str): controller's name
+        matrix_attr (str): controller's matrix attribute name, like HIERARCHY_MATRIX_ATTR
+
+    Returns:
+        attr_path (str): controller's matrix attribute path
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        controlUtils.get_matrix_attr('ctrl__l__test__001', controlUtils.LOCAL_INVERSE_MATRIX_ATTR)
+        # 'ctrl__l__test__001.controlLocalInverseMatrix'
+    """
+    create_matrix_network(ctrl, matrix_attrs=matrix_attr)
+    return '{0}.{1}'.format(ctrl, matrix_attr)
+
+
+def create_matrix_network(ctrl, matrix_attrs=None):
+    """
+    create mult matrix and inverse matrix nodes to compute controller's matrix attrs,
+    it only creates nodes for the given matrix attrs and their source matrices, existing nodes will be skipped
+
+    Args:
+        ctrl (str): controller's name
+        matrix_attrs (str/list): controller's matrix attributes names, default is None, will create all of them
+
+    Returns:
+        matrix_nodes (list): created matrix nodes
+    """
+    if isinstance(matrix_attrs, basestring):
+        matrix_attrs = [matrix_attrs]
+    network = {}
+    for network_info in MATRIX_NETWORK:
+        network.update({network_info[0]: network_info})
+    if matrix_attrs is None:
+        matrix_attrs = network.keys()
+
+    # get matrix attrs need to be computed, include their source matrices
+    required_attrs = []
+    for attr in matrix_attrs:
+        while attr in network and attr not in required_attrs:
+            required_attrs.append(attr)
+            attr = network[attr][3]
+
+    # skip matrix attrs already connected
+    build_attrs = []
+    for attr in required_attrs:
+        if not cmds.listConnections('{0}.{1}'.format(ctrl, attr), source=True, destination=False, plugs=False):
+            build_attrs.append(attr)
+    if not build_attrs:
+        return []
+
+    # create nodes in dependency order
+    matrix_nodes = []
+    for attr, node_type, suffix, source_attr in MATRIX_NETWORK:
+        if attr not in build_attrs:
+            continue
+        name = namingUtils.update(ctrl, type=node_type, additional_description=suffix)
+        connect_attr = '{0}.{1}'.format(ctrl, attr)
+        if node_type == 'multMatrix':
+            output_attr = nodeUtils.matrix.mult_matrix(*_get_matrix_inputs(ctrl, attr), name=name,
+                                                       connect_attr=connect_attr)
+        else:
+            output_attr = nodeUtils.matrix.inverse_matrix('{0}.{1}'.format(ctrl, source_attr), name=name,
+                                                          connect_attr=connect_attr)
+        matrix_nodes.append(attributeUtils.compose_attr(output_attr)[1])
+
+    return matrix_nodes
+
+
+def get_matrix_nodes(ctrl):
+    """
+    get controller's mult matrix and inverse matrix nodes
+
+    Args:
+        ctrl (str): controller's name
+
+    Returns:
+        matrix_nodes (list): controller's existing matrix nodes
+    """
+    matrix_nodes = []
+    for network_info in MATRIX_NETWORK:
+        matrix_node = cmds.listConnections('{0}.{1}'.format(ctrl, network_info[0]), source=True, destination=False,
+                                           plugs=False)
+        if matrix_node:
+            matrix_nodes.append(matrix_node[0])
+    return matrix_nodes
+
+
+def get_node_report(ctrls):
+    """
+    get matrix nodes count for given controllers, and how many nodes lean controllers saved
+
+    Args:
+        ctrls (str/list): controllers' names
+
+    Returns:
+        report (dict): controls: controllers number
+                       matrix_nodes: existing matrix nodes number
+                       saved_nodes: matrix nodes number not created comparing to the full matrix network
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        controlUtils.get_node_report(['ctrl__l__test__001', 'ctrl__l__test__002'])
+        # {'controls': 2, 'matrix_nodes': 3, 'saved_nodes': 13}
+    """
+    if isinstance(ctrls, basestring):
+        ctrls = [ctrls]
+    matrix_nodes_count = 0
+    for c in ctrls:
+        matrix_nodes_count += len(get_matrix_nodes(c))
+    return {'controls': len(ctrls),
+            'matrix_nodes': matrix_nodes_count,
+            'saved_nodes': len(ctrls) * len(MATRIX_NETWORK) - matrix_nodes_count}
 
 
 def parent_control(ctrl, parent_node):
@@ -772,32 +1272,26 @@ def update_name(ctrl, side=None, description=None, index=None, limb_index=None,
         additional_description = []
 
     # get controller's hierarchy
-    ctrl_nodes = get_hierarchy(ctrl)
+    hierarchy_info = get_hierarchy_info(ctrl)
+    clear_hierarchy_cache(ctrl)
     # rename each hierarchy node except controller
-    for node, node_type in zip(ctrl_nodes[:6] + [ctrl_nodes[-1]],
-                               ['zero', 'driven', 'space', 'connect', 'offset', 'output']):
-        cmds.rename(node, namingUtils.update(ctrl, type=node_type, side=side, description=description, index=index,
-                                             limb_index=limb_index, primary_side=primary_side,
-                                             secondary_side=secondary_side,
-                                             additional_description=additional_description))
+    for node_type in ['zero', 'driven', 'space', 'connect', 'sdk', 'offset', 'output']:
+        cmds.rename(hierarchy_info[node_type],
+                    namingUtils.update(ctrl, type=node_type, side=side, description=description, index=index,
+                                       limb_index=limb_index, primary_side=primary_side,
+                                       secondary_side=secondary_side, additional_description=additional_description))
 
     # put controller into a list
     ctrls = []
     # get sub controller
-    if len(ctrl_nodes) == 8:
+    if hierarchy_info['sub']:
         # it has sub controller
         # rename sub controller
-        if not additional_description:
-            sub_description = 'sub'
-        elif isinstance(additional_description, basestring):
-            sub_description = [additional_description, 'sub']
-        else:
-            sub_description = additional_description + ['sub']
-
-        sub = cmds.rename(ctrl_nodes[-2], namingUtils.update(ctrl, side=side, description=description, index=index,
-                                                             limb_index=limb_index, primary_side=primary_side,
-                                                             secondary_side=secondary_side,
-                                                             additional_description=sub_description))
+        sub_description = additional_description + ['sub']
+        sub = cmds.rename(hierarchy_info['sub'],
+                          namingUtils.update(ctrl, side=side, description=description, index=index,
+                                             limb_index=limb_index, primary_side=primary_side,
+                                             secondary_side=secondary_side, additional_description=sub_description))
         ctrls.append(sub)
 
     # rename controller
@@ -808,13 +1302,13 @@ def update_name(ctrl, side=None, description=None, index=None, limb_index=None,
     ctrls.append(ctrl)
 
     # rename matrix nodes
-    for matrix_attr, suffix in zip([OUT_MATRIX_ATTR, LOCAL_MATRIX_ATTR, PARTIAL_MATRIX_ATTR,
-                                    OUT_INVERSE_MATRIX_ATTR, LOCAL_INVERSE_MATRIX_ATTR, PARTIAL_INVERSE_MATRIX_ATTR],
-                                   ['matrixOut', 'matrixLocal', 'matrixPartial',
-                                    'matrixOut', 'matrixLocal', 'matrixPartial']):
-        # get source node
+    for matrix_attr, _, suffix, _ in MATRIX_NETWORK:
+        # get source node, skip if it's a lean controller and the matrix node is not created yet
         matrix_node = cmds.listConnections('{0}.{1}'.format(ctrl, matrix_attr), source=True, destination=False,
-                                           plugs=False)[0]
+                                           plugs=False)
+        if not matrix_node:
+            continue
+        matrix_node = matrix_node[0]
         # update the name
         cmds.rename(matrix_node, namingUtils.update(matrix_node, side=side, description=description, index=index,
                                                     limb_index=limb_index, primary_side=primary_side,
@@ -830,12 +1324,14 @@ def update_name(ctrl, side=None, description=None, index=None, limb_index=None,
     return ctrl
 
 
-def add_sub(ctrl):
+def add_sub(ctrl, tag_graph=None):
     """
     add sub controller
 
     Args:
         ctrl (str): controller's name
+        tag_graph (TagGraph): add sub controller to the given tag graph instead of tagging it if the controller
+                              is tagged, default is None
 
     Returns:
         sub_ctrl (str): sub controller's name
@@ -855,7 +1351,8 @@ def add_sub(ctrl):
                                  rotate_order=cmds.getAttr('{0}.{1}'.format(ctrl, attributeUtils.ROTATE_ORDER)))
     cmds.setAttr(sub_ctrl + '.drawStyle', 2)
     # connect message to hierarchy
-    cmds.connectAttr(sub_ctrl + '.message', '{0}.{1}[6]'.format(ctrl, HIERARCHY_ATTR))
+    cmds.connectAttr(sub_ctrl + '.message', '{0}.{1}[7]'.format(ctrl, HIERARCHY_ATTR))
+    clear_hierarchy_cache(ctrl)
     # re-parent output
     output = get_hierarchy_node(ctrl, 'output')
     cmds.parent(output, sub_ctrl)
@@ -865,16 +1362,18 @@ def add_sub(ctrl):
     # connect vis
     cmds.connectAttr(sub_vis, '{0}.{1}'.format(sub_shape, attributeUtils.VISIBILITY))
 
-    # add matrix to calculation
-    mult_matrix_local = cmds.listConnections('{0}.{1}'.format(ctrl, attributeUtils.MATRIX), source=False,
-                                             destination=True, plugs=False)[0]
-    cmds.connectAttr('{0}.{1}'.format(sub_ctrl, attributeUtils.MATRIX), mult_matrix_local + '.matrixIn[1]')
+    # add matrix to calculation, lean controller will add it once the partial matrix node is created
+    for sub_plug in _get_sub_matrix_plugs(ctrl):
+        cmds.connectAttr('{0}.{1}'.format(sub_ctrl, attributeUtils.MATRIX), sub_plug, force=True)
 
     # tag controller, and pick walk parent to main controller
     # check if controller is tagged
     tag_node = is_tagged(ctrl)
     if tag_node:
-        add_tag(sub_ctrl, parent_node=ctrl)
+        if tag_graph:
+            tag_graph.add(sub_ctrl, parent_node=ctrl)
+        else:
+            add_tag(sub_ctrl, parent_node=ctrl)
 
     # transfer default attrs status from controller
     attributeUtils.transfer_default_attrs_status(ctrl, sub_ctrl)
@@ -898,8 +1397,14 @@ def remove_sub(ctrl):
     output = get_hierarchy_node(ctrl, 'output')
     # re-parent output under controller
     cmds.parent(output, ctrl)
+    # get sub matrix slots before removing the sub controller
+    sub_plugs = _get_sub_matrix_plugs(ctrl)
     # remove sub controller
     cmds.delete(sub_ctrl)
+    clear_hierarchy_cache(ctrl)
+    # reset sub matrix slots, disconnected plugs keep the last sub matrix value
+    for sub_plug in sub_plugs:
+        cmds.setAttr(sub_plug, mathUtils.matrix.IDENTITY, type='matrix')
 
 
 def add_tag(ctrl, parent_node=None):
@@ -915,25 +1420,58 @@ def add_tag(ctrl, parent_node=None):
     """
     if isinstance(ctrl, basestring):
         ctrl = [ctrl]
+    return build_tags([[c, parent_node] for c in ctrl])
 
-    tag_nodes = []
-    for c in ctrl:
-        tag_node = is_tagged(c)
-        if tag_node:
-            warnings.warn('given controller: {0} is already tagged, skip'.format(c))
-        else:
-            cmds.controller(c)
-            # get tag node
-            tag_node = cmds.listConnections(c + '.message', destination=True, plugs=False, type='controller')[0]
-            tag_node = cmds.rename(tag_node, namingUtils.update(c, type='controlTag'))
-        # append list
-        tag_nodes.append(tag_node)
 
-    # parent nodes
-    if parent_node:
-        cmds.controller(ctrl, parent_node, parent=True)
+def build_tags(tag_parents):
+    """
+    create control tag nodes and set pick walk parents for all given controllers in one pass,
+    existing tag nodes and parents already matching will be skipped
 
-    return tag_nodes
+    Args:
+        tag_parents (list): controllers and their pick walk parents, [[ctrl, parent_node], [ctrl, parent_node]...],
+                            parent node can be None to keep the controller's current parent,
+                            children are added to the parent in the given order
+
+    Returns:
+        tag_nodes (list): given controllers' tag nodes
+    """
+    if not tag_parents:
+        return []
+
+    # get all nodes need tag, parents need to be tagged as well
+    nodes = []
+    for ctrl, parent_node in tag_parents:
+        for n in [parent_node, ctrl]:
+            if n and n not in nodes:
+                nodes.append(n)
+
+    # get existing tags in one call, and create the missing ones
+    tags = _get_tags(nodes)
+    for n in nodes:
+        if n not in tags:
+            tag_node = cmds.createNode('controller', name=namingUtils.update(n, type='controlTag'))
+            cmds.connectAttr(n + '.message', tag_node + '.controllerObject')
+            tags.update({n: tag_node})
+
+    # get current parents in one call
+    tag_plugs = ['{0}.parent'.format(tags[ctrl]) for ctrl, parent_node in tag_parents if parent_node]
+    connections = cmds.listConnections(tag_plugs, source=False, destination=True, plugs=False,
+                                       connections=True, type='controller') if tag_plugs else None
+    current_parents = {}
+    if connections:
+        for plug, parent_tag in zip(connections[::2], connections[1::2]):
+            current_parents.update({plug.split('.')[0]: parent_tag})
+
+    # group children need to be re-parented by parent, keep the order
+    children_info = collections.OrderedDict()
+    for ctrl, parent_node in tag_parents:
+        if parent_node and current_parents.get(tags[ctrl]) != tags[parent_node]:
+            children_info.setdefault(parent_node, []).append(ctrl)
+    for parent_node, children in children_info.iteritems():
+        cmds.controller(children, parent_node, parent=True)
+
+    return [tags[ctrl] for ctrl, _ in tag_parents]
 
 
 def remove_tag(ctrl):
@@ -1188,7 +1726,186 @@ def mirror_shape(ctrl_source, ctrl_target, mirror_space=None):
         _add_shape(c_t, color=color, shape_info=shape_info)
 
 
+def mirror_all(ctrls=None, side='left', mirror_space=None):
+    """
+    mirror control shapes from one side to the other for all the given controls together,
+    sub controllers are mirrored with their controllers,
+    cvs are written in place if the target shape has the same topology, otherwise the target shape will be rebuilt
+
+    Args:
+        ctrls (list): controls need to be mirrored, default is None, will mirror all controls in the scene
+        side (str): source side, only controls on this side will be mirrored to the other side, default is 'left'
+        mirror_space (list): mirror space, control shape point world position will multiply this as vector to get the
+                             mirrored position, default is [-1, 1, 1]
+
+    Returns:
+        target_ctrls (list): mirrored controls
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+
+        controlUtils.mirror_all(side='left')
+    """
+    if not mirror_space:
+        mirror_space = [-1, 1, 1]
+
+    # get controls and sub controls
+    ctrls_all = _get_controls(ctrls)
+
+    # get control pairs
+    ctrls_source = [c for c in ctrls_all if namingUtils.check(c) and side in namingUtils.decompose(c)['side']]
+    ctrls_target = namingUtils.flip_names(ctrls_source)
+    ctrls_exist = set(cmds.ls(ctrls_target))
+    pairs = [[c_s, c_t] for c_s, c_t in zip(ctrls_source, ctrls_target) if c_t != c_s and c_t in ctrls_exist]
+    if not pairs:
+        return []
+    ctrls_source, ctrls_target = [list(ctrls) for ctrls in zip(*pairs)]
+
+    # get shapes and world matrices in bulk
+    shapes_source = get_shapes_data(ctrls_source)
+    shapes_target = get_shapes_data(ctrls_target)
+    matrices_source = _get_world_matrices(ctrls_source)
+    matrices_target = _get_world_matrices(ctrls_target)
+
+    # transform all points with stacked matrices, source world matrix * mirror space * target world inverse matrix
+    mirror_space_matrix = numpy.diag(list(mirror_space) + [1.0])
+    transform_matrices = numpy.einsum('nij,jk,nkl->nil', matrices_source, mirror_space_matrix,
+                                      numpy.linalg.inv(matrices_target))
+    pair_indices = numpy.repeat(numpy.arange(len(pairs)), shapes_source['num_cvs'])
+    points = numpy.hstack((shapes_source['control_vertices'], numpy.ones((len(pair_indices), 1))))
+    points = numpy.einsum('ni,nij->nj', points, transform_matrices[pair_indices])[:, :3]
+
+    # write back
+    cv_offsets = numpy.append(0, numpy.cumsum(shapes_source['num_cvs']))
+    knot_offsets = numpy.append(0, numpy.cumsum(shapes_source['num_knots']))
+    knot_offsets_target = numpy.append(0, numpy.cumsum(shapes_target['num_knots']))
+    for i, c_t in enumerate(ctrls_target):
+        control_vertices = points[cv_offsets[i]: cv_offsets[i + 1]]
+        knots = shapes_source['knots'][knot_offsets[i]: knot_offsets[i + 1]]
+        knots_target = shapes_target['knots'][knot_offsets_target[i]: knot_offsets_target[i + 1]]
+        if (shapes_source['num_cvs'][i] == shapes_target['num_cvs'][i] and
+                shapes_source['degree'][i] == shapes_target['degree'][i] and
+                shapes_source['form'][i] == shapes_target['form'][i] and
+                len(knots) == len(knots_target) and numpy.allclose(knots, knots_target)):
+            curveUtils.set_points(shapes_target['shapes'][i], control_vertices.tolist())
+        else:
+            shape_info = {'num_cvs': int(shapes_source['num_cvs'][i]),
+                          'control_vertices': control_vertices.tolist(),
+                          'knots': knots.tolist(),
+                          'degree': int(shapes_source['degree'][i]),
+                          'form': int(shapes_source['form'][i])}
+            _add_shape(c_t, color=shapes_target['color'][i].tolist(), shape_info=shape_info)
+
+    return ctrls_target
+
+
+def apply_palette(ctrls=None, palette=None):
+    """
+    set control shapes colors from palette, all colors are computed in one pass and set in one undo chunk,
+    cvs are not touched
+
+    Args:
+        ctrls (list): controls need to be colored, sub controls are included,
+                      default is None, will color all controls in the scene
+        palette (dict/str): palette or palette json file path, default is None, will use the active palette
+
+    Examples:
+        import utils.rigging.controlUtils as controlUtils
+        import utils.rigging.paletteUtils as paletteUtils
+
+        paletteUtils.set_palette({'sub_multiplier': 0.3})
+        controlUtils.apply_palette()
+    """
+    if isinstance(palette, basestring):
+        palette = fileUtils.jsonUtils.read(palette)
+
+    ctrls_all = _get_controls(ctrls)
+    if not ctrls_all:
+        return
+    colors = paletteUtils.get_colors(ctrls_all, palette=palette)
+
+    # get curve shapes in one api pass
+    shapes_colors = []
+    dag_paths = apiUtils.MSelectionList.get_nodes_info(*ctrls_all, info_type='MDagPath')
+    for dag_path, color in zip(dag_paths, colors):
+        for i in range(dag_path.numberOfShapesDirectlyBelow()):
+            shape_path = OpenMaya2.MDagPath(dag_path).extendToShape(i)
+            if shape_path.hasFn(OpenMaya2.MFn.kNurbsCurve):
+                shapes_colors.append([shape_path.fullPathName(), color])
+
+    # set colors with cmds in one chunk, so it can be undone in one step
+    cmds.undoInfo(openChunk=True)
+    try:
+        for shape, color in shapes_colors:
+            cmds.setAttr(shape + '.overrideEnabled', True)
+            cmds.setAttr(shape + '.overrideRGBColors', True)
+            cmds.setAttr(shape + '.overrideColorRGB', *[float(value) for value in color])
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
 # import/export control shape
+def get_shapes_data(ctrl):
+    """
+    get control shapes information in one api pass, stored as columns
+
+    Args:
+        ctrl (str/list): controls or control shapes names
+
+    Returns:
+        shapes_data (dict): controls (list): controls names
+                            shapes (list): control shapes names
+                            num_cvs (numpy.ndarray): each shape's cvs number
+                            num_knots (numpy.ndarray): each shape's knots number
+                            degree (numpy.ndarray): each shape's degree
+                            form (numpy.ndarray): each shape's form
+                            color (numpy.ndarray): each shape's rgb color
+                            control_vertices (numpy.ndarray): all shapes' cvs positions, stacked in order
+                            knots (numpy.ndarray): all shapes' knots, stacked in order
+    """
+    if isinstance(ctrl, basestring):
+        ctrl = [ctrl]
+
+    shapes_data = {'controls': [],
+                   'shapes': [],
+                   'num_cvs': [],
+                   'num_knots': [],
+                   'degree': [],
+                   'form': [],
+                   'color': [],
+                   'control_vertices': [],
+                   'knots': []}
+
+    dag_paths = apiUtils.MSelectionList.get_nodes_info(*ctrl, info_type='MDagPath')
+    for dag_path in dag_paths:
+        if not dag_path.hasFn(OpenMaya2.MFn.kNurbsCurve):
+            # get control's shape node
+            dag_path.extendToShape(0)
+        mfn_crv = OpenMaya2.MFnNurbsCurve(dag_path)
+        control_vertices = numpy.array(mfn_crv.cvPositions(OpenMaya2.MSpace.kObject), dtype=float)[:, :3]
+        knots = numpy.array(mfn_crv.knots(), dtype=float)
+        color_plug = mfn_crv.findPlug('overrideColorRGB', False)
+
+        shapes_data['shapes'].append(dag_path.partialPathName())
+        dag_path.pop()
+        shapes_data['controls'].append(dag_path.partialPathName())
+        shapes_data['num_cvs'].append(len(control_vertices))
+        shapes_data['num_knots'].append(len(knots))
+        shapes_data['degree'].append(mfn_crv.degree)
+        shapes_data['form'].append(mfn_crv.form)
+        shapes_data['color'].append([color_plug.child(i).asFloat() for i in range(3)])
+        shapes_data['control_vertices'].append(control_vertices)
+        shapes_data['knots'].append(knots)
+
+    for key in ['num_cvs', 'num_knots', 'degree', 'form']:
+        shapes_data[key] = numpy.array(shapes_data[key], dtype=int)
+    shapes_data['color'] = numpy.array(shapes_data['color'], dtype=float).reshape(-1, 3)
+    shapes_data['control_vertices'] = numpy.concatenate(shapes_data['control_vertices'] or [numpy.zeros((0, 3))])
+    shapes_data['knots'] = numpy.concatenate(shapes_data['knots'] or [numpy.zeros(0)])
+
+    return shapes_data
+
+
 def export_data(ctrl, file_path):
     """
     export control shapes information to the given file path
@@ -1198,20 +1915,22 @@ def export_data(ctrl, file_path):
         ctrl (str/list): controls name
         file_path (str): control shape export file path
     """
-    if isinstance(ctrl, basestring):
-        ctrl = [ctrl]
+    shapes_data = get_shapes_data(ctrl)
+
+    # split columns to each control's info
+    cv_offsets = numpy.cumsum(shapes_data['num_cvs'])[:-1]
+    knot_offsets = numpy.cumsum(shapes_data['num_knots'])[:-1]
+    control_vertices = numpy.split(shapes_data['control_vertices'], cv_offsets)
+    knots = numpy.split(shapes_data['knots'], knot_offsets)
 
     export_info = {}
-    for c in ctrl:
-        # get shape info
-        if cmds.objectType(c) != 'nurbsCurve':
-            shape = cmds.listRelatives(c, shapes=True)[0]
-        else:
-            shape = c
-            c = cmds.listRelatives(shape, parent=True)[0]
-        shape_info = curveUtils.get_shape_info(shape)
-        color = curveUtils.get_color(shape)
-        export_info.update({c: {'color': color,
+    for i, c in enumerate(shapes_data['controls']):
+        shape_info = {'num_cvs': int(shapes_data['num_cvs'][i]),
+                      'control_vertices': control_vertices[i].tolist(),
+                      'knots': knots[i].tolist(),
+                      'degree': int(shapes_data['degree'][i]),
+                      'form': int(shapes_data['form'][i])}
+        export_info.update({c: {'color': shapes_data['color'][i].tolist(),
                                 'shape_info': shape_info}})
 
     # export control info
@@ -1220,27 +1939,78 @@ def export_data(ctrl, file_path):
 
 def build_data(ctrl_info, control_list=None, exception_list=None, size=1):
     """
-    add shapes to controllers base on the given control shapes info
+    add shapes to controllers base on the given control shapes info,
+    only controllers with changed shapes will be updated,
+    cvs are edited in place if the shape topology matches, otherwise the shape will be rebuilt
 
     Args:
         ctrl_info(dict): ctrl shape info
         control_list(list): only load ctrl shape info to those controls in the list, None will load all, default is None
         exception_list(list): skip loading ctrl shape info to those controls in the list, default is None
         size(float): scale controls shapes uniformly, default is 1
+
+    Returns:
+        rebuilt_ctrls (list): controllers with shapes rebuilt
+        updated_ctrls (list): controllers with cvs or color edited in place
     """
-    for ctrl, info in ctrl_info.iteritems():
-        if cmds.objExists(ctrl):
-            if control_list and ctrl not in control_list:
-                # skip if control list given, and controller name is not on list
-                pass
-            elif exception_list and ctrl in exception_list:
-                # skip if controller is on exception list
-                pass
-            else:
-                info.update({'size': size})
-                _add_shape(ctrl, **info)
-        else:
+    ctrls = []
+    for ctrl in ctrl_info:
+        if control_list and ctrl not in control_list:
+            # skip if control list given, and controller name is not on list
+            continue
+        if exception_list and ctrl in exception_list:
+            # skip if controller is on exception list
+            continue
+        ctrls.append(ctrl)
+
+    # check existing controllers in one call
+    ctrls_exist = set(cmds.ls(ctrls))
+    for ctrl in ctrls:
+        if ctrl not in ctrls_exist:
             warnings.warn(ctrl + ' does not exist in the scene, skipped')
+    ctrls = [ctrl for ctrl in ctrls if ctrl in ctrls_exist]
+    if not ctrls:
+        return [], []
+
+    # get current shapes
+    shapes_data = get_shapes_data(ctrls)
+    cv_offsets = numpy.append(0, numpy.cumsum(shapes_data['num_cvs']))
+    knot_offsets = numpy.append(0, numpy.cumsum(shapes_data['num_knots']))
+
+    rebuilt_ctrls = []
+    updated_ctrls = []
+    for i, ctrl in enumerate(ctrls):
+        info = ctrl_info[ctrl]
+        shape_info = info['shape_info']
+        control_vertices = numpy.array(shape_info['control_vertices'], dtype=float).reshape(-1, 3)
+        knots = numpy.array(shape_info['knots'], dtype=float)
+        # scale the shape from its bounding box center, same as transform_shape
+        if size != 1:
+            pivot = (control_vertices.max(axis=0) + control_vertices.min(axis=0)) * 0.5
+            control_vertices = (control_vertices - pivot) * size + pivot
+
+        current_vertices = shapes_data['control_vertices'][cv_offsets[i]: cv_offsets[i + 1]]
+        current_knots = shapes_data['knots'][knot_offsets[i]: knot_offsets[i + 1]]
+
+        if (len(control_vertices) != len(current_vertices) or len(knots) != len(current_knots) or
+                shape_info['degree'] != shapes_data['degree'][i] or shape_info['form'] != shapes_data['form'][i] or
+                not numpy.allclose(knots, current_knots)):
+            # topology changed, rebuild the shape
+            _add_shape(ctrl, color=info['color'], shape_info=shape_info, size=size)
+            rebuilt_ctrls.append(ctrl)
+            continue
+
+        updated = False
+        if not numpy.allclose(control_vertices, current_vertices, atol=SHAPE_TOLERANCE):
+            curveUtils.set_points(shapes_data['shapes'][i], control_vertices.tolist())
+            updated = True
+        if info['color'] and not numpy.allclose(info['color'], shapes_data['color'][i], atol=SHAPE_TOLERANCE):
+            curveUtils.set_display_setting(shapes_data['shapes'][i], color=info['color'])
+            updated = True
+        if updated:
+            updated_ctrls.append(ctrl)
+
+    return rebuilt_ctrls, updated_ctrls
 
 
 def import_data(file_path, control_list=None, exception_list=None, size=1):
@@ -1258,26 +2028,58 @@ def import_data(file_path, control_list=None, exception_list=None, size=1):
 
 
 # control shape config info
+def get_shape_library():
+    """
+    get control shape library path, the binary library is the controllers shapes' source at runtime,
+    it's never compiled or written when reading shapes, so the package config folder can be read only,
+    use compile_config or export_config to sync it with the json config explicitly
+
+    Returns:
+        library_path (str): binary control shape library path
+    """
+    return SHAPE_LIBRARY_PATH
+
+
 def append_config(curves):
     """
-    add given curve shapes to the control's preset
+    add given curve shapes to the control's preset,
+    shapes are appended to the control shape library only, existing records are not rewritten,
+    use export_config to save them to the json config
 
     Args:
-        curves (str/list): curves names, the curve transform name will be saved as key in control shape config
+        curves (str/list): curves names, the curve transform name will be saved as shape name in the library
     """
-    config_shape_info = fileUtils.jsonUtils.read(SHAPE_CONFIG_PATH)
-
     if isinstance(curves, basestring):
         curves = [curves]
 
+    shapes_info = {}
     for crv in curves:
         # get shape info
-        crv_shape_info = curveUtils.get_shape_info(crv)
-        # update preset info
-        config_shape_info.update({crv: crv_shape_info})
+        shapes_info.update({crv: curveUtils.get_shape_info(crv)})
+
+    shapeLibraryUtils.append_shapes(get_shape_library(), shapes_info)
+
+
+def compile_config(config_path=SHAPE_CONFIG_PATH):
+    """
+    compile the json control shape config to the control shape library, used after editing the config by hand,
+    the library will be rewritten with the config's shapes only
+
+    Args:
+        config_path (str): control shape json config path, default is CONTROL_SHAPE.cfg in the config folder
+    """
+    shapeLibraryUtils.compile_library(config_path, get_shape_library())
 
-    # overwrite preset
-    fileUtils.jsonUtils.write(SHAPE_CONFIG_PATH, config_shape_info)
+
+def export_config(config_path=SHAPE_CONFIG_PATH):
+    """
+    export the control shape library to the json config, used to keep the config readable and diffable
+    after appending shapes
+
+    Args:
+        config_path (str): control shape json config path, default is CONTROL_SHAPE.cfg in the config folder
+    """
+    shapeLibraryUtils.export_config(get_shape_library(), config_path)
 
 
 def get_config_shapes():
@@ -1287,8 +2089,7 @@ def get_config_shapes():
     Returns:
         shape_names (list)
     """
-    config_shape_info = fileUtils.jsonUtils.read(SHAPE_CONFIG_PATH)
-    return config_shape_info.keys()
+    return shapeLibraryUtils.get_shape_names(get_shape_library())
 
 
 # sub function
@@ -1305,34 +2106,34 @@ def _add_shape(ctrl, shape='cube', size=1, color=None, color_multiplier=1, shape
         shape_info(dict): if has custom shape node (like copy/paste), or load from file
     """
     if not shape_info:
-        shape_info = SHAPE_CONFIG[shape]  # get shape info from config
+        shape_info = shapeLibraryUtils.get_shape_info(get_shape_library(), shape)  # get shape info from library
 
     # get control shape name
     shape_name = namingUtils.update(ctrl, type='controlShape')
 
-    vis_plug = None
-    vis_attr = '{0}.{1}'.format(shape_name, attributeUtils.VISIBILITY)
+    # resize the shape from its bounding box center
+    control_vertices = shape_info['control_vertices']
+    if size != 1:
+        control_vertices = numpy.array(control_vertices, dtype=float)
+        pivot = (control_vertices.max(axis=0) + control_vertices.min(axis=0)) * 0.5
+        control_vertices = ((control_vertices - pivot) * size + pivot).tolist()
+
     if cmds.objExists(shape_name):
-        # check if it has visibility connected
-        vis_plug = cmds.listConnections(vis_attr, source=True, destination=False, plugs=True)
-        # delete existing shape node
-        cmds.delete(shape_name)
-
-    # create curve shape
-    crv_transform, crv_shape = curveUtils.create(ctrl, shape_info['control_vertices'], shape_info['knots'],
-                                                 degree=shape_info['degree'], form=shape_info['form'])
-    # rename control shape
-    cmds.rename(crv_shape, shape_name)
-    # connect visibility
-    if vis_plug:
-        cmds.connectAttr(vis_plug[0], vis_attr)
+        # update the existing shape, it keeps the connections
+        curveUtils.update_shape(shape_name, control_vertices, shape_info['knots'], degree=shape_info['degree'],
+                                form=shape_info['form'])
+    else:
+        # create curve shape
+        crv_transform, crv_shape = curveUtils.create(ctrl, control_vertices, shape_info['knots'],
+                                                     degree=shape_info['degree'], form=shape_info['form'])
+        # rename control shape
+        cmds.rename(crv_shape, shape_name)
 
     # set shape color
     if not color:
-        # use preset color if not given
-        side = namingUtils.decompose(ctrl)['side']
-        side_color_key = SIDE_CONFIG[side[0]]
-        color = COLOR_CONFIG[side_color_key]
+        # use palette color if not given, palette already dims sub controllers
+        color = paletteUtils.get_color(ctrl)
+        color_multiplier = 1
     elif isinstance(color, basestring):
         color = COLOR_CONFIG[color]
 
@@ -1341,9 +2142,6 @@ def _add_shape(ctrl, shape='cube', size=1, color=None, color_multiplier=1, shape
                                           color[1] * color_multiplier,
                                           color[2] * color_multiplier])
 
-    # resize the shape
-    if size != 1:
-        transform_shape(shape_name, scale=[size, size, size])
     # return shape node
     return shape_name
 
@@ -1378,3 +2176,224 @@ def _transfer_shape(source_ctrl, target_ctrl, size=1, color=False, color_multipl
 
     # add shape for the target controller
     return _add_shape(target_ctrl, size=size, color=color, color_multiplier=color_multiplier, shape_info=shape_info)
+
+
+def _get_matrix_inputs(ctrl, matrix_attr):
+    """
+    get input matrices for the mult matrix node computing the given controller's matrix attr
+
+    Args:
+        ctrl (str): controller's name
+        matrix_attr (str): PARTIAL_MATRIX_ATTR/LOCAL_MATRIX_ATTR/OUT_MATRIX_ATTR/HIERARCHY_MATRIX_ATTR
+
+    Returns:
+        input_matrices (list): input matrix attrs or values
+    """
+    if matrix_attr == PARTIAL_MATRIX_ATTR:
+        # the partial matrix is from output node to connect group,
+        # output is the first slot, the second slot is for sub, if not sub then use identity matrix
+        input_nodes = [get_hierarchy_node(ctrl, 'output'), get_hierarchy_node(ctrl, 'sub'), ctrl,
+                       get_hierarchy_node(ctrl, 'offset'), get_hierarchy_node(ctrl, 'sdk'),
+                       get_hierarchy_node(ctrl, 'connect')]
+    elif matrix_attr == LOCAL_MATRIX_ATTR:
+        # local matrix includes space and driven matrix
+        input_nodes = [None, get_hierarchy_node(ctrl, 'space'), get_hierarchy_node(ctrl, 'driven')]
+    elif matrix_attr == OUT_MATRIX_ATTR:
+        # out matrix includes zero matrix
+        input_nodes = [None, get_hierarchy_node(ctrl, 'zero')]
+    else:
+        # hierarchy matrix includes input matrix
+        return ['{0}.{1}'.format(ctrl, OUT_MATRIX_ATTR), '{0}.{1}'.format(ctrl, INPUT_MATRIX_ATTR)]
+
+    input_matrices = []
+    for node in input_nodes:
+        if node:
+            input_matrices.append('{0}.{1}'.format(node, attributeUtils.MATRIX))
+        else:
+            input_matrices.append(mathUtils.matrix.IDENTITY)
+
+    # plug the source matrix to the first slot
+    if matrix_attr == LOCAL_MATRIX_ATTR:
+        input_matrices[0] = '{0}.{1}'.format(ctrl, PARTIAL_MATRIX_ATTR)
+    elif matrix_attr == OUT_MATRIX_ATTR:
+        input_matrices[0] = '{0}.{1}'.format(ctrl, LOCAL_MATRIX_ATTR)
+
+    return input_matrices
+
+
+def _get_clone_names(zero, prototype, ctrl):
+    """
+    get duplicated prototype controller's nodes and their names for the given controller,
+    the clone's names are the prototype's names with the controller's side, description and index
+
+    Args:
+        zero (str): duplicated zero group, duplicated with renamed children so all nodes have unique names
+        prototype (str): prototype controller's name
+        ctrl (str): controller's name
+
+    Returns:
+        nodes (list): clone's nodes
+        names (list): clone's nodes new names
+    """
+    # get duplicated controller
+    clone = cmds.listConnections(zero + '.message', source=False, destination=True, plugs=False, type='joint')[0]
+
+    # clone's nodes are in the same order as the prototype's, so names can be updated from the prototype's names
+    nodes = _get_prototype_nodes(clone)
+    token_info = namingUtils.decompose(ctrl)
+    names = namingUtils.update_sequence(_get_prototype_nodes(prototype), side=token_info['side'],
+                                        index=token_info['index'], limb_index=token_info['limb_index'],
+                                        search=PROTOTYPE_DESCRIPTION, replace='_'.join(token_info['description']))
+    return nodes, names
+
+
+def _rename_nodes(nodes, names):
+    """
+    rename nodes with one mel call instead of one rename command for each node, it's still undoable
+
+    Args:
+        nodes (list): nodes need to be renamed, all short names must be unique,
+                      so renaming parents won't affect the children
+        names (list): new names
+    """
+    if nodes:
+        mel.eval(''.join(['rename "{0}" "{1}";'.format(node, name) for node, name in zip(nodes, names)]))
+
+
+def _snap_zero(zero, position):
+    """
+    snap controller's zero group to the given position, the scale is not matched,
+    the create function freezes the controller joint's transformation,
+    so controllers are always unit scale no matter they are created or duplicated
+
+    Args:
+        zero (str): controller's zero group
+        position (str/list): position to snap, same as the create function
+    """
+    transformUtils.set_position(zero, position, translate=True, rotate=True, scale=False, method='snap')
+
+
+def _get_prototype_nodes(ctrl):
+    """
+    get controller's hierarchy nodes, control shapes and matrix nodes in a fixed order,
+    used to match duplicated prototype nodes with the prototype's
+
+    Args:
+        ctrl (str): controller's name
+
+    Returns:
+        nodes (list): controller's nodes
+    """
+    connections = cmds.listConnections('{0}.{1}'.format(ctrl, HIERARCHY_ATTR), source=True, destination=False,
+                                       plugs=False, connections=True)
+    hierarchy_nodes = sorted(zip(connections[::2], connections[1::2]),
+                             key=lambda connection: int(connection[0].split('[')[-1][:-1]))
+    nodes = []
+    for plug, node in hierarchy_nodes:
+        nodes.append(node)
+        if HIERARCHY_NODES[int(plug.split('[')[-1][:-1])] in ['control', 'sub']:
+            nodes += cmds.listRelatives(node, shapes=True) or []
+
+    # matrix nodes are not in hierarchy
+    for network_info in MATRIX_NETWORK:
+        matrix_node = cmds.listConnections('{0}.{1}'.format(ctrl, network_info[0]), source=True, destination=False,
+                                           plugs=False)
+        if matrix_node:
+            nodes.append(matrix_node[0])
+    return nodes
+
+
+def _get_world_matrices(nodes):
+    """
+    get nodes world matrices in one api pass
+
+    Args:
+        nodes (list): transform nodes names
+
+    Returns:
+        matrices (numpy.ndarray): world matrices, shape is (nodes number, 4, 4)
+    """
+    dag_paths = apiUtils.MSelectionList.get_nodes_info(*nodes, info_type='MDagPath')
+    matrices = numpy.array([list(dag_path.inclusiveMatrix()) for dag_path in dag_paths], dtype=float)
+    return matrices.reshape(-1, 4, 4)
+
+
+def _get_tags(nodes):
+    """
+    get control tag nodes for given nodes in one call
+
+    Args:
+        nodes (list): nodes names
+
+    Returns:
+        tags (dict): node name and its tag node, untagged nodes are not included
+    """
+    connections = cmds.listConnections([n + '.message' for n in nodes], source=False, destination=True,
+                                       plugs=False, connections=True, type='controller')
+    tags = {}
+    if connections:
+        for plug, tag_node in zip(connections[::2], connections[1::2]):
+            tags.update({plug.split('.')[0]: tag_node})
+    return tags
+
+
+def _get_handle_name(handle):
+    """
+    get node name from MObjectHandle
+
+    Args:
+        handle (OpenMaya2.MObjectHandle): node's handle
+
+    Returns:
+        node_name (str): node's name, return None if the node is deleted
+    """
+    if not handle.isValid() or not handle.isAlive():
+        return None
+    m_obj = handle.object()
+    if m_obj.hasFn(OpenMaya2.MFn.kDagNode):
+        return OpenMaya2.MFnDagNode(m_obj).partialPathName()
+    return OpenMaya2.MFnDependencyNode(m_obj).name()
+
+
+def _get_controls(ctrls=None):
+    """
+    get controls and their sub controls
+
+    Args:
+        ctrls (list): controls names, default is None, will get all controls in the scene
+
+    Returns:
+        ctrls_all (list): controls and sub controls
+    """
+    if ctrls is None:
+        ctrls = cmds.ls('*.' + HIERARCHY_ATTR, objectsOnly=True) or []
+    if not ctrls:
+        return []
+    subs = cmds.listConnections(['{0}.{1}[7]'.format(c, HIERARCHY_ATTR) for c in ctrls], source=True,
+                                destination=False, plugs=False) or []
+    return list(ctrls) + subs
+
+
+def _get_sub_matrix_plugs(ctrl):
+    """
+    get mult matrix plugs for the sub controller's matrix, the partial mult matrix node
+    and the chain out mult matrix node both start with output and sub controller's matrices
+
+    Args:
+        ctrl (str): controller's name
+
+    Returns:
+        sub_plugs (list): mult matrix nodes' sub controller matrix plugs
+    """
+    output = get_hierarchy_node(ctrl, 'output')
+    sub_plugs = []
+    for matrix_attr in [PARTIAL_MATRIX_ATTR, OUT_MATRIX_ATTR]:
+        matrix_node = cmds.listConnections('{0}.{1}'.format(ctrl, matrix_attr), source=True, destination=False,
+                                           plugs=False)
+        if not matrix_node:
+            continue
+        first_input = cmds.listConnections(matrix_node[0] + '.matrixIn[0]', source=True, destination=False,
+                                           plugs=False)
+        if first_input and first_input[0] == output:
+            sub_plugs.append(matrix_node[0] + '.matrixIn[1]')
+    return sub_plugs
@@ -1,2 +1,4 @@
+import skinMirror
 import skinCluster
+import skinWeights
 import wire
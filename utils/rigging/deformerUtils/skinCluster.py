@@ -1,3 +1,5 @@
+import os
+import hashlib
 import warnings
 
 import numpy
@@ -10,10 +12,18 @@ import maya.api.OpenMayaAnim as OpenMayaAnim2
 import utils.common.namingUtils as namingUtils
 import utils.common.fileUtils as fileUtils
 import utils.common.apiUtils as apiUtils
+import utils.common.timeUtils as timeUtils
 import utils.modeling.meshUtils as meshUtils
 import utils.modeling.curveUtils as curveUtils
 import utils.modeling.surfaceUtils as surfaceUtils
 
+import skinMirror
+
+
+# constant
+# skin data hashes recorded for incremental export, saved in the export folder
+MANIFEST = 'skinManifest.json'
+
 
 # function
 # create/edit skin cluster
@@ -45,34 +55,41 @@ def create(geo, influence_objects, force=False):
     Returns:
         skin_cluster (str): skin cluster's name
     """
-    #  get current skin cluster
-    skin_cluster = get(geo)
-    if skin_cluster:
-        if not force:
-            warnings.warn(geo + ' already has a skin cluster attached, skipped')
-            return None
-        else:
-            # remove current skin cluster
-            cmds.delete(skin_cluster)
+    _create_missing_influences(influence_objects)
+    return _bind(geo, influence_objects, force=force)
 
-    missing_joints_group = '_MISS_INFLUENCES'
-    for inf_obj in influence_objects:
-        if not cmds.objExists(inf_obj):
-            # check if missing joints group exists
-            if not cmds.objExists(missing_joints_group):
-                # create missing joints group
-                cmds.createNode('transform', name=missing_joints_group)
-            # create missing joint
-            cmds.createNode('transform', name=inf_obj, parent=missing_joints_group)
 
-    # check if geometry name is follow naming convention
-    if namingUtils.check(geo):
-        skin_cluster = namingUtils.update(geo, type='skinCluster')
-    else:
-        skin_cluster = 'skin_' + geo
+@timeUtils.timer()
+def create_batch(geos, influence_objects, force=False):
+    """
+    create skin clusters for multiple geometries in one pass,
+    influences existence is checked once for all geometries
 
-    cmds.skinCluster(influence_objects, geo, toSelectedBones=True, name=skin_cluster)
-    return skin_cluster
+    Args:
+        geos (list): geometries' names
+        influence_objects (list/dict): influences shared by all geometries,
+                                       or a dictionary with each geometry's influences, like {geo: [influences]}
+        force (bool): if set to True, will delete current geometry's skin cluster, and bind with influences,
+                      default is False
+
+    Returns:
+        skin_clusters (list): skin clusters' names, None if the geometry is skipped
+    """
+    if isinstance(geos, basestring):
+        geos = [geos]
+    if not isinstance(influence_objects, dict):
+        influence_objects = {geo: influence_objects for geo in geos}
+
+    # collect all influences and check existence in one query
+    influence_objects_all = []
+    for geo in geos:
+        influence_objects_all += influence_objects[geo]
+    _create_missing_influences(influence_objects_all)
+
+    skin_clusters = []
+    for geo in geos:
+        skin_clusters.append(_bind(geo, influence_objects[geo], force=force))
+    return skin_clusters
 
 
 def transfer(source, targets, remove_unused=True, force=False):
@@ -102,17 +119,17 @@ def transfer(source, targets, remove_unused=True, force=False):
     if isinstance(targets, basestring):
         targets = [targets]
 
-    skin_cluster_target = []
-    for geo in targets:
-        # create skin cluster
-        skin = create(geo, inf_objs, force=force)
-        if skin:
-            cmds.copySkinWeights(sourceSkin=source_skin, destinationSkin=skin, noMirror=True,
-                                 surfaceAssociation='closestPoint', influenceAssociation=['label', 'oneToOne'],
-                                 normalize=True)
-            if remove_unused:
-                remove_unused_influence(skin)
-        skin_cluster_target.append(skin)
+    # create skin clusters for all targets
+    skin_cluster_target = create_batch(targets, inf_objs, force=force)
+
+    with timeUtils.Timer('skinCluster.transfer.copy_weights'):
+        for skin in skin_cluster_target:
+            if skin:
+                cmds.copySkinWeights(sourceSkin=source_skin, destinationSkin=skin, noMirror=True,
+                                     surfaceAssociation='closestPoint', influenceAssociation=['label', 'oneToOne'],
+                                     normalize=True)
+                if remove_unused:
+                    remove_unused_influence(skin)
 
     return skin_cluster_target
 
@@ -136,17 +153,33 @@ def get_influence_objects(skin_cluster, include_unused=True):
     return influence_objects
 
 
+@timeUtils.timer()
 def add_influence_objects(skin_cluster, influence_objects):
     """
-    add influence objects to the given skin cluster
+    add influence objects to the given skin cluster in one edit
     Args:
         skin_cluster (str): skin cluster name
         influence_objects (str/list): influence need to add to the skin cluster
     """
     if isinstance(influence_objects, basestring):
         influence_objects = [influence_objects]
-    for inf_obj in influence_objects:
-        cmds.skinCluster(skin_cluster, edit=True, addInfluence=inf_obj, weight=0, lockWeights=False)
+    if influence_objects:
+        cmds.skinCluster(skin_cluster, edit=True, addInfluence=influence_objects, weight=0, lockWeights=False)
+
+
+@timeUtils.timer()
+def remove_influence_objects(skin_cluster, influence_objects):
+    """
+    remove influence objects from the given skin cluster in one edit
+
+    Args:
+        skin_cluster (str): skin cluster name
+        influence_objects (str/list): influence need to be removed from the skin cluster
+    """
+    if isinstance(influence_objects, basestring):
+        influence_objects = [influence_objects]
+    if influence_objects:
+        cmds.skinCluster(skin_cluster, edit=True, removeInfluence=influence_objects)
 
 
 def remove_unused_influence(skin_cluster):
@@ -161,11 +194,10 @@ def remove_unused_influence(skin_cluster):
     # get influence objects with non zero weighting
     influence_objects_used = get_influence_objects(skin_cluster, include_unused=False)
 
-    # loop in each influence
-    for inf_obj in influence_objects:
-        # check if it has non zero weight, if not, remove it from skin cluster
-        if inf_obj not in influence_objects_used:
-            cmds.skinCluster(skin_cluster, edit=True, removeInfluence=inf_obj)
+    # remove influences don't have non zero weight
+    influence_objects_used = influence_objects_used or []
+    remove_influence_objects(skin_cluster, [inf_obj for inf_obj in influence_objects
+                                            if inf_obj not in influence_objects_used])
 
 
 def remove_bind_pose(skin_cluster):
@@ -186,9 +218,8 @@ def remove_bind_pose(skin_cluster):
 # skin cluster data
 def get_data(geo):
     """
-    get skin cluster weights values and influence objects list from given geometry's skin cluster
-
-    TODO: get blend weights data and skinning method
+    get skin cluster weights values and influence objects list from given geometry's skin cluster,
+    blend weights and skinning method are read through get_settings
 
     Args:
         geo (str): geometry need to get skin cluster data
@@ -208,24 +239,7 @@ def get_data(geo):
     # get MFnSkinCluster
     mfn_skin = get_MFnSkinCluster(skin)
 
-    # get weight array
-    m_dag, m_obj = _get_components_info(mfn_skin)
-    m_array_weight = mfn_skin.getWeights(m_dag, m_obj)
-    # convert weight array to numpy
-    array_weights = numpy.array(m_array_weight[0])
-
-    # get components number
-    inf_num = m_array_weight[1]
-    components_num = array_weights.size / m_array_weight[1]
-    # reshape numpy array base on components number and influence number
-    array_weights = array_weights.reshape((components_num, inf_num)).T
-
-    # get influence objects array
-    m_array_inf = mfn_skin.influenceObjects()
-    # get influence objects names as list
-    inf_objs = apiUtils.MArray.to_list(m_array_inf)
-
-    return array_weights, inf_objs
+    return _get_weights(mfn_skin)
 
 
 def to_dict(array_weights, influence_objects):
@@ -277,15 +291,17 @@ def to_array(skin_data):
     return array_weights, influence_objects
 
 
-def set_data(skin_cluster, array_weights, influence_objects):
+def set_data(skin_cluster, array_weights, influence_objects, normalize=True):
     """
-    set skin weights to the given skin cluster
-    TODO: set blend weights values and skinning method
+    set skin weights to the given skin cluster,
+    blend weights and skinning method are set through set_settings
+
     Args:
         skin_cluster (str): skin cluster name
         array_weights (numpy.ndarray): numpy matrix array, each column presents for influence object,
                                        and each row presents all components weight values for this influence
         influence_objects (list): influence objects names
+        normalize (bool): normalize weights when setting, default is True
     """
     mfn_skin = get_MFnSkinCluster(skin_cluster)
     m_dag, m_obj = _get_components_info(mfn_skin)
@@ -306,26 +322,194 @@ def set_data(skin_cluster, array_weights, influence_objects):
     # it need to be flatten in column major, skin cluster read in this order
     m_array_weights = OpenMaya2.MDoubleArray(array_weights.flatten('F').tolist())
     # set skin cluster
-    mfn_skin.setWeights(m_dag, m_obj, m_array_inf_order, m_array_weights, normalize=True, returnOldWeights=False)
+    mfn_skin.setWeights(m_dag, m_obj, m_array_inf_order, m_array_weights, normalize=normalize,
+                        returnOldWeights=False)
+
+
+def get_settings(geo):
+    """
+    get skin cluster's per component blend weights, skinning method, normalize weights mode,
+    and deformer membership from the given geometry's skin cluster
+
+    Args:
+        geo (str): geometry need to get skin cluster settings
+
+    Returns:
+        settings (dict): {'blend_weights': numpy.ndarray, blend weights for each member component,
+                          'skinning_method': int, 0 is classic linear, 1 is dual quaternion, 2 is weight blended,
+                          'normalize_weights': int, 0 is none, 1 is interactive, 2 is post,
+                          'components': numpy.ndarray/None, member components indices, None if all components}
+    """
+    skin = get(geo)
+    if not skin:
+        warnings.warn(geo + ' does not have a skin cluster attached, skipped')
+        return None
+
+    mfn_skin = get_MFnSkinCluster(skin)
+    return _get_settings(mfn_skin)
+
+
+def set_settings(skin_cluster, settings):
+    """
+    set skin cluster's blend weights, skinning method and normalize weights mode,
+    deformer membership need to be set before weights through set_components
+
+    Args:
+        skin_cluster (str): skin cluster name
+        settings (dict): skin cluster settings comes from get_settings
+    """
+    if settings.get('skinning_method') is not None:
+        cmds.setAttr(skin_cluster + '.skinningMethod', settings['skinning_method'])
+    if settings.get('normalize_weights') is not None:
+        cmds.setAttr(skin_cluster + '.normalizeWeights', settings['normalize_weights'])
+
+    blend_weights = settings.get('blend_weights')
+    if blend_weights is not None:
+        mfn_skin = get_MFnSkinCluster(skin_cluster)
+        m_dag, m_obj = _get_components_info(mfn_skin)
+        mfn_skin.setBlendWeights(m_dag, m_obj, OpenMaya2.MDoubleArray(numpy.asarray(blend_weights).tolist()))
+
+
+def set_components(skin_cluster, components):
+    """
+    set skin cluster's deformer membership, components not in the given indices will be removed from the deformer set,
+    only works on single indexed components (mesh vertices and curve cvs)
+
+    Args:
+        skin_cluster (str): skin cluster name
+        components (list/numpy.ndarray/None): member components indices, None for all components
+    """
+    if components is None:
+        return
+
+    mfn_skin = get_MFnSkinCluster(skin_cluster)
+    m_dag, m_obj = _get_components_info(mfn_skin)
+
+    # get current members and remove the ones not in the given components
+    components_remove = numpy.setdiff1d(_get_component_indices(m_dag, m_obj), components)
+    if not components_remove.size:
+        return
+
+    if m_dag.hasFn(OpenMaya2.MFn.kMesh):
+        component_type = OpenMaya2.MFn.kMeshVertComponent
+    else:
+        component_type = OpenMaya2.MFn.kCurveCVComponent
+    mfn_component = OpenMaya2.MFnSingleIndexedComponent()
+    m_obj_remove = mfn_component.create(component_type)
+    mfn_component.addElements(components_remove.tolist())
+    m_sel = OpenMaya2.MSelectionList()
+    m_sel.add((m_dag, m_obj_remove))
+    OpenMaya2.MFnSet(mfn_skin.deformerSet).removeMembers(m_sel)
 
 
 # import/export skin data
-def export_data(geo, file_path):
+def export_data(geo, file_path, incremental=False):
     """
     export skin cluster data to the given path
 
     Args:
         geo (str): geometry name
         file_path (str): file path to save the skin cluster
+        incremental (bool): only write the file if the skin data's hash differs from the one recorded in the
+                            manifest file next to it, default is False
+
+    Returns:
+        export (bool): True if the file has been written
     """
     skin_data = get_data(geo)
-    if skin_data:
-        # the skin data should contain weights array, influence objects and geometry name
-        skin_data = numpy.array([skin_data[0], skin_data[1], geo])
-        fileUtils.numpyUtils.write(file_path, skin_data)
+    if not skin_data:
+        return False
+    settings = get_settings(geo)
+    return _export_skin_data(geo, skin_data[0], skin_data[1], file_path, settings=settings, incremental=incremental)
+
+
+def export_all(folder, geos=None, incremental=True):
+    """
+    export all skin clusters' data in the scene to the given folder, each geometry saves as its own file,
+    all skin clusters are collected in one scene iteration
+
+    Args:
+        folder (str): folder path to save skin data files
+        geos (list): only export skin data for the given geometries if set, default is None
+        incremental (bool): only write files whose skin data changed since the last export, default is True
+
+    Returns:
+        export_files (list): file paths have been written
+    """
+    if isinstance(geos, basestring):
+        geos = [geos]
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    export_files = []
+    manifest = _read_manifest(folder)
+
+    m_it = OpenMaya2.MItDependencyNodes(OpenMaya2.MFn.kSkinClusterFilter)
+    while not m_it.isDone():
+        mfn_skin = OpenMayaAnim2.MFnSkinCluster(m_it.thisNode())
+        m_it.next()
+
+        # get geometry's transform name
+        m_geo = mfn_skin.getOutputGeometry()
+        if not m_geo:
+            continue
+        m_dag = OpenMaya2.MDagPath.getAPathTo(m_geo[0])
+        m_dag.pop()
+        geo = m_dag.partialPathName()
+        if geos and geo not in geos:
+            continue
+
+        array_weights, inf_objs = _get_weights(mfn_skin)
+        settings = _get_settings(mfn_skin)
+        file_path = os.path.join(folder, geo.replace('|', '_') + '.npy')
+        if _export_skin_data(geo, array_weights, inf_objs, file_path, settings=settings, incremental=incremental,
+                             manifest=manifest):
+            export_files.append(file_path)
+
+    if export_files:
+        fileUtils.jsonUtils.write(os.path.join(folder, MANIFEST), manifest, atomic=True)
+
+    return export_files
+
+
+def get_hash(geo, array_weights, influence_objects, settings=None):
+    """
+    get a hash string for the skin data, it contains geometry name, weights values, influence objects,
+    skin cluster settings and geometry topology
+
+    Args:
+        geo (str): geometry name
+        array_weights (numpy.ndarray): skin weights array
+        influence_objects (list): influence objects names
+        settings (dict): skin cluster settings comes from get_settings, default is None
+
+    Returns:
+        skin_hash (str)
+    """
+    md5 = hashlib.md5()
+    # geometry name is saved in the skin data, a renamed geometry needs to be exported again
+    md5.update(geo.encode('utf-8'))
+    md5.update(numpy.ascontiguousarray(array_weights, dtype=float).tobytes())
+    md5.update('|'.join(influence_objects).encode('utf-8'))
+    if settings:
+        for key in ['blend_weights', 'components']:
+            if settings[key] is not None:
+                md5.update(numpy.ascontiguousarray(settings[key]).tobytes())
+        md5.update('{0}_{1}'.format(settings['skinning_method'], settings['normalize_weights']).encode('utf-8'))
+
+    # mesh topology, curves and surfaces only need the components count, which is in the weights array shape
+    shape = geo
+    if cmds.objectType(shape) == 'transform':
+        shape = cmds.listRelatives(shape, shapes=True, noIntermediate=True)[0]
+    if cmds.objectType(shape) == 'mesh':
+        poly_count_array, poly_connects = meshUtils.get_MFnMesh(shape).getVertices()
+        md5.update(skinMirror.get_topology_hash(poly_count_array, poly_connects).encode('utf-8'))
+    md5.update(str(array_weights.shape).encode('utf-8'))
 
+    return md5.hexdigest()
 
-def import_data(file_path, geo=None, flip=False, force=False):
+
+def import_data(file_path, geo=None, flip=False, mirror=None, force=False):
     """
     import skin cluster data
 
@@ -334,6 +518,8 @@ def import_data(file_path, geo=None, flip=False, force=False):
         geo (str/None): if need to attach skin cluster to a different name geometry than the one in the skin data,
                         default is None
         flip (bool): if set to True, instead of using the given side, it will use the other side influences to bind skin
+        mirror (str): mirror weights spatially across x axis after import, 'positive' or 'negative' for the source side,
+                      only works on mesh, default is None
         force (bool): if set to True, will delete current geometry's skin cluster, and bind with influences,
                       default is False
 
@@ -355,13 +541,28 @@ def import_data(file_path, geo=None, flip=False, force=False):
     # flip influences
     if flip:
         skin_data[1] = namingUtils.flip_names(skin_data[1])
+
+    # get skin cluster settings, files exported before settings support only have three items
+    settings = None
+    if len(skin_data) > 3:
+        settings = skin_data[3]
+    components = None
+    if settings:
+        components = settings.get('components')
+
     # check influence number, if only one joint, do a rigid biped
     if len(skin_data[1]) == 1:
         skin_cluster = create(geo, skin_data[1], force=force)
+        if skin_cluster and settings:
+            set_components(skin_cluster, components)
+            set_settings(skin_cluster, settings)
         return skin_cluster
 
     # check geometry's component count
     skin_component_count = skin_data[0][0].size
+    if components is not None and len(components) != skin_component_count:
+        warnings.warn('{0} skin data members count does not match its weights, skipped'.format(geo))
+        return None
     shape = geo
     if cmds.objectType(shape) == 'transform':
         shape = cmds.listRelatives(shape, shapes=True)[0]
@@ -373,7 +574,12 @@ def import_data(file_path, geo=None, flip=False, force=False):
         geo_component_count = surfaceUtils.get_shape_info(shape)['num_cvs']
 
     # if components count not match, return
-    if skin_component_count != geo_component_count:
+    if components is not None:
+        if len(components) and components[-1] >= geo_component_count:
+            warnings.warn('{0} component count: {1} does not match the source members, skipped'.format(
+                geo, geo_component_count))
+            return None
+    elif skin_component_count != geo_component_count:
         warnings.warn('{0} component count: {1} does not match the source {2}, skipped'.format(geo,
                                                                                                geo_component_count,
                                                                                                skin_component_count))
@@ -386,8 +592,53 @@ def import_data(file_path, geo=None, flip=False, force=False):
         # geometry already has skin cluster, return
         return None
 
+    # set deformer membership before weights, weights only contain member components
+    set_components(skin_cluster, components)
+
     # set skin data
-    set_data(skin_cluster, skin_data[0], skin_data[1])
+    array_weights = skin_data[0]
+    influence_objects = skin_data[1]
+    if mirror and cmds.objectType(shape) == 'mesh':
+        if components is None:
+            array_weights, influence_objects = _mirror_weights(skin_cluster, shape, array_weights, influence_objects,
+                                                               direction=mirror)
+        else:
+            warnings.warn('{0} skin cluster does not deform all vertices, skipped mirroring'.format(geo))
+    normalize = True
+    if settings and settings.get('normalize_weights') == 0:
+        normalize = False
+    set_data(skin_cluster, array_weights, influence_objects, normalize=normalize)
+    if settings:
+        set_settings(skin_cluster, settings)
+    return skin_cluster
+
+
+# mirror skin data
+def mirror(geo, direction='positive', axis='x', tolerance=0.001, cache_dir=None):
+    """
+    mirror skin weights spatially on a symmetric mesh,
+    the mesh's symmetry map is cached by topology hash, so it only computes once for each topology
+
+    Args:
+        geo (str): mesh name
+        direction (str): mirror from 'positive' side to negative side, or from 'negative' side to positive side,
+                         default is 'positive'
+        axis (str): mirror axis, 'x', 'y' or 'z', default is 'x'
+        tolerance (float): maximum distance between the mirrored position and the matched vertex, default is 0.001
+        cache_dir (str): folder to cache the symmetry map, default is skinMirror.CACHE_DIR
+
+    Returns:
+        skin_cluster (str): skin cluster name
+    """
+    skin_data = get_data(geo)
+    if not skin_data:
+        return None
+
+    skin_cluster = get(geo)
+    array_weights, influence_objects = _mirror_weights(skin_cluster, geo, skin_data[0], skin_data[1],
+                                                       direction=direction, axis=axis, tolerance=tolerance,
+                                                       cache_dir=cache_dir)
+    set_data(skin_cluster, array_weights, influence_objects)
     return skin_cluster
 
 
@@ -410,6 +661,262 @@ def get_MFnSkinCluster(skin_cluster):
 
 
 # sub function
+def _create_missing_influences(influence_objects):
+    """
+    create transform nodes for influence objects not in the scene, existence is checked in one query first,
+    all missing influences are parented under the missing influences group
+
+    Args:
+        influence_objects (list): influence objects names
+    """
+    influence_objects_exist = set(cmds.ls(influence_objects) or [])
+    influence_objects_missing = []
+    for inf_obj in influence_objects:
+        if inf_obj in influence_objects_exist:
+            continue
+        influence_objects_exist.add(inf_obj)
+        # ls returns non unique names and some path forms differently from the given names,
+        # confirm each candidate so an existing influence is never created again
+        if not cmds.objExists(inf_obj):
+            influence_objects_missing.append(inf_obj)
+    if not influence_objects_missing:
+        return
+
+    missing_joints_group = '_MISS_INFLUENCES'
+    # check if missing joints group exists
+    if not cmds.objExists(missing_joints_group):
+        # create missing joints group
+        cmds.createNode('transform', name=missing_joints_group)
+    # create missing joints
+    for inf_obj in influence_objects_missing:
+        cmds.createNode('transform', name=inf_obj, parent=missing_joints_group)
+
+
+def _bind(geo, influence_objects, force=False):
+    """
+    bind geometry with given influences, all influences should exist in the scene
+
+    Args:
+        geo (str): geometry's name
+        influence_objects (list): influences contribute to the skin cluster
+        force (bool): if set to True, will delete current geometry's skin cluster, and bind with influences,
+                      default is False
+
+    Returns:
+        skin_cluster (str): skin cluster's name
+    """
+    #  get current skin cluster
+    skin_cluster = get(geo)
+    if skin_cluster:
+        if not force:
+            warnings.warn(geo + ' already has a skin cluster attached, skipped')
+            return None
+        else:
+            # remove current skin cluster
+            cmds.delete(skin_cluster)
+
+    # check if geometry name is follow naming convention
+    if namingUtils.check(geo):
+        skin_cluster = namingUtils.update(geo, type='skinCluster')
+    else:
+        skin_cluster = 'skin_' + geo
+
+    cmds.skinCluster(influence_objects, geo, toSelectedBones=True, name=skin_cluster)
+    return skin_cluster
+
+
+def _get_weights(mfn_skin):
+    """
+    get weights array and influence objects from MFnSkinCluster
+
+    Args:
+        mfn_skin (MFnSkinCluster): maya.api.OpenMaya MFnSkinCluster object
+
+    Returns:
+        weights (numpy.ndarray): skin weights array, each row presents an influence object
+        influence_objects (list): a list of influence objects names
+    """
+    # get weight array
+    m_dag, m_obj = _get_components_info(mfn_skin)
+    m_array_weight = mfn_skin.getWeights(m_dag, m_obj)
+    # convert weight array to numpy
+    array_weights = numpy.array(m_array_weight[0])
+
+    # get components number
+    inf_num = m_array_weight[1]
+    components_num = array_weights.size / m_array_weight[1]
+    # reshape numpy array base on components number and influence number
+    array_weights = array_weights.reshape((components_num, inf_num)).T
+
+    # get influence objects array
+    m_array_inf = mfn_skin.influenceObjects()
+    # get influence objects names as list
+    inf_objs = apiUtils.MArray.to_list(m_array_inf)
+
+    return array_weights, inf_objs
+
+
+def _get_settings(mfn_skin):
+    """
+    get skin cluster settings from MFnSkinCluster, blend weights are read in one bulk call
+
+    Args:
+        mfn_skin (MFnSkinCluster): maya.api.OpenMaya MFnSkinCluster object
+
+    Returns:
+        settings (dict): skin cluster settings, check get_settings for details
+    """
+    m_dag, m_obj = _get_components_info(mfn_skin)
+    blend_weights = numpy.array(mfn_skin.getBlendWeights(m_dag, m_obj))
+
+    # get member components indices, None if the skin cluster deforms all components
+    components = None
+    if not m_obj.isNull() and m_obj.hasFn(OpenMaya2.MFn.kSingleIndexedComponent) and \
+            not OpenMaya2.MFnSingleIndexedComponent(m_obj).isComplete:
+        components = _get_component_indices(m_dag, m_obj)
+        # the component may not be flagged as complete even it contains all components
+        if len(components) == blend_weights.size and \
+                _get_component_count(m_dag) == len(components):
+            components = None
+
+    settings = {'blend_weights': blend_weights,
+                'skinning_method': mfn_skin.findPlug('skinningMethod', False).asInt(),
+                'normalize_weights': mfn_skin.findPlug('normalizeWeights', False).asInt(),
+                'components': components}
+    return settings
+
+
+def _get_component_indices(m_dag, m_obj):
+    """
+    get sorted component indices from single indexed component MObject
+
+    Args:
+        m_dag (MDagPath): geometry's MDagPath
+        m_obj (MObject): single indexed component MObject, null or complete component means all components
+
+    Returns:
+        indices (numpy.ndarray)
+    """
+    if m_obj.isNull() or OpenMaya2.MFnSingleIndexedComponent(m_obj).isComplete:
+        return numpy.arange(_get_component_count(m_dag))
+    return numpy.sort(numpy.array(OpenMaya2.MFnSingleIndexedComponent(m_obj).getElements(), dtype=numpy.int64))
+
+
+def _get_component_count(m_dag):
+    """
+    get geometry's single indexed components count, vertices for mesh and cvs for curve
+
+    Args:
+        m_dag (MDagPath): geometry's MDagPath
+
+    Returns:
+        count (int)
+    """
+    if m_dag.hasFn(OpenMaya2.MFn.kMesh):
+        return OpenMaya2.MFnMesh(m_dag).numVertices
+    return OpenMaya2.MFnNurbsCurve(m_dag).numCVs
+
+
+def _export_skin_data(geo, array_weights, influence_objects, file_path, settings=None, incremental=False,
+                      manifest=None):
+    """
+    write skin data to the given path, skip if incremental and the hash matches the manifest record
+
+    Args:
+        geo (str): geometry name
+        array_weights (numpy.ndarray): skin weights array
+        influence_objects (list): influence objects names
+        file_path (str): file path to save the skin cluster
+        settings (dict): skin cluster settings comes from get_settings, default is None
+        incremental (bool): skip writing if skin data not changed, default is False
+        manifest (dict): manifest data to check and update, will read and write the manifest file next to the
+                         given path if None, default is None
+
+    Returns:
+        export (bool): True if the file has been written
+    """
+    if not file_path.endswith('.npy'):
+        file_path += '.npy'
+    folder, file_name = os.path.split(file_path)
+
+    save_manifest = manifest is None
+    if save_manifest:
+        manifest = _read_manifest(folder)
+
+    skin_hash = get_hash(geo, array_weights, influence_objects, settings=settings)
+    if incremental and manifest.get(file_name) == skin_hash and os.path.isfile(file_path):
+        return False
+
+    # the skin data should contain weights array, influence objects, geometry name and skin cluster settings,
+    # assign each item individually so numpy won't try to broadcast them
+    skin_data = numpy.empty(4, dtype=object)
+    skin_data[0] = array_weights
+    skin_data[1] = influence_objects
+    skin_data[2] = geo
+    skin_data[3] = settings
+    fileUtils.numpyUtils.write(file_path, skin_data, atomic=True)
+
+    manifest.update({file_name: skin_hash})
+    if save_manifest:
+        fileUtils.jsonUtils.write(os.path.join(folder, MANIFEST), manifest, atomic=True)
+    return True
+
+
+def _read_manifest(folder):
+    """
+    read skin data manifest from the given folder
+
+    Args:
+        folder (str): skin data folder
+
+    Returns:
+        manifest (dict): file names and skin data hashes
+    """
+    manifest_path = os.path.join(folder, MANIFEST)
+    if os.path.isfile(manifest_path):
+        return fileUtils.jsonUtils.read(manifest_path)
+    return {}
+
+
+def _mirror_weights(skin_cluster, mesh, array_weights, influence_objects, direction='positive', axis='x',
+                    tolerance=0.001, cache_dir=None):
+    """
+    mirror skin weights array with the mesh's cached symmetry map,
+    flipped influences missing in the skin cluster will be added,
+    flipped influences don't exist in the scene are skipped, and the weights are mirrored to the source influences
+
+    Args:
+        skin_cluster (str): skin cluster name
+        mesh (str): mesh name
+        array_weights (numpy.ndarray): skin weights array
+        influence_objects (list): influence objects names
+        direction (str): 'positive' or 'negative', default is 'positive'
+        axis (str): mirror axis, default is 'x'
+        tolerance (float): symmetry map tolerance, default is 0.001
+        cache_dir (str): folder to cache the symmetry map, default is None
+
+    Returns:
+        array_weights (numpy.ndarray): mirrored skin weights array
+        influence_objects (list): influence objects names
+    """
+    symmetry_map, side_map = skinMirror.get_mesh_symmetry_map(mesh, axis=axis, tolerance=tolerance,
+                                                              cache_dir=cache_dir)
+    # flipped influences don't exist in the scene can't be added to the skin cluster
+    missing = [inf_flip for inf_flip in namingUtils.flip_names(influence_objects)
+               if inf_flip not in influence_objects and not cmds.objExists(inf_flip)]
+    if missing:
+        warnings.warn('flipped influences: {0} do not exist, mirrored weights to the source influences'.format(
+            ', '.join(missing)))
+    array_weights, influence_objects_mirror = skinMirror.mirror_weights(array_weights, influence_objects,
+                                                                        symmetry_map, side_map, direction=direction,
+                                                                        missing=missing)
+    # add missing flipped influences
+    influence_objects_add = influence_objects_mirror[len(influence_objects):]
+    if influence_objects_add:
+        add_influence_objects(skin_cluster, influence_objects_add)
+    return array_weights, influence_objects_mirror
+
+
 def _get_components_info(mfn_skin):
     """
     get MDagPath and MObject for components attached to the skin cluster
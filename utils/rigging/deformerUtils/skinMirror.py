@@ -0,0 +1,192 @@
+import os
+import hashlib
+import tempfile
+import warnings
+
+import numpy
+
+import utils.common.namingUtils as namingUtils
+import utils.common.fileUtils as fileUtils
+import utils.modeling.meshUtils as meshUtils
+
+
+# constant
+AXIS = {'x': 0, 'y': 1, 'z': 2}
+# default folder to cache symmetry maps, each map is saved as the mesh topology hash
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'skinSymmetry')
+
+
+# function
+# symmetry map
+def get_topology_hash(poly_count_array, poly_connects):
+    """
+    get a hash string for the mesh topology, meshes share the same topology will get the same hash
+
+    Args:
+        poly_count_array (list/numpy.ndarray): vertices number for each polygon
+        poly_connects (list/numpy.ndarray): vertices indices for each polygon
+
+    Returns:
+        topology_hash (str)
+    """
+    md5 = hashlib.md5()
+    md5.update(numpy.asarray(poly_count_array, dtype=numpy.int32).tobytes())
+    md5.update(numpy.asarray(poly_connects, dtype=numpy.int32).tobytes())
+    return md5.hexdigest()
+
+
+def get_symmetry_map(points, axis='x', tolerance=0.001):
+    """
+    get each vertex's mirrored vertex index across the given axis,
+    it uses a spatial hash grid, so each vertex only compares with vertices in its neighbour cells
+
+    Args:
+        points (list/numpy.ndarray): mesh vertices positions
+        axis (str): mirror axis, 'x', 'y' or 'z', default is 'x'
+        tolerance (float): maximum distance between the mirrored position and the matched vertex, default is 0.001
+
+    Returns:
+        symmetry_map (numpy.ndarray): mirrored vertex index for each vertex, -1 if no vertex found
+        side_map (numpy.ndarray): vertex side on the mirror axis, 1 for positive, -1 for negative, 0 for center
+    """
+    axis = AXIS.get(axis, axis)
+    points = numpy.asarray(points, dtype=float)[:, :3]
+    points_mirror = points.copy()
+    points_mirror[:, axis] *= -1
+
+    # get grid cells for vertices and mirrored positions,
+    # cell size is twice of the tolerance, so a match can only be in the same cell or the nearer neighbour cell
+    cell_size = tolerance * 2.0
+    cells = numpy.floor(points / cell_size).astype(numpy.int64)
+    cells_mirror_float = points_mirror / cell_size
+    cells_mirror = numpy.floor(cells_mirror_float).astype(numpy.int64)
+    cells_near = numpy.where(cells_mirror_float - cells_mirror < 0.5, -1, 1)
+    # encode cells as single integer keys, offset by one cell so neighbour cells stay in range
+    cell_min = numpy.minimum(cells.min(axis=0), cells_mirror.min(axis=0)) - 1
+    cell_dim = numpy.maximum(cells.max(axis=0), cells_mirror.max(axis=0)) - cell_min + 2
+    keys = _encode_cells(cells - cell_min, cell_dim)
+    index_sort = numpy.argsort(keys)
+    keys_sort = keys[index_sort]
+
+    symmetry_map = numpy.full(len(points), -1, dtype=numpy.int64)
+    distance_map = numpy.full(len(points), tolerance, dtype=float)
+
+    # search the 8 cells overlapping each mirrored position's tolerance range
+    for offset in numpy.indices((2, 2, 2)).reshape(3, -1).T:
+        keys_search = _encode_cells(cells_mirror - cell_min + cells_near * offset, cell_dim)
+        index_start = numpy.searchsorted(keys_sort, keys_search, side='left')
+        index_end = numpy.searchsorted(keys_sort, keys_search, side='right')
+        # loop in each point sharing the same cell, normally only one
+        for i in range(int((index_end - index_start).max())):
+            valid = numpy.nonzero(index_start + i < index_end)[0]
+            candidates = index_sort[index_start[valid] + i]
+            distance = numpy.linalg.norm(points[candidates] - points_mirror[valid], axis=1)
+            closer = distance <= distance_map[valid]
+            symmetry_map[valid[closer]] = candidates[closer]
+            distance_map[valid[closer]] = distance[closer]
+
+    side_map = numpy.sign(points[:, axis]).astype(numpy.int8)
+    side_map[numpy.abs(points[:, axis]) <= tolerance] = 0
+
+    unmatched = numpy.count_nonzero(symmetry_map < 0)
+    if unmatched:
+        warnings.warn('{0} vertices can not find mirrored vertex in tolerance {1}'.format(unmatched, tolerance))
+
+    return symmetry_map, side_map
+
+
+def get_mesh_symmetry_map(mesh, axis='x', tolerance=0.001, cache_dir=None, force=False):
+    """
+    get the given mesh's symmetry map, the map will be cached on disk by the mesh topology hash,
+    so all meshes share the same topology only need to compute once
+
+    Args:
+        mesh (str): mesh's shape node or transform node
+        axis (str): mirror axis, 'x', 'y' or 'z', default is 'x'
+        tolerance (float): maximum distance between the mirrored position and the matched vertex, default is 0.001
+        cache_dir (str): folder to cache the symmetry map, default is CACHE_DIR
+        force (bool): recompute the symmetry map even if it is cached, default is False
+
+    Returns:
+        symmetry_map (numpy.ndarray): mirrored vertex index for each vertex, -1 if no vertex found
+        side_map (numpy.ndarray): vertex side on the mirror axis, 1 for positive, -1 for negative, 0 for center
+    """
+    mesh_info = meshUtils.get_shape_info(mesh, as_numpy=True)
+    topology_hash = get_topology_hash(mesh_info['poly_count_array'], mesh_info['poly_connects'])
+
+    if not cache_dir:
+        cache_dir = CACHE_DIR
+    cache_path = os.path.join(cache_dir, '{0}_{1}_{2}.npy'.format(topology_hash, axis, tolerance))
+
+    if os.path.isfile(cache_path) and not force:
+        symmetry_data = fileUtils.numpyUtils.read(cache_path)
+        return symmetry_data[0], symmetry_data[1].astype(numpy.int8)
+
+    symmetry_map, side_map = get_symmetry_map(mesh_info['points_array'], axis=axis, tolerance=tolerance)
+
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    # write to a temp file first, so an interrupted write never leaves a corrupted cache
+    fileUtils.numpyUtils.write(cache_path, numpy.vstack((symmetry_map, side_map)), atomic=True)
+
+    return symmetry_map, side_map
+
+
+# mirror weights
+def mirror_weights(array_weights, influence_objects, symmetry_map, side_map, direction='positive', missing=None):
+    """
+    mirror skin weights from one side of the mesh to the other,
+    weights are permuted by the symmetry map, and left/right influences are swapped
+
+    Args:
+        array_weights (numpy.ndarray): skin weights array comes from skinCluster.get_data
+        influence_objects (list): influence objects names
+        symmetry_map (numpy.ndarray): mirrored vertex index for each vertex, comes from get_symmetry_map
+        side_map (numpy.ndarray): vertex side on the mirror axis, comes from get_symmetry_map
+        direction (str): mirror from 'positive' side to negative side, or from 'negative' side to positive side,
+                         default is 'positive'
+        missing (list): flipped influences can't be added, weights will be mirrored to the source influences instead,
+                        default is None
+
+    Returns:
+        array_weights (numpy.ndarray): mirrored skin weights array
+        influence_objects (list): influence objects names, flipped influences not in the given list will be added
+    """
+    influence_objects = list(influence_objects)
+    missing = missing or []
+
+    # get flipped influence for each influence, add the missing ones with zero weights
+    influence_flip = namingUtils.flip_names(influence_objects)
+    for inf_obj in influence_flip:
+        if inf_obj not in influence_objects and inf_obj not in missing:
+            influence_objects.append(inf_obj)
+    array_weights = numpy.vstack((array_weights, numpy.zeros((len(influence_objects) - len(array_weights),
+                                                               array_weights.shape[1]))))
+    influence_flip = namingUtils.flip_names(influence_objects)
+    # influences can't be flipped map back to themselves
+    index_flip = [influence_objects.index(inf_flip) if inf_flip in influence_objects else i
+                  for i, inf_flip in enumerate(influence_flip)]
+
+    # get destination vertices
+    side = -1 if direction == 'positive' else 1
+    destination = numpy.nonzero((side_map == side) & (symmetry_map >= 0))[0]
+
+    array_mirror = array_weights.copy()
+    array_mirror[:, destination] = array_weights[index_flip][:, symmetry_map[destination]]
+
+    return array_mirror, influence_objects
+
+
+# sub function
+def _encode_cells(cells, cell_dim):
+    """
+    encode 3d grid cells indices to single integer keys
+
+    Args:
+        cells (numpy.ndarray): grid cells indices
+        cell_dim (numpy.ndarray): grid dimension on each axis
+
+    Returns:
+        keys (numpy.ndarray)
+    """
+    return (cells[:, 0] * cell_dim[1] + cells[:, 1]) * cell_dim[2] + cells[:, 2]
@@ -0,0 +1,304 @@
+import warnings
+
+import numpy
+
+import maya.cmds as cmds
+
+import utils.modeling.meshUtils as meshUtils
+
+import skinCluster
+
+
+# constant
+# maximum number of float values gathered at once when averaging neighbour weights,
+# smoothing is done in influence blocks so big meshes won't allocate edges * influences values in one go
+SMOOTH_BLOCK_SIZE = 4000000
+
+# components' weights sum further than this value from 1 are treated as not normalized
+NORMALIZE_TOLERANCE = 1e-6
+
+
+# function
+# weights processing, all functions take the weights array in the same layout as skinCluster.get_data,
+# each row presents an influence object, and each column presents a component
+def normalize(array_weights, locked=None):
+    """
+    normalize skin weights, so each component's weights sum up to 1,
+    locked influences keep their values, and the unlocked influences share the rest,
+    components whose locked weights can't be balanced by the unlocked ones are renormalized including the locked weights
+
+    Args:
+        array_weights (numpy.ndarray): skin weights array comes from skinCluster.get_data
+        locked (list/numpy.ndarray): locked influences mask, each item presents an influence row, default is None
+
+    Returns:
+        array_weights (numpy.ndarray): normalized skin weights array
+    """
+    array_weights = numpy.array(array_weights, dtype=float)
+    locked = _get_locked_mask(locked, array_weights.shape[0])
+    unlocked = ~locked
+
+    # get the weight left for unlocked influences
+    remain = numpy.clip(1.0 - array_weights[locked].sum(axis=0), 0, 1)
+    unlocked_sum = array_weights[unlocked].sum(axis=0)
+
+    # skip components with no unlocked weights, nothing can be normalized there
+    valid = unlocked_sum > 0
+    scale = numpy.zeros(unlocked_sum.shape)
+    scale[valid] = remain[valid] / unlocked_sum[valid]
+
+    array_weights[unlocked] *= scale
+
+    # locked weights can't be balanced by the unlocked ones if they sum up over 1,
+    # or all unlocked weights are zero, renormalize those components including the locked weights
+    weights_sum = array_weights.sum(axis=0)
+    invalid = (weights_sum > 0) & (numpy.abs(weights_sum - 1) > NORMALIZE_TOLERANCE)
+    if invalid.any():
+        warnings.warn('{0} components can not be normalized with the locked influences, '
+                      'renormalized including the locked weights'.format(numpy.count_nonzero(invalid)))
+        array_weights[:, invalid] /= weights_sum[invalid]
+    return array_weights
+
+
+def prune(array_weights, threshold=0.001, locked=None, normalize_weights=True):
+    """
+    remove weights smaller than the threshold,
+    each component will always keep its biggest influence, so no component ends up with no weights
+
+    Args:
+        array_weights (numpy.ndarray): skin weights array comes from skinCluster.get_data
+        threshold (float): weights smaller than this value will be set to 0, default is 0.001
+        locked (list/numpy.ndarray): locked influences mask, locked influences won't be pruned, default is None
+        normalize_weights (bool): normalize weights after pruning, default is True
+
+    Returns:
+        array_weights (numpy.ndarray): pruned skin weights array
+    """
+    array_weights = numpy.array(array_weights, dtype=float)
+    locked = _get_locked_mask(locked, array_weights.shape[0])
+
+    # get weights need to be removed
+    remove = array_weights < threshold
+    remove[locked] = False
+    # keep the biggest influence for each component
+    remove[array_weights.argmax(axis=0), numpy.arange(array_weights.shape[1])] = False
+
+    array_weights[remove] = 0
+    if normalize_weights:
+        array_weights = normalize(array_weights, locked=locked)
+    return array_weights
+
+
+def limit_influences(array_weights, max_influences=4, locked=None, normalize_weights=True):
+    """
+    only keep the biggest weights for each component, normally used to cap influences for game export
+
+    Args:
+        array_weights (numpy.ndarray): skin weights array comes from skinCluster.get_data
+        max_influences (int): maximum influences number for each component, default is 4
+        locked (list/numpy.ndarray): locked influences mask, locked influences will always be kept,
+                                     and count into the max influences number, default is None
+        normalize_weights (bool): normalize weights after removing influences, default is True
+
+    Returns:
+        array_weights (numpy.ndarray): capped skin weights array
+    """
+    array_weights = numpy.array(array_weights, dtype=float)
+    inf_num, components_num = array_weights.shape
+    locked = _get_locked_mask(locked, inf_num)
+
+    if numpy.count_nonzero(locked) > max_influences:
+        warnings.warn('locked influences number: {0} is over the max influences: {1}, '
+                      'all locked influences are kept'.format(numpy.count_nonzero(locked), max_influences))
+
+    if inf_num > max_influences:
+        # locked influences are always selected
+        array_sort = array_weights.copy()
+        array_sort[locked] = numpy.inf
+        # get the biggest weights indices for each component, no need to sort the whole array
+        index_keep = numpy.argpartition(-array_sort, max_influences - 1, axis=0)[:max_influences]
+
+        keep = numpy.zeros(array_weights.shape, dtype=bool)
+        keep[index_keep, numpy.arange(components_num)] = True
+        keep[locked] = True
+        array_weights[~keep] = 0
+
+    if normalize_weights:
+        array_weights = normalize(array_weights, locked=locked)
+    return array_weights
+
+
+def smooth(array_weights, adjacency, iterations=1, factor=0.5, locked=None, normalize_weights=True):
+    """
+    laplacian smooth skin weights, each component's weights blend to its neighbours' average weights
+
+    Args:
+        array_weights (numpy.ndarray): skin weights array comes from skinCluster.get_data
+        adjacency (list): components adjacency comes from get_adjacency function
+        iterations (int): smooth iterations, default is 1
+        factor (float): blend factor to the neighbours' average weights, default is 0.5
+        locked (list/numpy.ndarray): locked influences mask, locked influences won't be smoothed, default is None
+        normalize_weights (bool): normalize weights after smoothing, default is True
+
+    Returns:
+        array_weights (numpy.ndarray): smoothed skin weights array
+    """
+    array_weights = numpy.array(array_weights, dtype=float)
+    locked = _get_locked_mask(locked, array_weights.shape[0])
+    neighbors, neighbor_offsets = adjacency
+
+    # get components have neighbours, reduceat needs non empty segments
+    neighbor_count = numpy.diff(neighbor_offsets)
+    connected = numpy.nonzero(neighbor_count)[0]
+    if not neighbors.size or not connected.size:
+        return array_weights
+    segments = neighbor_offsets[connected]
+    neighbor_count = neighbor_count[connected].astype(float)
+
+    index_unlocked = numpy.nonzero(~locked)[0]
+    block_size = max(1, SMOOTH_BLOCK_SIZE // neighbors.size)
+
+    for _ in range(iterations):
+        for i in range(0, index_unlocked.size, block_size):
+            index_block = index_unlocked[i: i + block_size]
+            array_block = array_weights[index_block]
+            # sum up neighbours weights for each component
+            neighbor_average = numpy.add.reduceat(array_block[:, neighbors], segments, axis=1) / neighbor_count
+            array_block[:, connected] += (neighbor_average - array_block[:, connected]) * factor
+            array_weights[index_block] = array_block
+        if normalize_weights:
+            array_weights = normalize(array_weights, locked=locked)
+
+    return array_weights
+
+
+def get_adjacency(poly_count_array, poly_connects, num_vertices=None):
+    """
+    get mesh vertices adjacency from polygons info, which comes from meshUtils.get_shape_info
+
+    Args:
+        poly_count_array (list/numpy.ndarray): vertices number for each polygon
+        poly_connects (list/numpy.ndarray): vertices indices for each polygon
+        num_vertices (int): mesh's vertices number, will use the biggest vertex index if not given
+
+    Returns:
+        adjacency (list): [neighbors, neighbor_offsets],
+                          neighbors(numpy.ndarray): all vertices' neighbours indices,
+                          neighbor_offsets(numpy.ndarray): each vertex's neighbours start index in neighbors,
+                                                           vertex i's neighbours are
+                                                           neighbors[neighbor_offsets[i]: neighbor_offsets[i + 1]]
+    """
+    poly_count_array = numpy.asarray(poly_count_array, dtype=numpy.int64)
+    poly_connects = numpy.asarray(poly_connects, dtype=numpy.int64)
+    if num_vertices is None:
+        num_vertices = int(poly_connects.max()) + 1 if poly_connects.size else 0
+
+    # get the next vertex in the same polygon for each polygon vertex, which forms the polygon edges
+    poly_ends = numpy.cumsum(poly_count_array)
+    poly_starts = numpy.repeat(poly_ends - poly_count_array, poly_count_array)
+    index_next = numpy.arange(1, poly_connects.size + 1)
+    loop_back = index_next == numpy.repeat(poly_ends, poly_count_array)
+    index_next[loop_back] = poly_starts[loop_back]
+
+    # edges in both directions, remove shared edges between polygons
+    edge_start = numpy.concatenate((poly_connects, poly_connects[index_next]))
+    edge_end = numpy.concatenate((poly_connects[index_next], poly_connects))
+    edges = numpy.unique(edge_start * num_vertices + edge_end)
+    edge_start = edges // num_vertices
+    neighbors = edges % num_vertices
+
+    neighbor_offsets = numpy.zeros(num_vertices + 1, dtype=numpy.int64)
+    neighbor_offsets[1:] = numpy.cumsum(numpy.bincount(edge_start, minlength=num_vertices))
+
+    return [neighbors, neighbor_offsets]
+
+
+# skin cluster
+def get_locked_influences(influence_objects):
+    """
+    get influence objects with lock weights turned on
+
+    Args:
+        influence_objects (list): influence objects names
+
+    Returns:
+        locked_influences (list): locked influence objects
+    """
+    locked_influences = []
+    for inf_obj in influence_objects:
+        if cmds.attributeQuery('lockInfluenceWeights', node=inf_obj, exists=True) and \
+                cmds.getAttr(inf_obj + '.lockInfluenceWeights'):
+            locked_influences.append(inf_obj)
+    return locked_influences
+
+
+def process(geo, max_influences=None, threshold=None, smooth_iterations=0, smooth_factor=0.5, locked=None):
+    """
+    process the given geometry's skin weights and set them back to the skin cluster in one call,
+    steps are smooth, prune, then limit influences, weights will be normalized at the end
+
+    Args:
+        geo (str): geometry name
+        max_influences (int): maximum influences number for each component, skip if None, default is None
+        threshold (float): prune weights smaller than the threshold, skip if None, default is None
+        smooth_iterations (int): smooth iterations, only works on mesh, default is 0
+        smooth_factor (float): blend factor to the neighbours' average weights, default is 0.5
+        locked (list): locked influence objects, will use the influences' lock weights attribute if None,
+                       default is None
+
+    Returns:
+        skin_cluster (str): skin cluster name
+    """
+    skin_data = skinCluster.get_data(geo)
+    if not skin_data:
+        return None
+    array_weights, influence_objects = skin_data
+
+    # get locked influences mask
+    if locked is None:
+        locked = get_locked_influences(influence_objects)
+    locked = numpy.array([inf_obj in locked for inf_obj in influence_objects], dtype=bool)
+
+    if smooth_iterations:
+        shape = geo
+        if cmds.objectType(shape) == 'transform':
+            shape = cmds.listRelatives(shape, shapes=True)[0]
+        if cmds.objectType(shape) == 'mesh':
+            mesh_info = meshUtils.get_shape_info(shape, as_numpy=True)
+            adjacency = get_adjacency(mesh_info['poly_count_array'], mesh_info['poly_connects'],
+                                      num_vertices=mesh_info['num_vertices'])
+            array_weights = smooth(array_weights, adjacency, iterations=smooth_iterations, factor=smooth_factor,
+                                   locked=locked, normalize_weights=False)
+        else:
+            warnings.warn('smooth weights only works on mesh, {0} skipped smoothing'.format(geo))
+
+    if threshold is not None:
+        array_weights = prune(array_weights, threshold=threshold, locked=locked, normalize_weights=False)
+
+    if max_influences is not None:
+        array_weights = limit_influences(array_weights, max_influences=max_influences, locked=locked,
+                                         normalize_weights=False)
+
+    array_weights = normalize(array_weights, locked=locked)
+
+    # set weights back in one call
+    skin = skinCluster.get(geo)
+    skinCluster.set_data(skin, array_weights, influence_objects)
+    return skin
+
+
+# sub function
+def _get_locked_mask(locked, inf_num):
+    """
+    get locked influences as boolean mask
+
+    Args:
+        locked (list/numpy.ndarray/None): locked influences mask
+        inf_num (int): influences number
+
+    Returns:
+        locked_mask (numpy.ndarray)
+    """
+    if locked is None:
+        return numpy.zeros(inf_num, dtype=bool)
+    return numpy.asarray(locked, dtype=bool)
@@ -117,7 +117,8 @@ def create_chain(positions, names, rotate_order=0, visibility=True, reverse=Fals
 
 
 def create_along_curve(curve, number, additional_description=None, aim_vector=None, up_vector=None, up_curve=None,
-                       aim_type='tangent', flip_check=True, parent_node=None, chain=True, label=True):
+                       aim_type='tangent', flip_check=True, parent_node=None, chain=True, label=True,
+                       parallel_transport=False):
     """
     create joints evenly along given curve
     Args:
@@ -133,13 +134,16 @@ def create_along_curve(curve, number, additional_description=None, aim_vector=No
         parent_node (str): parent transform nodes under the given node
         chain (bool): if need to parent joints as a joint chain, default is True
         label(bool): automatically label joint base on name, only works if follow the naming convention
+        parallel_transport (bool): carry the first frame along the curve with the minimal rotation between points,
+                                   which doesn't flip or twist, only works without up curve, default is False
 
     Returns:
         joints (list): joints along given curve
     """
     # get matrices
     matrices = curveUtils.get_matrices(curve, number, aim_vector=aim_vector, up_vector=up_vector, up_curve=up_curve,
-                                       aim_type=aim_type, flip_check=flip_check)
+                                       aim_type=aim_type, flip_check=flip_check,
+                                       parallel_transport=parallel_transport)
 
     # check naming convention
     name_check = namingUtils.check(curve)
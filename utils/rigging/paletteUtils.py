@@ -0,0 +1,161 @@
+# import python library
+import os
+import copy
+import fnmatch
+
+# import external library
+import numpy
+
+# import utils
+import utils.common.fileUtils as fileUtils
+import utils.common.namingUtils as namingUtils
+
+# config
+import config
+
+config_dir = os.path.dirname(config.__file__)
+SIDE_CONFIG_PATH = os.path.join(config_dir, 'CONTROL_SIDE_COLOR.cfg')
+COLOR_CONFIG_PATH = os.path.join(config_dir, 'CONTROL_COLOR.cfg')
+SIDE_CONFIG = fileUtils.jsonUtils.read(SIDE_CONFIG_PATH)
+COLOR_CONFIG = fileUtils.jsonUtils.read(COLOR_CONFIG_PATH)
+
+# palette:
+#     side (dict): color for each primary side, can be color name in COLOR_CONFIG or rgb values
+#     sub_multiplier (float): sub controllers' color multiplier
+#     rules (list): each rule is a dict, later rules override former ones,
+#                   match keys: side (str/list), description (str, fnmatch pattern), sub (bool)
+#                   value keys: color (str/list), multiplier (float)
+DEFAULT_PALETTE = {'side': SIDE_CONFIG,
+                   'sub_multiplier': 0.5,
+                   'rules': []}
+
+# active palette
+PALETTE = copy.deepcopy(DEFAULT_PALETTE)
+
+
+# function
+def set_palette(palette=None):
+    """
+    set active palette, controllers created afterwards will use the palette colors
+
+    Args:
+        palette (dict/str): palette, or palette json file path, keys not given will use the default palette,
+                            default is None, which resets to the default palette
+
+    Examples:
+        import utils.rigging.paletteUtils as paletteUtils
+
+        paletteUtils.set_palette({'sub_multiplier': 0.3,
+                                  'rules': [{'description': 'eye*', 'color': 'yellow'},
+                                            {'side': 'left', 'sub': True, 'color': 'lightBlue',
+                                             'multiplier': 1}]})
+    """
+    if isinstance(palette, basestring):
+        palette = fileUtils.jsonUtils.read(palette)
+    PALETTE.clear()
+    PALETTE.update(copy.deepcopy(DEFAULT_PALETTE))
+    if palette:
+        PALETTE.update(copy.deepcopy(palette))
+
+
+def get_palette():
+    """
+    get active palette
+
+    Returns:
+        palette (dict)
+    """
+    return copy.deepcopy(PALETTE)
+
+
+def get_color(name, palette=None):
+    """
+    get color for the given controller name
+
+    Args:
+        name (str): controller's name, sub controller is checked by the last description token
+        palette (dict): palette to compute color, default is None, will use the active palette
+
+    Returns:
+        color (list): rgb color
+    """
+    return get_colors([name], palette=palette)[0].tolist()
+
+
+def get_colors(names, palette=None):
+    """
+    get colors for all given controllers names in one pass
+
+    Args:
+        names (list): controllers' names, sub controllers are checked by the last description token
+        palette (dict): palette to compute colors, default is None, will use the active palette
+
+    Returns:
+        colors (numpy.ndarray): rgb colors, shape is (names number, 3)
+    """
+    if palette is None:
+        palette = PALETTE
+    side_colors = dict(DEFAULT_PALETTE['side'])
+    side_colors.update(palette.get('side', {}))
+    sub_multiplier = palette.get('sub_multiplier', DEFAULT_PALETTE['sub_multiplier'])
+    rules = palette.get('rules', [])
+
+    colors = numpy.zeros((len(names), 3))
+    for i, name in enumerate(names):
+        name_info = namingUtils.decompose(name)
+        side = name_info['side'] or ['center']
+        description = name_info['description'] or []
+        sub = bool(description) and description[-1] == 'sub'
+        description = '_'.join(description)
+
+        color = side_colors.get(side[0], side_colors['center'])
+        multiplier = sub_multiplier if sub else 1
+        for rule in rules:
+            if _match_rule(rule, side, description, sub):
+                color = rule.get('color', color)
+                multiplier = rule.get('multiplier', multiplier)
+        colors[i] = numpy.array(get_rgb(color)) * multiplier
+
+    return colors
+
+
+def get_rgb(color):
+    """
+    get rgb values from color name in COLOR_CONFIG
+
+    Args:
+        color (str/list): color name or rgb values
+
+    Returns:
+        rgb (list)
+    """
+    if isinstance(color, basestring):
+        return COLOR_CONFIG[color]
+    return list(color)
+
+
+# sub function
+def _match_rule(rule, side, description, sub):
+    """
+    check if the controller matches the palette rule
+
+    Args:
+        rule (dict): palette rule
+        side (list): controller's side tokens
+        description (str): controller's description
+        sub (bool): if the controller is a sub controller
+
+    Returns:
+        True/False
+    """
+    rule_side = rule.get('side')
+    if rule_side:
+        if isinstance(rule_side, basestring):
+            rule_side = [rule_side]
+        if not set(rule_side).intersection(side):
+            return False
+    if 'description' in rule and not fnmatch.fnmatchcase(description, rule['description']):
+        return False
+    if 'sub' in rule and rule['sub'] != sub:
+        return False
+    return True
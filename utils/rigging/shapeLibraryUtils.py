@@ -0,0 +1,231 @@
+# import python library
+import os
+import struct
+
+# import external library
+import numpy
+
+# import utils
+import utils.common.fileUtils as fileUtils
+
+# constant
+# binary shape library layout:
+#     file header: magic, version
+#     records: record header (name, cvs number, knots number, degree, form), cvs as float32 xyz, knots as float32
+# records are only appended, if a shape name is appended again, the latest record wins,
+# so adding shapes never rewrites the existing library,
+# the library is the shapes' source at runtime, json config is only compiled or exported on request
+MAGIC = b'CSLB'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4si')
+RECORD_HEADER = struct.Struct('<64s4i')
+NAME_LENGTH = 64
+DTYPE = numpy.float32
+
+# loaded libraries, key is the library path,
+# value is {'index': {shape name: [data offset, num_cvs, num_knots, degree, form]},
+#           'size': read file size, 'data': memory mapped float array, 'shapes': converted shapes info}
+LIBRARIES = {}
+
+
+# function
+def compile_library(config_path, library_path):
+    """
+    compile json control shape config to the binary shape library, existing library will be overwritten
+
+    Args:
+        config_path (str): control shape json config path, like CONTROL_SHAPE.cfg
+        library_path (str): binary shape library path
+    """
+    shapes_info = fileUtils.jsonUtils.read(config_path)
+
+    # write to a temp file first, so the library is never left half written
+    temp_path = fileUtils.pathUtils.get_temp_path(library_path)
+    library_file = open(temp_path, 'wb')
+    try:
+        library_file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        for shape_name in sorted(shapes_info.keys()):
+            library_file.write(_pack_record(shape_name, shapes_info[shape_name]))
+    finally:
+        library_file.close()
+    fileUtils.pathUtils.replace_file(temp_path, library_path)
+
+    LIBRARIES.pop(library_path, None)
+
+
+def export_config(library_path, config_path):
+    """
+    export the binary shape library to json control shape config, existing config will be overwritten,
+    the latest record is exported for shapes appended multiple times
+
+    values are written with the library's float32 precision,
+    so the exported config compiles back to the same library
+
+    Args:
+        library_path (str): binary shape library path
+        config_path (str): control shape json config path, like CONTROL_SHAPE.cfg
+    """
+    shapes_info = {}
+    for shape_name in get_shape_names(library_path):
+        shape_info = get_shape_info(library_path, shape_name)
+        # float32 values as their shortest decimal strings, so the config doesn't get float32 noise digits
+        for key in ['control_vertices', 'knots']:
+            shape_info[key] = numpy.array(shape_info[key], dtype=DTYPE).astype(str).astype(float).tolist()
+        shapes_info.update({shape_name: shape_info})
+    fileUtils.jsonUtils.write(config_path, shapes_info, atomic=True)
+
+
+def get_shape_names(library_path):
+    """
+    get shape names in the binary shape library, it only reads the records headers
+
+    Args:
+        library_path (str): binary shape library path
+
+    Returns:
+        shape_names (list)
+    """
+    return sorted(_get_library(library_path)['index'].keys())
+
+
+def get_shape_info(library_path, shape_name):
+    """
+    get shape info from the binary shape library, shapes are converted once and cached
+
+    Args:
+        library_path (str): binary shape library path
+        shape_name (str): shape's name
+
+    Returns:
+        shape_info (dict): same as curveUtils.get_shape_info, include num_cvs, control_vertices, knots, degree, form
+    """
+    library = _get_library(library_path)
+    shape_info = library['shapes'].get(shape_name)
+    if not shape_info:
+        offset, num_cvs, num_knots, degree, form = library['index'][shape_name]
+
+        # map the file lazily, only when shape data is needed
+        if library['data'] is None:
+            library['data'] = numpy.memmap(library_path, dtype=DTYPE, mode='r')
+        start = offset // DTYPE().itemsize
+        data = library['data'][start: start + num_cvs * 3 + num_knots].astype(float)
+
+        shape_info = {'num_cvs': num_cvs,
+                      'control_vertices': data[:num_cvs * 3].reshape(num_cvs, 3).tolist(),
+                      'knots': data[num_cvs * 3:].tolist(),
+                      'degree': degree,
+                      'form': form}
+        library['shapes'].update({shape_name: shape_info})
+
+    return dict(shape_info)
+
+
+def append_shapes(library_path, shapes_info):
+    """
+    append shapes to the binary shape library, existing shapes with the same names will be overridden
+
+    Args:
+        library_path (str): binary shape library path
+        shapes_info (dict): shapes info, key is the shape name, value is the shape info from curveUtils.get_shape_info
+    """
+    # release the memory map before writing
+    library = LIBRARIES.get(library_path)
+    if library:
+        library['data'] = None
+
+    new_library = not os.path.isfile(library_path)
+    library_file = open(library_path, 'ab')
+    try:
+        if new_library:
+            library_file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        for shape_name, shape_info in shapes_info.items():
+            library_file.write(_pack_record(shape_name, shape_info))
+    finally:
+        library_file.close()
+
+    # remove cached shapes, index will be updated from the appended records next time
+    if library:
+        for shape_name in shapes_info:
+            library['shapes'].pop(shape_name, None)
+
+
+# sub function
+def _get_library(library_path):
+    """
+    get loaded library, it will only read the records appended since last load
+
+    Args:
+        library_path (str): binary shape library path
+
+    Returns:
+        library (dict): loaded library
+    """
+    library = LIBRARIES.get(library_path)
+    file_size = os.path.getsize(library_path)
+    if library and library['size'] == file_size:
+        return library
+
+    if not library or library['size'] > file_size:
+        # library is not loaded, or rewritten by compile, read from start
+        library = {'index': {},
+                   'size': FILE_HEADER.size,
+                   'data': None,
+                   'shapes': {}}
+        LIBRARIES.update({library_path: library})
+        _check_header(library_path)
+
+    library_file = open(library_path, 'rb')
+    try:
+        offset = library['size']
+        library_file.seek(offset)
+        while offset + RECORD_HEADER.size <= file_size:
+            name, num_cvs, num_knots, degree, form = RECORD_HEADER.unpack(library_file.read(RECORD_HEADER.size))
+            shape_name = name.split(b'\0')[0].decode('utf-8')
+            offset += RECORD_HEADER.size
+            library['index'].update({shape_name: [offset, num_cvs, num_knots, degree, form]})
+            library['shapes'].pop(shape_name, None)
+            # skip data, only headers are read
+            offset += (num_cvs * 3 + num_knots) * DTYPE().itemsize
+            library_file.seek(offset)
+    finally:
+        library_file.close()
+
+    library['size'] = file_size
+    library['data'] = None
+    return library
+
+
+def _check_header(library_path):
+    """
+    check if the given file is a binary shape library
+
+    Args:
+        library_path (str): binary shape library path
+    """
+    library_file = open(library_path, 'rb')
+    try:
+        magic, version = FILE_HEADER.unpack(library_file.read(FILE_HEADER.size))
+    finally:
+        library_file.close()
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('{0} is not a valid control shape library'.format(library_path))
+
+
+def _pack_record(shape_name, shape_info):
+    """
+    pack shape info as a binary record
+
+    Args:
+        shape_name (str): shape's name
+        shape_info (dict): shape info from curveUtils.get_shape_info
+
+    Returns:
+        record (bytes)
+    """
+    name = shape_name.encode('utf-8')
+    if len(name) > NAME_LENGTH:
+        raise ValueError('shape name "{0}" is longer than {1} characters'.format(shape_name, NAME_LENGTH))
+    control_vertices = numpy.asarray(shape_info['control_vertices'], dtype=DTYPE).reshape(-1, 3)
+    knots = numpy.asarray(shape_info['knots'], dtype=DTYPE)
+    header = RECORD_HEADER.pack(name, len(control_vertices), len(knots), shape_info['degree'], shape_info['form'])
+    return header + control_vertices.tobytes() + knots.tobytes()